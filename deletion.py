@@ -0,0 +1,221 @@
+import os
+import time
+from collections import defaultdict
+from itertools import zip_longest
+from threading import Semaphore
+from PySide6.QtCore import Signal
+
+from workers import BackgroundWorker, run_parallel_jobs
+from utils import PATH_OK, PATH_IS_DIRECTORY, PATH_MISSING
+
+class FileDeleter(BackgroundWorker):
+    """Löscht Dateien im Hintergrund, parallel und je Laufwerk begrenzt
+
+    Die Dateien werden nach Laufwerk (st_dev des Verzeichnisses) gruppiert;
+    pro Laufwerk laufen höchstens WORKERS_PER_DEVICE Löschvorgänge
+    gleichzeitig, damit eine langsame Freigabe nicht alle Threads belegt.
+    Fehler werden gesammelt statt einzeln gemeldet, Fortschritt und gelöschte
+    Pfade werden gebündelt signalisiert.
+
+    operation(Pfad) führt die eigentliche Aktion aus, standardmäßig os.remove;
+    für die Quarantäne wird stattdessen verschoben bzw. zurückbenannt, beim
+    Verknüpfen von Duplikaten durch einen Link ersetzt (siehe linking.py).
+    Alternativ bearbeitet chunk_operation(Pfade) einen ganzen Auftrag und gibt
+    (erledigte Pfade, [(Pfad, Fehler)]) zurück, z.B. um das Quarantäne-Journal
+    pro Auftrag zu schreiben.
+    """
+    progress_update = Signal(int, int)  # erledigt, gesamt
+    files_deleted = Signal(list)  # Batch erfolgreich gelöschter Pfade
+    deletion_complete = Signal(dict)  # {"deleted": Anzahl, "failed": [(Pfad, Fehler)], "cancelled": bool}
+
+    WORKERS_PER_DEVICE = 8
+    CHUNK_SIZE = 64  # Dateien pro Auftrag an den Threadpool
+    BATCH_SIZE = 1000
+    FLUSH_INTERVAL = 0.25  # Sekunden
+
+    def __init__(self, paths, operation=os.remove, chunk_operation=None):
+        super().__init__()
+        self.paths = list(paths)
+        self.operation = operation
+        self.chunk_operation = chunk_operation
+        self.device_cache = {}
+        self.pending_deleted = []
+        self.last_flush = 0.0
+
+    def get_device(self, path):
+        # Ein stat pro Verzeichnis statt pro Datei
+        directory = os.path.dirname(path)
+        device = self.device_cache.get(directory)
+        if device is None:
+            try:
+                device = os.stat(directory).st_dev
+            except OSError:
+                device = os.path.splitdrive(directory)[0]
+            self.device_cache[directory] = device
+        return device
+
+    def build_jobs(self):
+        """Teilt die Pfade in Aufträge auf, abwechselnd über die Laufwerke verteilt"""
+        paths_by_device = defaultdict(list)
+        for path in self.paths:
+            paths_by_device[self.get_device(path)].append(path)
+        chunks_by_device = [
+            [(device, paths[start:start + self.CHUNK_SIZE]) for start in range(0, len(paths), self.CHUNK_SIZE)]
+            for device, paths in paths_by_device.items()
+        ]
+        jobs = [job for chunks in zip_longest(*chunks_by_device) for job in chunks if job is not None]
+        return jobs, len(paths_by_device)
+
+    def delete_chunk(self, job):
+        device, paths = job
+        deleted = []
+        failed = []
+        with self.device_limits[device]:
+            if self.chunk_operation is not None:
+                return self.chunk_operation(paths)
+            for path in paths:
+                try:
+                    self.operation(path)
+                    deleted.append(path)
+                except Exception as e:
+                    failed.append((path, str(e)))
+        return deleted, failed
+
+    def flush_deleted(self, done, total, force=False):
+        now = time.monotonic()
+        if force or len(self.pending_deleted) >= self.BATCH_SIZE or now - self.last_flush >= self.FLUSH_INTERVAL:
+            if self.pending_deleted:
+                self.files_deleted.emit(self.pending_deleted)
+                self.pending_deleted = []
+            self.progress_update.emit(done, total)
+            self.last_flush = now
+
+    def run(self):
+        jobs, device_count = self.build_jobs()
+        self.device_limits = {device: Semaphore(self.WORKERS_PER_DEVICE) for device, paths in jobs}
+        summary = {"deleted": 0, "failed": [], "cancelled": False}
+        total = len(self.paths)
+        progress = {"done": 0}
+
+        def on_chunk(job, result):
+            deleted, failed = result
+            summary["deleted"] += len(deleted)
+            summary["failed"].extend(failed)
+            self.pending_deleted.extend(deleted)
+            progress["done"] += len(job[1])
+            self.flush_deleted(progress["done"], total)
+
+        completed = run_parallel_jobs(
+            jobs,
+            self.delete_chunk,
+            max(1, device_count) * self.WORKERS_PER_DEVICE,
+            on_chunk,
+            self.is_cancelled
+        )
+        self.flush_deleted(progress["done"], total, force=True)
+        summary["cancelled"] = not completed
+        self.deletion_complete.emit(summary)
+
+class PathValidator(BackgroundWorker):
+    """Prüft eingefügte Pfade für die Massenlöschung im Hintergrund
+
+    Die Pfade werden nach Verzeichnis gruppiert, und jedes Verzeichnis wird mit
+    einem einzigen scandir beantwortet statt mit einem stat pro Pfad. Die
+    Laufzeit hängt damit von der Zahl der Verzeichnisse ab, nicht von der Zahl
+    der Pfade. Verzeichnisse werden parallel gelesen, die Ergebnisse als
+    (Pfad, Status)-Batches gemeldet. Aus Verzeichnissen mit weniger als
+    SCANDIR_MIN_PATHS eingefügten Pfaden wird einzeln per stat geprüft, denn
+    eine riesige Freigabe-Wurzel aufzulisten wäre dort teurer.
+    """
+    progress_update = Signal(int, int)  # geprüfte Pfade, gesamt
+    paths_validated = Signal(list)  # Batch von (Pfad, Status)
+    validation_complete = Signal(bool)  # True, wenn abgebrochen
+
+    MAX_WORKERS = 16
+    SCANDIR_MIN_PATHS = 16  # ab so vielen Pfaden pro Verzeichnis lohnt sich das Auflisten
+    BATCH_SIZE = 5000
+    FLUSH_INTERVAL = 0.25  # Sekunden
+
+    def __init__(self, paths):
+        super().__init__()
+        self.paths = paths
+        self.pending_results = []
+        self.last_flush = 0.0
+
+    def group_by_directory(self):
+        paths_by_directory = defaultdict(list)
+        for path in self.paths:
+            # Abschließende Trenner ignorieren, damit "C:\Ordner\" als Ordner erkannt wird
+            stripped = path.rstrip(os.sep + (os.altsep or "")) or path
+            directory, name = os.path.split(stripped)
+            paths_by_directory[directory].append((path, name))
+        return list(paths_by_directory.items())
+
+    def validate_directory(self, job):
+        directory, entries = job
+        if len(entries) < self.SCANDIR_MIN_PATHS:
+            return [(path, self.validate_single(path)) for path, name in entries]
+        try:
+            with os.scandir(directory or os.curdir) as iterator:
+                listing = {os.path.normcase(entry.name): entry for entry in iterator}
+        except (FileNotFoundError, NotADirectoryError):
+            return [(path, PATH_MISSING) for path, name in entries]
+        except OSError:
+            # Nicht auflistbar (z.B. nur Ausführrecht): einzeln prüfen
+            return [(path, self.validate_single(path)) for path, name in entries]
+
+        results = []
+        for path, name in entries:
+            entry = listing.get(os.path.normcase(name))
+            if not name:
+                status = self.validate_single(path)
+            elif entry is None:
+                status = PATH_MISSING
+            else:
+                try:
+                    if entry.is_dir():
+                        status = PATH_IS_DIRECTORY
+                    elif entry.is_file():
+                        status = PATH_OK
+                    else:
+                        status = PATH_MISSING
+                except OSError:
+                    status = PATH_MISSING
+            results.append((path, status))
+        return results
+
+    def validate_single(self, path):
+        if os.path.isfile(path):
+            return PATH_OK
+        if os.path.isdir(path):
+            return PATH_IS_DIRECTORY
+        return PATH_MISSING
+
+    def flush_results(self, done, total, force=False):
+        now = time.monotonic()
+        if force or len(self.pending_results) >= self.BATCH_SIZE or now - self.last_flush >= self.FLUSH_INTERVAL:
+            if self.pending_results:
+                self.paths_validated.emit(self.pending_results)
+                self.pending_results = []
+            self.progress_update.emit(done, total)
+            self.last_flush = now
+
+    def run(self):
+        jobs = self.group_by_directory()
+        total = len(self.paths)
+        progress = {"done": 0}
+
+        def on_directory(job, results):
+            self.pending_results.extend(results)
+            progress["done"] += len(results)
+            self.flush_results(progress["done"], total)
+
+        completed = run_parallel_jobs(
+            jobs,
+            self.validate_directory,
+            self.MAX_WORKERS,
+            on_directory,
+            self.is_cancelled
+        )
+        self.flush_results(progress["done"], total, force=True)
+        self.validation_complete.emit(not completed)
@@ -0,0 +1,200 @@
+import os
+from collections import defaultdict
+from PySide6.QtCore import Signal
+
+from duplicates import find_duplicate_groups
+from utils import FULL_HASH_ALGORITHM, QUARANTINE_DIRECTORY, new_hasher
+from workers import DEFAULT_MAX_WORKERS, BackgroundWorker, run_parallel_jobs
+
+def build_directory_tree(files):
+    """Baut aus (Pfad, Größe)-Paaren den Verzeichnisbaum der gescannten Dateien
+
+    Rückgabe ist ({Verzeichnis: [(Name, Größe, Pfad)]}, {Verzeichnis: {Unterverzeichnisse}}).
+    Verzeichnisse ohne gescannte Dateien tauchen nur als Vorfahren auf.
+    """
+    directory_files = defaultdict(list)
+    subdirectories = defaultdict(set)
+    known = set()
+    for filepath, size in files:
+        directory, name = os.path.split(filepath)
+        directory_files[directory].append((name, size, filepath))
+        child = directory
+        parent = os.path.dirname(child)
+        while child not in known:
+            known.add(child)
+            if parent == child:
+                break
+            subdirectories[parent].add(child)
+            child, parent = parent, os.path.dirname(parent)
+    return directory_files, subdirectories
+
+def combine_entries(entries):
+    """Hash über die sortierten Einträge eines Verzeichnisses (Merkle-Knoten)"""
+    hasher = new_hasher(FULL_HASH_ALGORITHM)
+    for entry in sorted(entries):
+        hasher.update(entry.encode("utf-8", "surrogatepass"))
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+def list_directory_names(directory):
+    """Namen aller Einträge eines Verzeichnisses (ohne Quarantäne-Ordner), None wenn nicht lesbar"""
+    try:
+        with os.scandir(directory) as iterator:
+            return {entry.name for entry in iterator if entry.name != QUARANTINE_DIRECTORY}
+    except OSError:
+        return None
+
+def find_duplicate_directories(files, progress_callback=None, is_cancelled=None, max_workers=1, hash_cache=None):
+    """Sucht Verzeichnisse mit identischem Inhalt über Merkle-Hashes
+
+    Zuerst wird von unten nach oben eine Signatur nur aus Namen und Größen
+    gebildet. Nur Verzeichnisse, deren Signatur mehrfach vorkommt, können
+    identisch sein. Weil die Scan-Ergebnisse gefiltert sein können, wird jedes
+    solche Verzeichnis danach vollständig aufgelistet: Enthält es Einträge,
+    die nicht im Scan stehen (andere Dateitypen, neuere Dateien, leere
+    Ordner), gilt es als einzigartig. Nur die Dateien der übrigen Kandidaten
+    werden über find_duplicate_groups gehasht, anschließend wird derselbe Baum
+    mit den Inhalts-Hashes berechnet. Gemeldet werden nur die obersten
+    gleichen Verzeichnisse, nicht zusätzlich Unterverzeichnisse, deren
+    Elternverzeichnisse schon gemeinsam eine Gruppe bilden.
+
+    Rückgabe ist ({Hash: {"paths": [...], "size": Bytes, "files": Anzahl}},
+    Statistik) oder (None, Statistik) bei Abbruch.
+    """
+    directory_files, subdirectories = build_directory_tree(files)
+    # Unterverzeichnisse haben immer längere Pfade als ihr Elternverzeichnis
+    directories = sorted(set(directory_files) | set(subdirectories), key=len, reverse=True)
+    stats = {"directories": len(directories), "candidate_directories": 0, "incomplete_directories": 0, "groups": 0}
+
+    # Stufe 1: Signatur aus Namen und Größen, dazu Gesamtgröße und Dateianzahl
+    signatures = {}
+    total_sizes = {}
+    file_counts = {}
+
+    def find_candidates(incomplete):
+        for directory in directories:
+            entries = [f"f:{name}:{size}" for name, size, filepath in directory_files.get(directory, ())]
+            total_size = sum(size for name, size, filepath in directory_files.get(directory, ()))
+            file_count = len(entries)
+            for child in subdirectories.get(directory, ()):
+                entries.append(f"d:{os.path.basename(child)}:{signatures[child]}")
+                total_size += total_sizes[child]
+                file_count += file_counts[child]
+            # Unvollständig gescannte Verzeichnisse gleichen keinem anderen
+            signatures[directory] = "u:" + directory if directory in incomplete else combine_entries(entries)
+            total_sizes[directory] = total_size
+            file_counts[directory] = file_count
+
+        signature_groups = defaultdict(list)
+        for directory in directories:
+            if file_counts[directory]:
+                signature_groups[signatures[directory]].append(directory)
+        return {
+            directory
+            for group in signature_groups.values() if len(group) > 1
+            for directory in group
+        }
+
+    candidates = find_candidates(set())
+
+    # Kandidaten vollständig auflisten und mit den gescannten Einträgen vergleichen
+    incomplete = set()
+    progress = {"done": 0}
+
+    def on_listing(directory, names):
+        expected = {name for name, size, filepath in directory_files.get(directory, ())}
+        expected.update(os.path.basename(child) for child in subdirectories.get(directory, ()))
+        if names != expected:
+            incomplete.add(directory)
+        progress["done"] += 1
+        if progress_callback:
+            progress_callback("Prüfe Ordnerinhalt...", progress["done"], len(candidates))
+
+    if not run_parallel_jobs(candidates, list_directory_names, max_workers, on_listing, is_cancelled):
+        return None, stats
+    stats["incomplete_directories"] = len(incomplete)
+    if incomplete:
+        candidates = find_candidates(incomplete)
+    stats["candidate_directories"] = len(candidates)
+    if not candidates:
+        return {}, stats
+
+    # Stufe 2: Inhalts-Hashes nur für Dateien in Kandidaten-Verzeichnissen
+    size_groups = defaultdict(list)
+    for directory in candidates:
+        for name, size, filepath in directory_files.get(directory, ()):
+            size_groups[size].append(filepath)
+    duplicates, file_stats = find_duplicate_groups(
+        size_groups,
+        progress_callback=progress_callback,
+        is_cancelled=is_cancelled,
+        max_workers=max_workers,
+        hash_cache=hash_cache
+    )
+    stats.update(file_stats)
+    if duplicates is None:
+        return None, stats
+    # Dateien ohne Gegenstück bekommen eine eindeutige Kennung und machen ihr Verzeichnis einzigartig
+    content_ids = {filepath: key for key, paths in duplicates.items() for filepath in paths}
+
+    # Stufe 3: Merkle-Hashes über Namen und Inhalte
+    merkle_hashes = {}
+    for directory in directories:
+        if directory not in candidates:
+            continue
+        entries = [
+            f"f:{name}:{content_ids.get(filepath) or 'u:' + filepath}"
+            for name, size, filepath in directory_files.get(directory, ())
+        ]
+        for child in subdirectories.get(directory, ()):
+            entries.append(f"d:{os.path.basename(child)}:{merkle_hashes.get(child) or 'u:' + child}")
+        merkle_hashes[directory] = combine_entries(entries)
+
+    merkle_groups = defaultdict(list)
+    for directory, merkle_hash in merkle_hashes.items():
+        merkle_groups[merkle_hash].append(directory)
+
+    groups = {}
+    for merkle_hash, group in merkle_groups.items():
+        if len(group) < 2:
+            continue
+        # Bilden die Elternverzeichnisse selbst eine Gruppe, ist diese dort schon enthalten;
+        # sind sie doppelt, aber in verschiedenen Gruppen, muss sie gemeldet werden
+        parents = {os.path.dirname(directory) for directory in group}
+        parent_hashes = {merkle_hashes.get(parent) for parent in parents}
+        if len(parents) == len(group) and len(parent_hashes) == 1 and None not in parent_hashes:
+            continue
+        groups[merkle_hash] = {
+            "paths": sorted(group),
+            "size": total_sizes[group[0]],
+            "files": file_counts[group[0]]
+        }
+    stats["groups"] = len(groups)
+    return groups, stats
+
+class DuplicateDirectoryFinder(BackgroundWorker):
+    """Sucht im Hintergrund nach Verzeichnissen mit identischem Inhalt"""
+    progress_update = Signal(str, int, int)  # Stufe, erledigt, gesamt
+    search_complete = Signal(dict, dict)  # Gruppen, Statistik
+    search_cancelled = Signal()
+
+    def __init__(self, files, max_workers=None, hash_cache=None):
+        super().__init__()
+        self.files = files
+        self.hash_cache = hash_cache
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+
+    def run(self):
+        groups, stats = find_duplicate_directories(
+            self.files,
+            progress_callback=self.report_progress,
+            is_cancelled=self.is_cancelled,
+            max_workers=self.max_workers,
+            hash_cache=self.hash_cache
+        )
+        if self.hash_cache is not None:
+            self.hash_cache.finish()
+        if groups is None:
+            self.search_cancelled.emit()
+        else:
+            self.search_complete.emit(groups, stats)
@@ -0,0 +1,474 @@
+import os
+from collections import defaultdict
+from PySide6.QtCore import Signal
+
+from utils import (HASH_CHUNK_SIZE, PROBE_SIZE, FULL_HASH_ALGORITHM, PROBE_HASH_ALGORITHM,
+                   calculate_file_hash, calculate_probe_hash)
+from workers import DEFAULT_MAX_WORKERS, BackgroundWorker, run_parallel_jobs
+
+# Byteweiser Vergleich vor dem Löschen
+VERIFY_MEMORY_LIMIT = 32 * 1024 * 1024  # Lesepuffer je Gruppe insgesamt
+VERIFY_MIN_CHUNK_SIZE = 64 * 1024
+VERIFY_MAX_FILES = 256  # Gleichzeitig geöffnete Dateien je Gruppe
+
+def hash_with_cache(hash_cache, filepath, field, algorithm, compute):
+    """Liefert (Hash, aus_dem_Cache) und berechnet den Hash nur bei einem Cache-Fehlgriff
+
+    field ist "probe_hash" oder "full_hash" (siehe HashCache).
+    """
+    if hash_cache is None:
+        return compute(), False
+    try:
+        key = hash_cache.get_key(filepath, algorithm)
+    except OSError:
+        return None, False
+    if key is None:
+        return compute(), False
+    cached = hash_cache.lookup(key)
+    if cached is not None:
+        digest = cached[0] if field == "probe_hash" else cached[1]
+        if digest:
+            return digest, True
+    digest = compute()
+    if digest:
+        hash_cache.store(key, **{field: digest})
+    return digest, False
+
+def find_duplicate_groups(size_groups, progress_callback=None, is_cancelled=None, max_workers=1, hash_cache=None,
+                          probe_algorithm=PROBE_HASH_ALGORITHM, full_algorithm=FULL_HASH_ALGORITHM):
+    """Sucht Duplikate in drei Stufen: Größe -> Anfang/Ende -> vollständiger Hash
+
+    size_groups bildet Dateigrößen auf Pfade ab. Hardlinks werden vorab über
+    (st_dev, st_ino) zusammengefasst: Jede Inode wird nur einmal gehasht und
+    erscheint nur mit einem Pfad im Ergebnis, da das Löschen eines weiteren
+    Links keinen Platz freigibt. Innerhalb einer Gruppe steht die Datei mit den
+    meisten Links vorne, damit sie beim Bereinigen behalten wird. Jede Stufe reicht nur die
+    Dateien weiter, die noch mit einer anderen kollidieren, sodass der
+    vollständige Inhalt nur für echte Kandidaten gelesen wird. Innerhalb einer
+    Stufe werden bis zu max_workers Dateien gleichzeitig gehasht. Mit einem
+    HashCache werden nur neue oder geänderte Dateien tatsächlich gelesen.
+    Für beide Hash-Stufen lässt sich der Algorithmus wählen (siehe utils).
+
+    progress_callback(stufe, erledigt, gesamt) wird pro Datei aufgerufen,
+    is_cancelled() wird regelmäßig geprüft. Rückgabe ist
+    (Duplikate als {Hash: [Pfade]}, Statistik) oder (None, Statistik) bei Abbruch.
+    """
+    stats = {"candidates": 0, "hardlinks": 0, "probed": 0, "fully_hashed": 0, "bytes_read": 0, "cache_hits": 0}
+
+    # Stufe 1: Größe (nur Gruppen mit mindestens zwei Dateien)
+    size_groups = {size: paths for size, paths in size_groups.items() if len(paths) > 1}
+    stats["candidates"] = sum(len(paths) for paths in size_groups.values())
+
+    # Hardlinks zusammenfassen: (Größe, Gerät, Inode) -> Pfade
+    inode_groups = {}
+    link_counts = {}
+    progress = {"done": 0}
+
+    def identity_job(job):
+        size, path = job
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            return None
+        return file_stat.st_dev, file_stat.st_ino, file_stat.st_nlink
+
+    def on_identity(job, identity):
+        size, path = job
+        if identity is not None:
+            device, inode, link_count = identity
+            # Ohne Inode-Nummer (z.B. FAT) lässt sich nichts zusammenfassen
+            key = (size, device, inode) if inode else (size, path)
+            inode_groups.setdefault(key, []).append(path)
+            link_counts[path] = link_count
+        progress["done"] += 1
+        if progress_callback:
+            progress_callback("Prüfe Hardlinks...", progress["done"], stats["candidates"])
+
+    candidate_jobs = ((size, path) for size, paths in size_groups.items() for path in paths)
+    if not run_parallel_jobs(candidate_jobs, identity_job, max_workers, on_identity, is_cancelled):
+        return None, stats
+
+    size_groups = defaultdict(list)
+    for key, paths in inode_groups.items():
+        size_groups[key[0]].append(paths[0])
+        stats["hardlinks"] += len(paths) - 1
+    size_groups = {size: paths for size, paths in size_groups.items() if len(paths) > 1}
+    probe_total = sum(len(paths) for paths in size_groups.values())
+
+    # Stufe 2: Hash über Anfang und Ende
+    probe_groups = defaultdict(list)
+    progress["done"] = 0
+
+    def on_probe(job, result):
+        size, path = job
+        digest, cached = result
+        if digest:
+            probe_groups[(size, digest)].append(path)
+            stats["probed"] += 1
+            if cached:
+                stats["cache_hits"] += 1
+            else:
+                stats["bytes_read"] += min(size, 2 * PROBE_SIZE)
+        progress["done"] += 1
+        if progress_callback:
+            progress_callback("Vergleiche Dateianfang und -ende...", progress["done"], probe_total)
+
+    probe_jobs = ((size, path) for size, paths in size_groups.items() for path in paths)
+    def probe_job(job):
+        size, path = job
+        return hash_with_cache(
+            hash_cache, path, "probe_hash", probe_algorithm,
+            lambda: calculate_probe_hash(path, size, algorithm=probe_algorithm)
+        )
+
+    if not run_parallel_jobs(probe_jobs, probe_job, max_workers, on_probe, is_cancelled):
+        return None, stats
+
+    # Stufe 3: Vollständiger Hash nur für weiterhin kollidierende große Dateien
+    duplicates = {}
+    full_jobs = []
+    for (size, probe_digest), paths in probe_groups.items():
+        if len(paths) < 2:
+            continue
+        if size <= 2 * PROBE_SIZE and probe_algorithm == full_algorithm:
+            # Kleine Dateien wurden in Stufe 2 bereits vollständig gelesen; mit einem
+            # nicht-kryptographischen Vorab-Hash werden sie trotzdem noch einmal gehasht
+            duplicates[f"{size}-{probe_digest}"] = sorted(paths, key=lambda path: -link_counts[path])
+        else:
+            full_jobs.extend((size, path) for path in paths)
+
+    hash_groups = defaultdict(list)
+    progress["done"] = 0
+
+    def on_full_hash(job, result):
+        size, path = job
+        digest, cached = result
+        if digest:
+            hash_groups[(size, digest)].append(path)
+            stats["fully_hashed"] += 1
+            if cached:
+                stats["cache_hits"] += 1
+            else:
+                stats["bytes_read"] += size
+        progress["done"] += 1
+        if progress_callback:
+            progress_callback("Berechne vollständige Hashes...", progress["done"], len(full_jobs))
+
+    def full_hash_job(job):
+        size, path = job
+        return hash_with_cache(
+            hash_cache, path, "full_hash", full_algorithm,
+            lambda: calculate_file_hash(path, algorithm=full_algorithm)
+        )
+
+    if not run_parallel_jobs(full_jobs, full_hash_job, max_workers, on_full_hash, is_cancelled):
+        return None, stats
+
+    for (size, digest), group in hash_groups.items():
+        if len(group) > 1:
+            duplicates[f"{size}-{digest}"] = sorted(group, key=lambda path: -link_counts[path])
+
+    return duplicates, stats
+
+def find_snapshot_duplicates(store, snapshot_ids, progress_callback=None, is_cancelled=None, max_workers=1,
+                             hash_cache=None, algorithm=FULL_HASH_ALGORITHM):
+    """Sucht Dateien, deren Inhalt in mehreren gespeicherten Scans vorkommt
+
+    Verglichen wird über die Spalten Größe und Digest im ScanStore. Nur
+    Dateien, deren Größe in mindestens zwei Snapshots auftaucht und für die
+    noch kein Digest gespeichert ist, werden gelesen; der Digest wird danach
+    gespeichert, sodass jede Datei höchstens einmal gehasht wird. Dateien, die
+    nicht erreichbar sind oder sich seit dem Scan geändert haben, bleiben außen vor.
+
+    Innerhalb einer Gruppe stehen die Dateien in der Reihenfolge von
+    snapshot_ids, die erste Datei gilt also als Original. Pfade, die auf
+    dieselbe Datei zeigen (z.B. Laufwerksbuchstabe und UNC-Pfad derselben
+    Freigabe, oder Hardlinks), werden wie in find_duplicate_groups über
+    (st_dev, st_ino) zu einem Eintrag zusammengefasst. Rückgabe ist
+    ({Schlüssel: [Pfade]}, Statistik) oder (None, Statistik) bei Abbruch.
+    """
+    stats = {"candidates": 0, "stored_digests": 0, "fully_hashed": 0, "unavailable": 0, "bytes_read": 0}
+    candidates = store.cross_snapshot_candidates(snapshot_ids)
+    stats["candidates"] = len(candidates)
+
+    # Jede Datei nur einmal hashen, auch wenn sie in mehreren Snapshots vorkommt
+    missing = {}
+    for snapshot_id, path, size, mtime, digest in candidates:
+        if digest is None:
+            missing[(path, size, mtime)] = True
+        else:
+            stats["stored_digests"] += 1
+    jobs = list(missing)
+    new_digests = []
+    progress = {"done": 0}
+
+    def digest_job(job):
+        path, size, mtime = job
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            return None, False
+        if file_stat.st_size != size or file_stat.st_mtime != mtime:
+            # Geändert seit dem Scan: der Digest würde nicht zur gespeicherten Zeile passen
+            return None, False
+        return hash_with_cache(
+            hash_cache, path, "full_hash", algorithm,
+            lambda: calculate_file_hash(path, algorithm=algorithm)
+        )
+
+    def on_digest(job, result):
+        path, size, mtime = job
+        digest, cached = result
+        if digest:
+            new_digests.append((f"{algorithm}:{digest}", path, size, mtime))
+            stats["fully_hashed"] += 1
+            if not cached:
+                stats["bytes_read"] += size
+        else:
+            stats["unavailable"] += 1
+        progress["done"] += 1
+        if progress_callback:
+            progress_callback("Berechne fehlende Hashes...", progress["done"], len(jobs))
+
+    completed = run_parallel_jobs(jobs, digest_job, max_workers, on_digest, is_cancelled)
+    # Auch nach einem Abbruch bleiben die bereits berechneten Digests gespeichert
+    store.store_digests(new_digests)
+    if not completed:
+        return None, stats
+
+    snapshot_order = {snapshot_id: index for index, snapshot_id in enumerate(snapshot_ids)}
+    groups = defaultdict(dict)
+    for size, digest, snapshot_id, path in store.cross_snapshot_duplicates(snapshot_ids):
+        # Derselbe Pfad in mehreren Snapshots ist keine Kopie
+        members = groups[f"{size}-{digest}"]
+        members[path] = min(members.get(path, len(snapshot_order)), snapshot_order[snapshot_id])
+
+    # Verschiedene Pfade derselben Datei zusammenfassen, sonst wäre sie ihr eigenes Duplikat
+    identities = {}
+
+    def identity_job(path):
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            return None
+        return file_stat.st_dev, file_stat.st_ino
+
+    def on_identity(path, identity):
+        identities[path] = identity
+
+    member_paths = {path for members in groups.values() if len(members) > 1 for path in members}
+    if not run_parallel_jobs(member_paths, identity_job, max_workers, on_identity, is_cancelled):
+        return None, stats
+
+    duplicates = {}
+    for key, members in groups.items():
+        if len(members) < 2:
+            continue
+        files = {}
+        for path in sorted(members, key=lambda path: (members[path], path)):
+            identity = identities.get(path)
+            if identity is None:
+                continue
+            # Ohne Inode-Nummer (z.B. FAT) lässt sich nichts zusammenfassen
+            files.setdefault(identity if identity[1] else path, path)
+        paths = list(files.values())
+        if len(paths) > 1 and len({members[path] for path in paths}) > 1:
+            duplicates[key] = paths
+    return duplicates, stats
+
+def verify_group(filepaths, is_cancelled=None, signatures=None):
+    """Vergleicht alle Dateien einer Gruppe blockweise im Gleichschritt
+
+    Alle Dateien werden parallel Block für Block gelesen und nach dem Inhalt
+    des Blocks aufgeteilt. Eine Datei scheidet beim ersten abweichenden Block
+    aus, jede Datei wird also höchstens einmal sequentiell gelesen. Rückgabe
+    ist (Liste der Teilgruppen mit identischem Inhalt, gelesene Bytes); die
+    Reihenfolge innerhalb der Teilgruppen bleibt erhalten. Bei einem Abbruch
+    gilt nichts als geprüft. Pfade, die auf dieselbe Datei wie ein früherer
+    Pfad der Gruppe zeigen (os.path.samestat), werden nie bestätigt, denn sonst
+    würde eine Datei als Kopie ihrer selbst gelöscht. Ist signatures ein
+    dict, wird darin für jede geöffnete Datei (Größe, mtime in Nanosekunden)
+    vor dem Lesen vermerkt, damit spätere Änderungen erkennbar sind.
+    """
+    chunk_size = min(HASH_CHUNK_SIZE, max(VERIFY_MIN_CHUNK_SIZE, VERIFY_MEMORY_LIMIT // len(filepaths)))
+    files = []
+    identical = []
+    bytes_read = 0
+    try:
+        opened_stats = []
+        for filepath in filepaths:
+            try:
+                f = open(filepath, 'rb')
+            except OSError:
+                continue
+            try:
+                file_stat = os.fstat(f.fileno())
+            except OSError:
+                f.close()
+                continue
+            # Ohne Inode-Nummer (z.B. FAT) ist samestat nicht aussagekräftig
+            if file_stat.st_ino and any(os.path.samestat(file_stat, other) for other in opened_stats):
+                f.close()
+                continue
+            opened_stats.append(file_stat)
+            files.append((filepath, f))
+            if signatures is not None:
+                signatures[filepath] = (file_stat.st_size, file_stat.st_mtime_ns)
+        classes = [files] if len(files) > 1 else []
+        while classes:
+            if is_cancelled and is_cancelled():
+                return [], bytes_read
+            next_classes = []
+            for members in classes:
+                blocks = defaultdict(list)
+                for member in members:
+                    try:
+                        block = member[1].read(chunk_size)
+                    except OSError:
+                        continue
+                    bytes_read += len(block)
+                    blocks[block].append(member)
+                for block, group in blocks.items():
+                    if len(group) < 2:
+                        continue
+                    if block:
+                        next_classes.append(group)
+                    else:
+                        # Alle gemeinsam am Dateiende angekommen: Inhalt identisch
+                        identical.append([filepath for filepath, f in group])
+            classes = next_classes
+        return identical, bytes_read
+    finally:
+        for filepath, f in files:
+            f.close()
+
+def verify_duplicate_groups(duplicates, progress_callback=None, is_cancelled=None, max_workers=1, signatures=None):
+    """Prüft Duplikatgruppen byteweise, parallel über mehrere Gruppen
+
+    Rückgabe ist ({Schlüssel: [Pfade]} mit ausschließlich bestätigten Dateien,
+    Statistik) oder (None, Statistik) bei Abbruch. Sehr große Gruppen werden
+    in Teilen zu höchstens VERIFY_MAX_FILES Dateien geprüft. signatures wird
+    wie bei verify_group gefüllt.
+    """
+    stats = {"groups": len(duplicates), "verified": 0, "rejected": 0, "bytes_read": 0}
+    jobs = [
+        (hash_value, filepaths[start:start + VERIFY_MAX_FILES])
+        for hash_value, filepaths in duplicates.items()
+        for start in range(0, len(filepaths), VERIFY_MAX_FILES)
+    ]
+    verified = {}
+    progress = {"done": 0}
+
+    def on_verified(job, result):
+        hash_value, filepaths = job
+        groups, bytes_read = result
+        stats["bytes_read"] += bytes_read
+        for group in groups:
+            verified[f"{hash_value}-{len(verified)}"] = group
+            stats["verified"] += len(group)
+        stats["rejected"] += len(filepaths) - sum(len(group) for group in groups)
+        progress["done"] += 1
+        if progress_callback:
+            progress_callback("Vergleiche Duplikate byteweise...", progress["done"], len(jobs))
+
+    if not run_parallel_jobs(jobs, lambda job: verify_group(job[1], is_cancelled, signatures), max_workers, on_verified, is_cancelled):
+        return None, stats
+    return verified, stats
+
+def reclaimable_bytes(filepaths):
+    """Platz, der beim Löschen aller Dateien außer der ersten tatsächlich frei wird
+
+    Eine Datei mit weiteren Hardlinks außerhalb der Gruppe belegt ihren Platz
+    auch nach dem Löschen weiter und zählt daher nicht mit.
+    """
+    total = 0
+    for filepath in filepaths[1:]:
+        try:
+            file_stat = os.stat(filepath)
+        except OSError:
+            continue
+        if file_stat.st_nlink <= 1:
+            total += file_stat.st_size
+    return total
+
+class DuplicateFinder(BackgroundWorker):
+    """Führt die Duplikatsuche im Hintergrund mit parallelem Hashing aus"""
+    progress_update = Signal(str, int, int)  # Stufe, erledigt, gesamt
+    search_complete = Signal(dict, dict)  # Duplikate, Statistik
+    search_cancelled = Signal()
+
+    def __init__(self, size_groups, max_workers=None, hash_cache=None):
+        super().__init__()
+        self.size_groups = size_groups
+        self.hash_cache = hash_cache
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+
+    def run(self):
+        duplicates, stats = find_duplicate_groups(
+            self.size_groups,
+            progress_callback=self.report_progress,
+            is_cancelled=self.is_cancelled,
+            max_workers=self.max_workers,
+            hash_cache=self.hash_cache
+        )
+        if self.hash_cache is not None:
+            # Auch nach einem Abbruch bleiben die bereits berechneten Hashes erhalten
+            self.hash_cache.finish()
+        if duplicates is None:
+            self.search_cancelled.emit()
+        else:
+            self.search_complete.emit(duplicates, stats)
+
+class SnapshotDuplicateFinder(BackgroundWorker):
+    """Sucht im Hintergrund nach Duplikaten über mehrere gespeicherte Scans"""
+    progress_update = Signal(str, int, int)  # Stufe, erledigt, gesamt
+    search_complete = Signal(dict, dict)  # Duplikate, Statistik
+    search_cancelled = Signal()
+
+    def __init__(self, store, snapshot_ids, max_workers=None, hash_cache=None):
+        super().__init__()
+        self.store = store
+        self.snapshot_ids = snapshot_ids
+        self.hash_cache = hash_cache
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+
+    def run(self):
+        duplicates, stats = find_snapshot_duplicates(
+            self.store,
+            self.snapshot_ids,
+            progress_callback=self.report_progress,
+            is_cancelled=self.is_cancelled,
+            max_workers=self.max_workers,
+            hash_cache=self.hash_cache
+        )
+        if self.hash_cache is not None:
+            self.hash_cache.finish()
+        if duplicates is None:
+            self.search_cancelled.emit()
+        else:
+            self.search_complete.emit(duplicates, stats)
+
+class DuplicateVerifier(BackgroundWorker):
+    """Prüft gefundene Duplikate im Hintergrund byteweise vor dem Löschen"""
+    progress_update = Signal(str, int, int)  # Stufe, erledigt, gesamt
+    verification_complete = Signal(dict, dict)  # bestätigte Duplikate, Statistik
+    verification_cancelled = Signal()
+
+    def __init__(self, duplicates, max_workers=None, signatures=None):
+        super().__init__()
+        self.duplicates = duplicates
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+        self.signatures = signatures
+
+    def run(self):
+        verified, stats = verify_duplicate_groups(
+            self.duplicates,
+            progress_callback=self.report_progress,
+            is_cancelled=self.is_cancelled,
+            max_workers=self.max_workers,
+            signatures=self.signatures
+        )
+        if verified is None:
+            self.verification_cancelled.emit()
+        else:
+            self.verification_complete.emit(verified, stats)
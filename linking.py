@@ -0,0 +1,121 @@
+import os
+import sys
+import errno
+import shutil
+import uuid
+import ctypes
+import ctypes.util
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl zum Klonen einer Datei (Btrfs, XFS, bcachefs, ...), _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# clonefile(2) aus der libc, ab macOS 10.12 (APFS)
+darwin_clonefile = None
+if sys.platform == "darwin":
+    darwin_clonefile = getattr(ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True), "clonefile", None)
+    if darwin_clonefile is not None:
+        darwin_clonefile.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_uint32]
+        darwin_clonefile.restype = ctypes.c_int
+
+# Fehler, bei denen das Dateisystem schlicht keine Reflinks kann
+REFLINK_UNSUPPORTED = {
+    errno.EOPNOTSUPP, errno.ENOTSUP, errno.ENOTTY, errno.EINVAL, errno.EXDEV, errno.ENOSYS, errno.EPERM
+}
+
+def clone_file(source, target):
+    """Legt target als Reflink von source an (gemeinsame Blöcke, getrennte Dateien)
+
+    Unterstützt werden Linux (FICLONE, z.B. Btrfs und XFS) und macOS
+    (clonefile auf APFS). Unter Windows ist das Klonen auf ReFS bzw. Dev
+    Drive (FSCTL_DUPLICATE_EXTENTS_TO_FILE) nicht umgesetzt. Gibt False
+    zurück, wenn das System oder Dateisystem das nicht unterstützt.
+    """
+    if darwin_clonefile is not None:
+        if darwin_clonefile(os.fsencode(source), os.fsencode(target), 0) == 0:
+            return True
+        error = ctypes.get_errno()
+        if error in REFLINK_UNSUPPORTED:
+            return False
+        raise OSError(error, os.strerror(error), target)
+    if fcntl is None or not hasattr(fcntl, "ioctl"):
+        return False
+    with open(source, "rb") as source_file:
+        target_fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            fcntl.ioctl(target_fd, FICLONE, source_file.fileno())
+        except OSError as e:
+            os.close(target_fd)
+            os.remove(target)
+            if e.errno in REFLINK_UNSUPPORTED:
+                return False
+            raise
+        os.close(target_fd)
+    return True
+
+def replace_with_link(path, source, reflink=True, signatures=None):
+    """Ersetzt path atomar durch einen Reflink bzw. Hardlink auf source
+
+    Der Link wird zuerst unter einem temporären Namen im selben Verzeichnis
+    angelegt und dann per os.replace über path geschoben, sodass path zu jedem
+    Zeitpunkt existiert. Reflinks behalten Rechte und Zeitstempel von path,
+    Hardlinks teilen sie mit source. signatures bildet Pfade auf (Größe,
+    mtime in Nanosekunden) zum Zeitpunkt der byteweisen Prüfung ab (siehe
+    verify_group); wurde eine der beiden Dateien seitdem geändert, bleibt path
+    unverändert. Gibt "reflink", "hardlink" oder "verknüpft" (schon dieselbe
+    Datei) zurück.
+    """
+    source_stats = os.stat(source)
+    path_stats = os.stat(path)
+    if os.path.samestat(source_stats, path_stats):
+        return "verknüpft"
+    if source_stats.st_size != path_stats.st_size:
+        raise ValueError(f"Größe weicht von {source} ab")
+    if signatures is not None:
+        for filepath, file_stats in ((source, source_stats), (path, path_stats)):
+            if signatures.get(filepath) != (file_stats.st_size, file_stats.st_mtime_ns):
+                raise ValueError(f"{filepath} wurde seit der Prüfung geändert")
+    if source_stats.st_dev != path_stats.st_dev:
+        raise OSError(errno.EXDEV, f"{source} liegt auf einem anderen Laufwerk")
+
+    directory, name = os.path.split(path)
+    temp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        if reflink and clone_file(source, temp_path):
+            shutil.copystat(path, temp_path)
+            method = "reflink"
+        else:
+            os.link(source, temp_path)
+            method = "hardlink"
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    return method
+
+def link_targets(duplicates):
+    """Ordnet jedem Duplikat die Datei zu, auf die es verlinkt werden soll
+
+    Pro Gruppe und Laufwerk bleibt die erste Datei erhalten, denn Links über
+    Laufwerksgrenzen hinweg sind nicht möglich.
+    """
+    targets = {}
+    for filepaths in duplicates.values():
+        keepers = {}
+        for filepath in filepaths:
+            try:
+                device = os.stat(filepath).st_dev
+            except OSError:
+                continue
+            if device in keepers:
+                targets[filepath] = keepers[device]
+            else:
+                keepers[device] = filepath
+    return targets
@@ -0,0 +1,524 @@
+import os
+from array import array
+from collections import OrderedDict, defaultdict
+from itertools import accumulate, compress
+from datetime import datetime
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QColor
+
+from utils import format_size, PATH_OK, PATH_IS_DIRECTORY, PATH_MISSING
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+class StringPool:
+    """Vergibt für jeden eindeutigen String eine ganzzahlige ID"""
+
+    def __init__(self):
+        self.values = []
+        self.ids = {}
+
+    def intern(self, value):
+        value_id = self.ids.get(value)
+        if value_id is None:
+            value_id = len(self.values)
+            self.values.append(value)
+            self.ids[value] = value_id
+        return value_id
+
+    def clear(self):
+        self.values = []
+        self.ids = {}
+
+    def sort_ranks(self):
+        """Rang jeder ID in alphabetischer Reihenfolge (vorberechneter Sortierschlüssel)"""
+        ranks = [0] * len(self.values)
+        for rank, value_id in enumerate(sorted(range(len(self.values)), key=lambda i: self.values[i].lower())):
+            ranks[value_id] = rank
+        return ranks
+
+class FileTableModel(QAbstractTableModel):
+    """Spaltenbasiertes Modell für die Scan-Ergebnisse
+
+    Größe und Änderungszeit liegen als typisierte Arrays vor, Verzeichnisse,
+    Dateitypen und Besitzer als IDs in String-Pools. Anzeige-Strings werden erst
+    in data() und damit nur für sichtbare Zeilen erzeugt.
+    """
+
+    HEADERS = ["Dateipfad", "Größe", "Datum", "Typ", "Ersteller"]
+    PATH, SIZE, DATE, TYPE, OWNER = range(5)
+    # Ab so vielen zusammenhängenden Bereichen wird beim Entfernen neu geladen
+    MAX_REMOVE_RANGES = 100
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.directories = StringPool()
+        self.types = StringPool()
+        self.owners = StringPool()
+        self.clear_columns()
+
+    def clear_columns(self):
+        self.directory_ids = array('i')
+        self.names = []
+        self.sizes = array('q')
+        self.mtimes = array('d')
+        self.type_ids = array('i')
+        self.owner_ids = array('i')
+        # Abbildung Ansichtszeile -> Speicherzeile; None bedeutet Einfügereihenfolge
+        self.order = None
+        self.directories.clear()
+        self.types.clear()
+        self.owners.clear()
+
+    def clear(self):
+        self.beginResetModel()
+        self.clear_columns()
+        self.endResetModel()
+
+    # --- Qt-Schnittstelle ---------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.names)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        storage_row = self.storage_row(index.row())
+        column = index.column()
+        if column == self.PATH:
+            return self.storage_path(storage_row)
+        if column == self.SIZE:
+            return format_size(self.sizes[storage_row])
+        if column == self.DATE:
+            return datetime.fromtimestamp(self.mtimes[storage_row]).strftime(DATE_FORMAT)
+        if column == self.TYPE:
+            return self.types.values[self.type_ids[storage_row]]
+        if column == self.OWNER:
+            return self.owners.values[self.owner_ids[storage_row]]
+        return None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        row_count = len(self.names)
+        if column == self.PATH:
+            directory_ranks = self.directories.sort_ranks()
+            key = lambda i: (directory_ranks[self.directory_ids[i]], self.names[i].lower())
+        elif column == self.SIZE:
+            key = self.sizes.__getitem__
+        elif column == self.DATE:
+            key = self.mtimes.__getitem__
+        elif column == self.TYPE:
+            type_ranks = self.types.sort_ranks()
+            key = lambda i: type_ranks[self.type_ids[i]]
+        else:
+            owner_ranks = self.owners.sort_ranks()
+            key = lambda i: owner_ranks[self.owner_ids[i]]
+        self.order = array('l', sorted(
+            range(row_count),
+            key=key,
+            reverse=order == Qt.SortOrder.DescendingOrder
+        ))
+        self.layoutChanged.emit()
+
+    # --- Zugriff auf die Spalten ------------------------------------------------
+
+    def storage_row(self, row):
+        return row if self.order is None else self.order[row]
+
+    def storage_path(self, storage_row):
+        return os.path.join(self.directories.values[self.directory_ids[storage_row]], self.names[storage_row])
+
+    def path(self, row):
+        return self.storage_path(self.storage_row(row))
+
+    def size(self, row):
+        return self.sizes[self.storage_row(row)]
+
+    def mtime(self, row):
+        return self.mtimes[self.storage_row(row)]
+
+    def file_type(self, row):
+        return self.types.values[self.type_ids[self.storage_row(row)]]
+
+    def owner(self, row):
+        return self.owners.values[self.owner_ids[self.storage_row(row)]]
+
+    def date_text(self, row):
+        return datetime.fromtimestamp(self.mtime(row)).strftime(DATE_FORMAT)
+
+    def paths(self):
+        """Alle Pfade in Speicherreihenfolge"""
+        return [self.storage_path(i) for i in range(len(self.names))]
+
+    def rows(self):
+        """Alle Zeilen als (Pfad, Größe, mtime, Typ, Besitzer) in Speicherreihenfolge"""
+        types = self.types.values
+        owners = self.owners.values
+        return [
+            (self.storage_path(i), self.sizes[i], self.mtimes[i], types[self.type_ids[i]], owners[self.owner_ids[i]])
+            for i in range(len(self.names))
+        ]
+
+    # --- Ändern ---------------------------------------------------------------
+
+    def size_by_type(self):
+        """Summierte Größe je Dateityp"""
+        sizes_by_type_id = defaultdict(int)
+        for type_id, size in zip(self.type_ids, self.sizes):
+            sizes_by_type_id[type_id] += size
+        return {self.types.values[type_id]: size for type_id, size in sizes_by_type_id.items()}
+
+    def duplicate_size_candidates(self):
+        """Pfade gruppiert nach Größe, nur für Größen mit mehr als einer Datei"""
+        rows_by_size = defaultdict(list)
+        for storage_row, size in enumerate(self.sizes):
+            rows_by_size[size].append(storage_row)
+        return {
+            size: [self.storage_path(storage_row) for storage_row in storage_rows]
+            for size, storage_rows in rows_by_size.items()
+            if len(storage_rows) > 1
+        }
+
+    def add_rows(self, rows):
+        """Hängt (Pfad, Größe, mtime, Typ, Besitzer)-Zeilen in einer Modelloperation an"""
+        if not rows:
+            return
+        first = len(self.names)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for path, size, mtime, file_type, owner in rows:
+            directory, name = os.path.split(path)
+            self.directory_ids.append(self.directories.intern(directory))
+            self.names.append(name)
+            self.sizes.append(int(size))
+            self.mtimes.append(float(mtime))
+            self.type_ids.append(self.types.intern(file_type))
+            self.owner_ids.append(self.owners.intern(owner))
+        if self.order is not None:
+            # Neue Zeilen landen unsortiert am Ende der aktuellen Sortierung
+            self.order.extend(range(first, len(self.names)))
+        self.endInsertRows()
+
+    def remove_row(self, row):
+        """Entfernt eine einzelne Ansichtszeile"""
+        storage_row = self.storage_row(row)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        for column in (self.directory_ids, self.names, self.sizes, self.mtimes, self.type_ids, self.owner_ids):
+            del column[storage_row]
+        if self.order is not None:
+            del self.order[row]
+            self.order = array('l', (i - 1 if i > storage_row else i for i in self.order))
+        self.endRemoveRows()
+
+    def remove_paths(self, paths):
+        """Entfernt alle Zeilen zu den angegebenen Pfaden in O(n)
+
+        Die betroffenen Ansichtszeilen werden zu zusammenhängenden Bereichen
+        zusammengefasst und je Bereich mit einem beginRemoveRows gemeldet; bei
+        sehr vielen Bereichen wird das Modell stattdessen einmal neu geladen.
+        Die Spalten werden danach in einem Durchgang verdichtet.
+        """
+        wanted = set()
+        for path in paths:
+            directory, name = os.path.split(path)
+            directory_id = self.directories.ids.get(directory)
+            if directory_id is not None:
+                wanted.add((directory_id, name))
+        if not wanted:
+            return
+        keep = bytearray(
+            (directory_id, name) not in wanted for directory_id, name in zip(self.directory_ids, self.names)
+        )
+        row_count = len(keep)
+        if all(keep):
+            return
+
+        # Zusammenhängende Ansichtsbereiche der zu entfernenden Zeilen
+        ranges = []
+        first = None
+        view_keep = keep if self.order is None else map(keep.__getitem__, self.order)
+        for row, kept in enumerate(view_keep):
+            if not kept and first is None:
+                first = row
+            elif kept and first is not None:
+                ranges.append((first, row - 1))
+                first = None
+        if first is not None:
+            ranges.append((first, row_count - 1))
+
+        reset = len(ranges) > self.MAX_REMOVE_RANGES
+        unsorted = self.order is None
+        if reset:
+            self.beginResetModel()
+        else:
+            # Während der Bereichsmeldungen wird nur die Ansichtsreihenfolge gekürzt,
+            # die Spalten selbst bleiben bis zum Verdichten unverändert
+            if self.order is None:
+                self.order = array('l', range(row_count))
+            for first, last in reversed(ranges):
+                self.beginRemoveRows(QModelIndex(), first, last)
+                del self.order[first:last + 1]
+                self.endRemoveRows()
+
+        # Neue Speicherzeile jeder behaltenen Zeile = Anzahl behaltener Zeilen davor
+        new_rows = list(accumulate(keep, initial=0))
+        self.directory_ids = array('i', compress(self.directory_ids, keep))
+        self.names = list(compress(self.names, keep))
+        self.sizes = array('q', compress(self.sizes, keep))
+        self.mtimes = array('d', compress(self.mtimes, keep))
+        self.type_ids = array('i', compress(self.type_ids, keep))
+        self.owner_ids = array('i', compress(self.owner_ids, keep))
+        if unsorted:
+            self.order = None
+        else:
+            if reset:
+                self.order = array('l', compress(self.order, map(keep.__getitem__, self.order)))
+            self.order = array('l', map(new_rows.__getitem__, self.order))
+        if reset:
+            self.endResetModel()
+
+class StoredFileTableModel(QAbstractTableModel):
+    """Fenster-Modell über einen Snapshot im ScanStore (Streaming-Modus)
+
+    Es werden nur die gerade benötigten Seiten aus SQLite gelesen und in einem
+    kleinen LRU-Cache gehalten, sodass der Speicherbedarf auch bei zig Millionen
+    Dateien konstant bleibt. Sortiert wird über die Indizes der Datenbank.
+    Von jeder gelesenen Seite wird der Schlüssel der letzten Zeile gemerkt; die
+    folgende Seite wird ab diesem Schlüssel gelesen (Keyset-Paging), sodass
+    Blättern nicht mit der Tiefe langsamer wird. Nur bei Sprüngen wird ab der
+    nächsten bekannten Seite davor per OFFSET gezählt.
+    """
+
+    HEADERS = FileTableModel.HEADERS
+    PATH, SIZE, DATE, TYPE, OWNER = range(5)
+    PAGE_SIZE = 500
+    MAX_PAGES = 40
+
+    def __init__(self, store, snapshot_id, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.snapshot_id = snapshot_id
+        self.row_count = store.count_rows(snapshot_id)
+        self.sort_column = self.PATH
+        self.descending = False
+        self.pages = OrderedDict()
+        self.page_ends = {}  # Seite -> Schlüssel ihrer letzten Zeile
+
+    # --- Qt-Schnittstelle ---------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        row = self.row_values(index.row())
+        if row is None:
+            return None
+        column = index.column()
+        if column == self.SIZE:
+            return format_size(row[1])
+        if column == self.DATE:
+            return datetime.fromtimestamp(row[2]).strftime(DATE_FORMAT)
+        return row[column]
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        self.sort_column = column
+        self.descending = order == Qt.SortOrder.DescendingOrder
+        self.clear_pages()
+        self.layoutChanged.emit()
+
+    # --- Seitencache ----------------------------------------------------------
+
+    def clear_pages(self):
+        self.pages.clear()
+        self.page_ends.clear()
+
+    def load_page(self, page_number):
+        # Nächste bekannte Seite davor als Startpunkt, sonst vom Anfang
+        known = [number for number in self.page_ends if number < page_number]
+        start = max(known) if known else None
+        after = self.page_ends[start] if start is not None else None
+        skipped_pages = page_number - (start + 1 if start is not None else 0)
+        page = self.store.fetch_page(
+            self.snapshot_id, self.sort_column, self.descending,
+            skipped_pages * self.PAGE_SIZE, self.PAGE_SIZE, after
+        )
+        if page:
+            self.page_ends[page_number] = self.store.sort_key(page[-1], self.sort_column)
+        return page
+
+    def row_values(self, row):
+        page_number, offset = divmod(row, self.PAGE_SIZE)
+        page = self.pages.get(page_number)
+        if page is None:
+            page = self.load_page(page_number)
+            self.pages[page_number] = page
+            while len(self.pages) > self.MAX_PAGES:
+                self.pages.popitem(last=False)
+        else:
+            self.pages.move_to_end(page_number)
+        return page[offset] if offset < len(page) else None
+
+    def refresh(self, row_count):
+        """Übernimmt neu gespeicherte Zeilen während eines laufenden Scans"""
+        if row_count <= self.row_count:
+            return
+        self.beginInsertRows(QModelIndex(), self.row_count, row_count - 1)
+        self.row_count = row_count
+        self.endInsertRows()
+        # Neue Zeilen können sich überall einsortieren, sichtbare Seiten neu laden
+        self.clear_pages()
+        self.dataChanged.emit(self.index(0, 0), self.index(row_count - 1, len(self.HEADERS) - 1))
+
+    # --- Zugriff wie beim FileTableModel --------------------------------------
+
+    def path(self, row):
+        return self.row_values(row)[0]
+
+    def size(self, row):
+        return self.row_values(row)[1]
+
+    def mtime(self, row):
+        return self.row_values(row)[2]
+
+    def file_type(self, row):
+        return self.row_values(row)[3]
+
+    def owner(self, row):
+        return self.row_values(row)[4]
+
+    def date_text(self, row):
+        return datetime.fromtimestamp(self.mtime(row)).strftime(DATE_FORMAT)
+
+    def paths(self):
+        return (row[0] for row in self.store.iter_rows(self.snapshot_id))
+
+    def rows(self):
+        return self.store.iter_rows(self.snapshot_id)
+
+    def size_by_type(self):
+        return self.store.size_by_type(self.snapshot_id)
+
+    def duplicate_size_candidates(self):
+        return self.store.duplicate_size_candidates(self.snapshot_id)
+
+    def clear(self):
+        self.beginResetModel()
+        self.row_count = 0
+        self.clear_pages()
+        self.endResetModel()
+
+    def remove_row(self, row):
+        path = self.path(row)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self.store.delete_paths(self.snapshot_id, [path])
+        self.row_count -= 1
+        self.clear_pages()
+        self.endRemoveRows()
+
+    def remove_paths(self, paths):
+        """Entfernt alle Pfade in einer Datenbanktransaktion und lädt die Ansicht neu"""
+        self.beginResetModel()
+        self.store.delete_paths(self.snapshot_id, paths)
+        self.row_count = self.store.count_rows(self.snapshot_id)
+        self.clear_pages()
+        self.endResetModel()
+
+class PathStatusModel(QAbstractTableModel):
+    """Ergebnisliste der Massenlöschung: Pfad und Prüfstatus je Zeile
+
+    Die Ergebnisse der Pfadprüfung kommen gebündelt aus dem Hintergrund und
+    werden blockweise angehängt, statt für jede Zeile ein Widget anzulegen.
+    """
+
+    HEADERS = ["Dateipfad", "Status"]
+    PATH, STATUS = range(2)
+    STATUS_TEXTS = {
+        PATH_OK: "✅ Datei existiert",
+        PATH_IS_DIRECTORY: "❌ Ist ein Ordner",
+        PATH_MISSING: "❌ Datei nicht gefunden",
+    }
+    STATUS_COLORS = {
+        PATH_OK: QColor("#e8f5e9"),  # Hellgrün
+        PATH_IS_DIRECTORY: QColor("#ffebee"),  # Hellrot
+        PATH_MISSING: QColor("#ffebee"),
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.paths = []
+        self.statuses = array('b')
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.paths)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            if index.column() == self.PATH:
+                return self.paths[row]
+            return self.STATUS_TEXTS[self.statuses[row]]
+        if role == Qt.ItemDataRole.BackgroundRole and index.column() == self.STATUS:
+            return self.STATUS_COLORS[self.statuses[row]]
+        return None
+
+    def clear(self):
+        self.beginResetModel()
+        self.paths = []
+        self.statuses = array('b')
+        self.endResetModel()
+
+    def add_results(self, results):
+        """Hängt (Pfad, Status)-Paare in einer Modelloperation an"""
+        if not results:
+            return
+        first = len(self.paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(results) - 1)
+        for path, status in results:
+            self.paths.append(path)
+            self.statuses.append(status)
+        self.endInsertRows()
+
+    def valid_paths(self):
+        return [path for path, status in zip(self.paths, self.statuses) if status == PATH_OK]
+
+    def count(self, status):
+        return self.statuses.count(status)
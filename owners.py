@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from threading import Lock
+
+try:
+    import win32security
+except ImportError:  # Kein Windows bzw. pywin32 nicht installiert
+    win32security = None
+
+try:
+    import pwd
+    import grp
+except ImportError:  # Windows
+    pwd = None
+    grp = None
+
+UNKNOWN_OWNER = "Unbekannt"
+
+class OwnerCache:
+    """Begrenzter LRU-Cache für die Auflösung von Besitzer-IDs zu Namen
+
+    Unter Windows wird nach der SID aus dem Security Descriptor gecacht, damit
+    LookupAccountSid (ggf. ein Aufruf am Domain Controller) nur einmal pro
+    Besitzer läuft. Unter Linux wird nach (uid, gid) über pwd/grp aufgelöst.
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_owner(self, record):
+        """Liefert den Besitzer eines FileRecord als lesbaren Namen"""
+        try:
+            if win32security is not None:
+                sd = win32security.GetFileSecurity(
+                    record.path,
+                    win32security.OWNER_SECURITY_INFORMATION
+                )
+                owner_sid = sd.GetSecurityDescriptorOwner()
+                key = win32security.ConvertSidToStringSid(owner_sid)
+                return self.lookup(key, lambda: self.resolve_sid(owner_sid))
+            if pwd is not None:
+                key = (record.uid, record.gid)
+                return self.lookup(key, lambda: self.resolve_uid(record.uid, record.gid))
+        except Exception:
+            pass
+        return UNKNOWN_OWNER
+
+    def lookup(self, key, resolve):
+        with self.lock:
+            name = self.entries.get(key)
+            if name is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return name
+            self.misses += 1
+
+        # Die Auflösung läuft außerhalb des Locks, damit langsame
+        # Domain-Abfragen andere Worker nicht blockieren
+        name = resolve()
+        with self.lock:
+            self.entries[key] = name
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return name
+
+    def resolve_sid(self, owner_sid):
+        try:
+            name, domain, type = win32security.LookupAccountSid(None, owner_sid)
+            return f"{domain}\\{name}"
+        except Exception:
+            return UNKNOWN_OWNER
+
+    def resolve_uid(self, uid, gid):
+        try:
+            user = pwd.getpwuid(uid).pw_name
+        except KeyError:
+            user = str(uid)
+        try:
+            group = grp.getgrgid(gid).gr_name
+        except KeyError:
+            group = str(gid)
+        return f"{user}:{group}"
+
+    def stats(self):
+        """Gibt Treffer, Fehlgriffe und die Anzahl gecachter Besitzer zurück"""
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
@@ -0,0 +1,232 @@
+import os
+import sqlite3
+import time
+from itertools import count
+from threading import Lock
+
+from scan_store import DEFAULT_DB_PATH
+from utils import QUARANTINE_DIRECTORY
+
+class Quarantine:
+    """Verschiebt Dateien in einen Quarantäne-Ordner auf demselben Laufwerk
+
+    Statt zu löschen wird jede Datei per rename in QUARANTINE_DIRECTORY im
+    Wurzelverzeichnis ihres Laufwerks verschoben; es werden also keine Daten
+    kopiert. Ist die Wurzel nicht beschreibbar, wird ein Quarantäne-Ordner im
+    Verzeichnis der Datei angelegt. Jede Löschaktion bildet eine Sitzung, die
+    sich über das Journal (SQLite) als Ganzes zurückbenennen lässt. Einträge
+    älter als RETENTION werden von purge endgültig gelöscht.
+
+    Die Journal-Einträge eines Auftrags werden festgeschrieben, bevor die
+    Dateien verschoben werden. Nach einem Absturz gibt es daher höchstens
+    Einträge ohne verschobene Datei; restore und purge räumen diese auf.
+    """
+
+    RETENTION = 30 * 24 * 60 * 60  # Sekunden, die Dateien in Quarantäne bleiben
+    FLUSH_INTERVAL = 500  # gesammelte Löschungen aus dem Journal pro Schreibtransaktion
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self.lock = Lock()
+        self.connection = None
+        self.pending_removals = []
+        self.staging_directories = {}
+        self.emptied_directories = set()
+        self.volume_roots = {}
+        self.counter = count()
+
+    def open(self):
+        if self.connection is not None:
+            return
+        # Die Lösch-Worker teilen sich eine Verbindung, abgesichert über self.lock
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS quarantine (
+                quarantine_path TEXT PRIMARY KEY,
+                original_path TEXT NOT NULL,
+                session TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                moved REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_quarantine_session ON quarantine(session);
+            CREATE INDEX IF NOT EXISTS idx_quarantine_moved ON quarantine(moved);
+        """)
+
+    def begin_session(self):
+        """Neue Sitzung für eine Löschaktion"""
+        return time.strftime("%Y%m%d-%H%M%S")
+
+    # --- Verschieben ----------------------------------------------------------
+
+    def get_volume_root(self, directory):
+        """Oberstes Verzeichnis auf demselben Dateisystem"""
+        root = self.volume_roots.get(directory)
+        if root is None:
+            drive = os.path.splitdrive(directory)[0]
+            if drive:
+                # Windows: Laufwerksbuchstabe oder UNC-Freigabe
+                root = drive + os.sep
+            else:
+                device = os.stat(directory).st_dev
+                root = directory
+                parent = os.path.dirname(root)
+                while parent != root and os.stat(parent).st_dev == device:
+                    root, parent = parent, os.path.dirname(parent)
+            self.volume_roots[directory] = root
+        return root
+
+    def get_staging_directory(self, directory, session):
+        key = (directory, session)
+        staging = self.staging_directories.get(key)
+        if staging is None:
+            staging = os.path.join(self.get_volume_root(directory), QUARANTINE_DIRECTORY, session)
+            try:
+                os.makedirs(staging, exist_ok=True)
+            except OSError:
+                # Wurzel nicht beschreibbar: Quarantäne neben der Datei, ebenfalls ohne Kopie
+                staging = os.path.join(directory, QUARANTINE_DIRECTORY, session)
+                os.makedirs(staging, exist_ok=True)
+            self.staging_directories[key] = staging
+        return staging
+
+    def move_paths(self, paths, session):
+        """Verschiebt einen Auftrag von Dateien in die Quarantäne (aus den Lösch-Workern)
+
+        Gibt (verschobene Pfade, [(Pfad, Fehler)]) zurück, passend zu
+        FileDeleter(chunk_operation=...).
+        """
+        entries = []
+        failed = []
+        moved_at = time.time()
+        for path in paths:
+            try:
+                directory, name = os.path.split(path)
+                size = os.stat(path).st_size
+                target = os.path.join(self.get_staging_directory(directory, session), f"{next(self.counter):08d}_{name}")
+                entries.append((target, path, session, size, moved_at))
+            except Exception as e:
+                failed.append((path, str(e)))
+
+        # Erst das Journal, dann umbenennen: keine Datei liegt ohne Eintrag in der Quarantäne
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO quarantine (quarantine_path, original_path, session, size, moved) "
+                "VALUES (?, ?, ?, ?, ?)",
+                entries
+            )
+
+        moved = []
+        not_moved = []
+        for target, path, session, size, moved_at in entries:
+            try:
+                # os.rename kopiert nie; über Laufwerksgrenzen hinweg schlägt es fehl
+                os.rename(path, target)
+                moved.append(path)
+            except Exception as e:
+                failed.append((path, str(e)))
+                not_moved.append((target,))
+        if not_moved:
+            with self.lock, self.connection:
+                self.connection.executemany("DELETE FROM quarantine WHERE quarantine_path = ?", not_moved)
+        return moved, failed
+
+    # --- Wiederherstellen und Löschen ------------------------------------------
+
+    def restore(self, quarantine_path):
+        """Benennt eine Datei aus der Quarantäne an ihren ursprünglichen Ort zurück"""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT original_path FROM quarantine WHERE quarantine_path = ?", (quarantine_path,)
+            ).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"Nicht im Quarantäne-Journal: {quarantine_path}")
+        original_path = row[0]
+        if not os.path.lexists(quarantine_path) and os.path.lexists(original_path):
+            # Eintrag eines abgebrochenen Verschiebens, die Datei liegt noch am Ursprungsort
+            self.forget([quarantine_path])
+            return
+        if os.path.exists(original_path):
+            raise FileExistsError(f"Ziel existiert bereits: {original_path}")
+        os.makedirs(os.path.dirname(original_path), exist_ok=True)
+        os.rename(quarantine_path, original_path)
+        self.forget([quarantine_path])
+
+    def purge(self, quarantine_path):
+        """Löscht eine Datei aus der Quarantäne endgültig"""
+        try:
+            os.remove(quarantine_path)
+        except FileNotFoundError:
+            pass  # bereits von Hand entfernt, nur noch aus dem Journal streichen
+        self.forget([quarantine_path])
+
+    def forget(self, quarantine_paths):
+        """Entfernt Einträge aus dem Journal, z.B. nachdem die Dateien endgültig gelöscht wurden"""
+        with self.lock:
+            self.pending_removals.extend(quarantine_paths)
+            self.emptied_directories.update(os.path.dirname(path) for path in quarantine_paths)
+            if len(self.pending_removals) >= self.FLUSH_INTERVAL:
+                self.write_pending()
+
+    def write_pending(self):
+        # Aufrufer hält self.lock
+        removals, self.pending_removals = self.pending_removals, []
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM quarantine WHERE quarantine_path = ?", [(path,) for path in removals]
+            )
+
+    def finish(self):
+        """Schreibt das Journal und entfernt leer gewordene Sitzungsordner
+
+        Erst aufrufen, wenn keine Verschiebungen mehr laufen: Leere
+        Sitzungsordner werden entfernt, und ein paralleles move_paths würde
+        in einen gerade gelöschten Ordner umbenennen wollen.
+        """
+        with self.lock:
+            self.write_pending()
+            staging_directories = set(self.staging_directories.values()) | self.emptied_directories
+            self.staging_directories = {}
+            self.emptied_directories = set()
+        for staging in staging_directories:
+            try:
+                os.rmdir(staging)
+            except OSError:
+                pass  # nicht leer oder schon entfernt
+
+    # --- Abfragen -------------------------------------------------------------
+
+    def sessions(self):
+        """Alle Sitzungen als (Sitzung, verschoben am, Anzahl, Größe), neueste zuerst"""
+        with self.lock:
+            self.write_pending()
+            return self.connection.execute(
+                "SELECT session, MIN(moved), COUNT(*), SUM(size) FROM quarantine "
+                "GROUP BY session ORDER BY session DESC"
+            ).fetchall()
+
+    def session_paths(self, session):
+        with self.lock:
+            return [
+                path for (path,) in self.connection.execute(
+                    "SELECT quarantine_path FROM quarantine WHERE session = ?", (session,)
+                )
+            ]
+
+    def expired_paths(self, max_age=RETENTION):
+        """Dateien, die länger als max_age in Quarantäne liegen und endgültig gelöscht werden können"""
+        with self.lock:
+            self.write_pending()
+            return [
+                path for (path,) in self.connection.execute(
+                    "SELECT quarantine_path FROM quarantine WHERE moved < ?", (time.time() - max_age,)
+                )
+            ]
+
+    def close(self):
+        if self.connection is not None:
+            with self.lock:
+                self.write_pending()
+                self.connection.close()
+                self.connection = None
@@ -0,0 +1,602 @@
+import os
+import json
+import sqlite3
+import time
+from threading import Lock
+
+from scanner import FileRecord
+
+DEFAULT_DB_PATH = "scan_store.db"
+
+class DirectoryIndex:
+    """Persistenter Index aller gescannten Verzeichnisse mit ihrer mtime
+
+    Für jedes Verzeichnis werden die mtime, die Unterverzeichnisse und die
+    Metadaten der enthaltenen Dateien gespeichert. Bei einem erneuten Scan
+    muss ein Verzeichnis nur dann neu gelistet werden, wenn sich seine mtime
+    geändert hat (Dateien angelegt, gelöscht oder umbenannt). Inhaltliche
+    Änderungen an bestehenden Dateien ändern die Verzeichnis-mtime nicht; der
+    Scanner fragt übernommene Dateien, die alle Filter bestehen, deshalb noch
+    einmal per stat ab (siehe FileScanner.process_file).
+    """
+
+    FLUSH_INTERVAL = 500  # Verzeichnisse pro Schreibtransaktion
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self.lock = Lock()
+        self.connection = None
+        self.generation = 0
+        self.pending_stores = []
+        self.pending_touches = []
+
+    def open(self):
+        if self.connection is not None:
+            return
+        # Die Scan-Worker teilen sich eine Verbindung, abgesichert über self.lock
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS directories (
+                path TEXT PRIMARY KEY,
+                mtime REAL NOT NULL,
+                subdirectories TEXT NOT NULL,
+                generation INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS directory_files (
+                directory TEXT NOT NULL,
+                name TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                atime REAL NOT NULL,
+                inode INTEGER NOT NULL,
+                device INTEGER NOT NULL,
+                attributes INTEGER NOT NULL,
+                uid INTEGER NOT NULL,
+                gid INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_directory_files_directory ON directory_files(directory);
+        """)
+        row = self.connection.execute("SELECT MAX(generation) FROM directories").fetchone()
+        self.generation = (row[0] or 0) + 1
+
+    def lookup(self, path, mtime):
+        """Liefert (FileRecords, Unterverzeichnisse), falls das Verzeichnis unverändert ist"""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT mtime, subdirectories FROM directories WHERE path = ?", (path,)
+            ).fetchone()
+            if row is None or row[0] != mtime:
+                return None
+            file_rows = self.connection.execute(
+                "SELECT name, size, mtime, atime, inode, device, attributes, uid, gid "
+                "FROM directory_files WHERE directory = ?", (path,)
+            ).fetchall()
+            self.pending_touches.append((self.generation, path))
+            self.flush_if_needed()
+
+        records = [FileRecord(os.path.join(path, name), *values) for name, *values in file_rows]
+        return records, json.loads(row[1])
+
+    def store(self, path, mtime, records, subdirectories):
+        """Merkt sich das Ergebnis eines frisch gelisteten Verzeichnisses"""
+        file_rows = [
+            (path, os.path.basename(record.path)) + tuple(record[1:])
+            for record in records
+        ]
+        with self.lock:
+            self.pending_stores.append((path, mtime, json.dumps(subdirectories), file_rows))
+            self.flush_if_needed()
+
+    def flush_if_needed(self):
+        if len(self.pending_stores) + len(self.pending_touches) >= self.FLUSH_INTERVAL:
+            self.write_pending()
+
+    def write_pending(self):
+        stores, self.pending_stores = self.pending_stores, []
+        touches, self.pending_touches = self.pending_touches, []
+        with self.connection:
+            for path, mtime, subdirectories, file_rows in stores:
+                self.connection.execute("DELETE FROM directory_files WHERE directory = ?", (path,))
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO directories (path, mtime, subdirectories, generation) "
+                    "VALUES (?, ?, ?, ?)",
+                    (path, mtime, subdirectories, self.generation)
+                )
+                self.connection.executemany(
+                    "INSERT INTO directory_files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", file_rows
+                )
+            self.connection.executemany(
+                "UPDATE directories SET generation = ? WHERE path = ?", touches
+            )
+
+    def finish(self, root, complete):
+        """Schreibt ausstehende Änderungen; nach vollständigem Scan werden verschwundene Verzeichnisse entfernt"""
+        with self.lock:
+            self.write_pending()
+            if complete:
+                prefix = root.rstrip("\\/") + os.sep
+                with self.connection:
+                    stale = [
+                        (path,) for (path,) in self.connection.execute(
+                            "SELECT path FROM directories WHERE generation < ? "
+                            "AND (path = ? OR substr(path, 1, ?) = ?)",
+                            (self.generation, root, len(prefix), prefix)
+                        )
+                    ]
+                    self.connection.executemany("DELETE FROM directory_files WHERE directory = ?", stale)
+                    self.connection.executemany("DELETE FROM directories WHERE path = ?", stale)
+            self.generation += 1
+
+    def close(self):
+        if self.connection is not None:
+            with self.lock:
+                self.write_pending()
+                self.connection.close()
+                self.connection = None
+
+class ScanStore:
+    """SQLite-Speicher für Scan-Ergebnisse (ersetzt scan_cache.json)
+
+    Jeder Scan wird als Snapshot mit einer Zeile pro Datei abgelegt. Beim
+    erneuten Cachen derselben Filterkombination werden nur geänderte Zeilen
+    geschrieben, und beim Start wird nichts in den Speicher geladen. Im
+    Streaming-Modus schreibt der Scanner direkt in einen Snapshot, und die
+    Oberfläche liest nur seitenweise daraus (siehe StoredFileTableModel).
+    """
+
+    # Spalten in der Reihenfolge des Ergebnismodells
+    COLUMNS = ["path", "size", "mtime", "extension", "owner"]
+
+    MAX_AGE = 24 * 60 * 60  # Sekunden, die ein Snapshot als Cache gültig ist
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self.lock = Lock()
+        self.connection = None
+
+    def open(self):
+        if self.connection is not None:
+            return
+        self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                id INTEGER PRIMARY KEY,
+                cache_key TEXT NOT NULL,
+                drive_path TEXT NOT NULL,
+                created REAL NOT NULL,
+                complete INTEGER NOT NULL DEFAULT 1
+            );
+            CREATE INDEX IF NOT EXISTS idx_snapshots_cache_key ON snapshots(cache_key);
+            CREATE TABLE IF NOT EXISTS snapshot_files (
+                snapshot_id INTEGER NOT NULL,
+                path TEXT NOT NULL,
+                extension TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                owner TEXT NOT NULL,
+                digest TEXT
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_snapshot_files_snapshot_path ON snapshot_files(snapshot_id, path);
+            CREATE INDEX IF NOT EXISTS idx_snapshot_files_path ON snapshot_files(path);
+            CREATE INDEX IF NOT EXISTS idx_snapshot_files_sort_extension ON snapshot_files(snapshot_id, extension, path);
+            CREATE INDEX IF NOT EXISTS idx_snapshot_files_sort_size ON snapshot_files(snapshot_id, size, path);
+            CREATE INDEX IF NOT EXISTS idx_snapshot_files_sort_mtime ON snapshot_files(snapshot_id, mtime, path);
+            CREATE INDEX IF NOT EXISTS idx_snapshot_files_sort_owner ON snapshot_files(snapshot_id, owner, path);
+            CREATE INDEX IF NOT EXISTS idx_snapshot_files_size_digest ON snapshot_files(size, digest)
+                WHERE digest IS NOT NULL;
+        """)
+
+    def get_cache_key(self, drive_path, years, file_types, owner_filter, size_filter):
+        return f"{drive_path}_{years}_{str(file_types)}_{owner_filter}_{size_filter}"
+
+    def find_snapshot(self, cache_key):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT id, created FROM snapshots WHERE cache_key = ? AND complete = 1 "
+                "ORDER BY created DESC LIMIT 1",
+                (cache_key,)
+            ).fetchone()
+        return row
+
+    def load_rows(self, snapshot_id):
+        """Alle Zeilen eines Snapshots als (Pfad, Größe, mtime, Typ, Besitzer)"""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT path, size, mtime, extension, owner FROM snapshot_files WHERE snapshot_id = ?",
+                (snapshot_id,)
+            ).fetchall()
+
+    def find_valid_snapshot(self, drive_path, years, file_types, owner_filter, size_filter):
+        """ID des jüngsten vollständigen Snapshots, falls er noch als Cache gültig ist"""
+        snapshot = self.find_snapshot(self.get_cache_key(drive_path, years, file_types, owner_filter, size_filter))
+        if snapshot is None:
+            return None
+        snapshot_id, created = snapshot
+        # Prüfe, ob der Cache noch gültig ist (maximal 24 Stunden alt)
+        if time.time() - created >= self.MAX_AGE:
+            return None
+        return snapshot_id
+
+    def get_cached_results(self, drive_path, years, file_types, owner_filter, size_filter):
+        snapshot_id = self.find_valid_snapshot(drive_path, years, file_types, owner_filter, size_filter)
+        if snapshot_id is None:
+            return None
+        return self.load_rows(snapshot_id)
+
+    def cache_results(self, drive_path, years, file_types, owner_filter, size_filter, results):
+        """Speichert die Ergebnisse; ein vorhandener Snapshot wird nur um die Differenz aktualisiert"""
+        cache_key = self.get_cache_key(drive_path, years, file_types, owner_filter, size_filter)
+        snapshot = self.find_snapshot(cache_key)
+        new_rows = {row[0]: tuple(row[1:]) for row in results}
+        with self.lock, self.connection:
+            if snapshot is None:
+                snapshot_id = self.connection.execute(
+                    "INSERT INTO snapshots (cache_key, drive_path, created) VALUES (?, ?, ?)",
+                    (cache_key, drive_path, time.time())
+                ).lastrowid
+                old_rows = {}
+            else:
+                snapshot_id = snapshot[0]
+                self.connection.execute(
+                    "UPDATE snapshots SET created = ? WHERE id = ?", (time.time(), snapshot_id)
+                )
+                old_rows = {
+                    path: (size, mtime, file_type, owner)
+                    for path, size, mtime, file_type, owner in self.connection.execute(
+                        "SELECT path, size, mtime, extension, owner FROM snapshot_files WHERE snapshot_id = ?",
+                        (snapshot_id,)
+                    )
+                }
+
+            removed = [(snapshot_id, path) for path in old_rows.keys() - new_rows.keys()]
+            changed = [
+                (snapshot_id, path, size, mtime, file_type, owner)
+                for path, (size, mtime, file_type, owner) in new_rows.items()
+                if old_rows.get(path) != (size, mtime, file_type, owner)
+            ]
+            self.connection.executemany(
+                "DELETE FROM snapshot_files WHERE snapshot_id = ? AND path = ?", removed
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO snapshot_files (snapshot_id, path, size, mtime, extension, owner) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                changed
+            )
+        return snapshot_id
+
+    # --- Streaming-Snapshots ---------------------------------------------------
+
+    def create_snapshot(self, drive_path, years, file_types, owner_filter, size_filter):
+        """Legt einen unvollständigen Snapshot an, in den der Scanner schreibt"""
+        cache_key = self.get_cache_key(drive_path, years, file_types, owner_filter, size_filter)
+        with self.lock, self.connection:
+            return self.connection.execute(
+                "INSERT INTO snapshots (cache_key, drive_path, created, complete) VALUES (?, ?, ?, 0)",
+                (cache_key, drive_path, time.time())
+            ).lastrowid
+
+    def append_rows(self, snapshot_id, rows):
+        """Fügt einen Batch von Ergebniszeilen in einer Transaktion hinzu"""
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO snapshot_files (snapshot_id, path, size, mtime, extension, owner) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(snapshot_id,) + tuple(row) for row in rows]
+            )
+
+    def complete_snapshot(self, snapshot_id):
+        """Markiert einen Snapshot als vollständig und verwirft ältere mit gleichem Schlüssel"""
+        with self.lock, self.connection:
+            (cache_key,) = self.connection.execute(
+                "SELECT cache_key FROM snapshots WHERE id = ?", (snapshot_id,)
+            ).fetchone()
+            stale = [
+                row for row in self.connection.execute(
+                    "SELECT id FROM snapshots WHERE cache_key = ? AND id != ?", (cache_key, snapshot_id)
+                )
+            ]
+            self.connection.execute("UPDATE snapshots SET complete = 1 WHERE id = ?", (snapshot_id,))
+            self.carry_over_digests(snapshot_id, stale)
+            self.delete_snapshots(stale)
+
+    def discard_incomplete_snapshots(self, keep=None):
+        """Entfernt abgebrochene Streaming-Snapshots"""
+        with self.lock, self.connection:
+            stale = [
+                row for row in self.connection.execute(
+                    "SELECT id FROM snapshots WHERE complete = 0 AND id IS NOT ?", (keep,)
+                )
+            ]
+            self.delete_snapshots(stale)
+
+    def carry_over_digests(self, snapshot_id, old_snapshot_ids):
+        """Übernimmt bekannte Digests unveränderter Dateien aus älteren Snapshots"""
+        # Aufrufer hält Lock und Transaktion
+        self.connection.executemany(
+            "UPDATE snapshot_files SET digest = ("
+            "    SELECT o.digest FROM snapshot_files o WHERE o.snapshot_id = ? AND o.path = snapshot_files.path "
+            "    AND o.size = snapshot_files.size AND o.mtime = snapshot_files.mtime"
+            ") WHERE snapshot_id = ? AND digest IS NULL AND path IN ("
+            "    SELECT path FROM snapshot_files WHERE snapshot_id = ? AND digest IS NOT NULL"
+            ")",
+            [(old_id, snapshot_id, old_id) for (old_id,) in old_snapshot_ids]
+        )
+
+    def delete_snapshots(self, snapshot_ids):
+        # Aufrufer hält Lock und Transaktion
+        self.connection.executemany("DELETE FROM snapshot_files WHERE snapshot_id = ?", snapshot_ids)
+        self.connection.executemany("DELETE FROM snapshots WHERE id = ?", snapshot_ids)
+
+    # --- Seitenweiser Lesezugriff ----------------------------------------------
+
+    def count_rows(self, snapshot_id):
+        with self.lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM snapshot_files WHERE snapshot_id = ?", (snapshot_id,)
+            ).fetchone()[0]
+
+    def sort_key(self, row, sort_column):
+        """Schlüssel einer Zeile für fetch_page(after=...): (Sortierwert, Pfad) bzw. (Pfad,)"""
+        return (row[0],) if sort_column == 0 else (row[sort_column], row[0])
+
+    def fetch_page(self, snapshot_id, sort_column, descending, offset, limit, after=None):
+        """Liest ein Fenster von Zeilen in der gewünschten Sortierung über den passenden Index
+
+        Der Pfad dient als eindeutiges Zweitkriterium, damit gleiche Werte (Typ,
+        Besitzer, Größe) über Seitengrenzen hinweg nicht springen. Mit after
+        (siehe sort_key) wird ab dieser Zeile weitergelesen (Keyset-Paging);
+        offset zählt dann ab dort, statt vom Anfang alle Zeilen zu überspringen.
+        """
+        column = self.COLUMNS[sort_column]
+        direction = "DESC" if descending else "ASC"
+        key_columns = ["path"] if column == "path" else [column, "path"]
+        order = ", ".join(f"{key_column} {direction}" for key_column in key_columns)
+        where = "snapshot_id = ?"
+        parameters = [snapshot_id]
+        if after is not None:
+            comparison = "<" if descending else ">"
+            where += f" AND ({', '.join(key_columns)}) {comparison} ({', '.join('?' * len(key_columns))})"
+            parameters.extend(after)
+        with self.lock:
+            return self.connection.execute(
+                f"SELECT path, size, mtime, extension, owner FROM snapshot_files WHERE {where} "
+                f"ORDER BY {order} LIMIT ? OFFSET ?",
+                parameters + [limit, offset]
+            ).fetchall()
+
+    def iter_rows(self, snapshot_id, batch_size=10000):
+        """Liefert alle Zeilen eines Snapshots, ohne sie vollständig in den Speicher zu laden"""
+        last_path = ""
+        while True:
+            with self.lock:
+                batch = self.connection.execute(
+                    "SELECT path, size, mtime, extension, owner FROM snapshot_files "
+                    "WHERE snapshot_id = ? AND path > ? ORDER BY path LIMIT ?",
+                    (snapshot_id, last_path, batch_size)
+                ).fetchall()
+            if not batch:
+                return
+            yield from batch
+            last_path = batch[-1][0]
+
+    def size_by_type(self, snapshot_id):
+        with self.lock:
+            return dict(self.connection.execute(
+                "SELECT extension, SUM(size) FROM snapshot_files WHERE snapshot_id = ? GROUP BY extension",
+                (snapshot_id,)
+            ))
+
+    def duplicate_size_candidates(self, snapshot_id):
+        """Pfade gruppiert nach Größe, nur für Größen mit mehr als einer Datei"""
+        groups = {}
+        with self.lock:
+            for size, path in self.connection.execute(
+                "SELECT f.size, f.path FROM snapshot_files f JOIN ("
+                "    SELECT size FROM snapshot_files WHERE snapshot_id = ? GROUP BY size HAVING COUNT(*) > 1"
+                ") d ON f.size = d.size WHERE f.snapshot_id = ?",
+                (snapshot_id, snapshot_id)
+            ):
+                groups.setdefault(size, []).append(path)
+        return groups
+
+    # --- Vergleich über mehrere Snapshots ------------------------------------
+
+    def list_snapshots(self):
+        """Alle vollständigen Snapshots als (ID, Laufwerk, erstellt, Dateianzahl), neueste zuerst"""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT s.id, s.drive_path, s.created, COUNT(f.path) FROM snapshots s "
+                "LEFT JOIN snapshot_files f ON f.snapshot_id = s.id "
+                "WHERE s.complete = 1 GROUP BY s.id ORDER BY s.created DESC"
+            ).fetchall()
+
+    def cross_snapshot_candidates(self, snapshot_ids):
+        """(Snapshot, Pfad, Größe, mtime, Digest) aller Dateien, deren Größe in mehreren Snapshots vorkommt"""
+        placeholders = ",".join("?" * len(snapshot_ids))
+        with self.lock:
+            return self.connection.execute(
+                "SELECT f.snapshot_id, f.path, f.size, f.mtime, f.digest FROM snapshot_files f JOIN ("
+                f"    SELECT size FROM snapshot_files WHERE snapshot_id IN ({placeholders}) AND size > 0 "
+                "    GROUP BY size HAVING COUNT(DISTINCT snapshot_id) > 1 AND COUNT(DISTINCT path) > 1"
+                f") d ON f.size = d.size WHERE f.snapshot_id IN ({placeholders})",
+                list(snapshot_ids) * 2
+            ).fetchall()
+
+    def store_digests(self, digests):
+        """Speichert Digests als (Digest, Pfad, Größe, mtime) in allen Snapshots mit dieser Datei"""
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "UPDATE snapshot_files SET digest = ? WHERE path = ? AND size = ? AND mtime = ?",
+                digests
+            )
+
+    def cross_snapshot_duplicates(self, snapshot_ids):
+        """(Größe, Digest, Snapshot, Pfad) aller Dateien, deren Inhalt in mehreren Snapshots vorkommt"""
+        placeholders = ",".join("?" * len(snapshot_ids))
+        with self.lock:
+            return self.connection.execute(
+                "SELECT f.size, f.digest, f.snapshot_id, f.path FROM snapshot_files f JOIN ("
+                "    SELECT size, digest FROM snapshot_files "
+                f"    WHERE snapshot_id IN ({placeholders}) AND digest IS NOT NULL "
+                "    GROUP BY size, digest HAVING COUNT(DISTINCT snapshot_id) > 1"
+                f") d ON f.size = d.size AND f.digest = d.digest WHERE f.snapshot_id IN ({placeholders})",
+                list(snapshot_ids) * 2
+            ).fetchall()
+
+    def delete_paths(self, snapshot_id, paths):
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "DELETE FROM snapshot_files WHERE snapshot_id = ? AND path = ?",
+                [(snapshot_id, path) for path in paths]
+            )
+
+    def close(self):
+        if self.connection is not None:
+            with self.lock:
+                self.connection.close()
+                self.connection = None
+
+class HashCache:
+    """Persistenter Cache für Inhalts-Hashes der Duplikatsuche
+
+    Schlüssel ist die Identität der Datei samt Metadaten (Gerät, Inode, Größe,
+    mtime in Nanosekunden) und der Hash-Algorithmus. Ändert sich eine Datei, passt der Schlüssel nicht
+    mehr und sie wird neu gelesen. Gespeichert werden der Hash über Anfang und
+    Ende sowie der vollständige Hash. Überschreitet der Cache MAX_ENTRIES
+    Einträge, werden die am längsten nicht genutzten entfernt. Dateien ohne
+    Inode-Nummer (z.B. FAT, exFAT, manche Netzfreigaben) werden nicht
+    zwischengespeichert, da sie sich nicht eindeutig erkennen lassen.
+    """
+
+    FLUSH_INTERVAL = 1000  # Einträge pro Schreibtransaktion
+    MAX_ENTRIES = 1000000
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, max_entries=MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.lock = Lock()
+        self.connection = None
+        # Schlüssel -> [Anfang/Ende-Hash, vollständiger Hash, zuletzt genutzt]
+        self.pending = {}
+        self.hits = 0
+        self.misses = 0
+
+    def open(self):
+        if self.connection is not None:
+            return
+        # Die Hash-Worker teilen sich eine Verbindung, abgesichert über self.lock
+        connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        try:
+            self.create_schema(connection)
+        except sqlite3.Error:
+            # Gesperrt oder beschädigt: keine halb geöffnete Verbindung zurücklassen
+            connection.close()
+            raise
+        self.connection = connection
+        self.hits = 0
+        self.misses = 0
+
+    def create_schema(self, connection):
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                device INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                algorithm TEXT NOT NULL,
+                probe_hash TEXT,
+                full_hash TEXT,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (device, inode, size, mtime_ns, algorithm)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_file_hashes_last_used ON file_hashes(last_used);
+        """)
+
+    def get_key(self, filepath, algorithm):
+        """Cache-Schlüssel der Datei, None wenn sie keine Inode-Nummer hat"""
+        file_stat = os.stat(filepath)
+        if not file_stat.st_ino:
+            # Sonst teilten sich verschiedene Dateien gleicher Größe und mtime einen Eintrag
+            return None
+        return (file_stat.st_dev, file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns, algorithm)
+
+    def lookup(self, key):
+        """Liefert (Anfang/Ende-Hash, vollständiger Hash) oder None; fehlende Werte sind None"""
+        with self.lock:
+            entry = self.pending.get(key)
+            if entry is not None:
+                entry[2] = time.time()
+                self.hits += 1
+                return entry[0], entry[1]
+            row = self.connection.execute(
+                "SELECT probe_hash, full_hash FROM file_hashes "
+                "WHERE device = ? AND inode = ? AND size = ? AND mtime_ns = ? AND algorithm = ?",
+                key
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            # Nutzung vormerken, damit der Eintrag bei der Verdrängung als frisch gilt
+            self.pending[key] = [row[0], row[1], time.time()]
+            self.flush_if_needed()
+            return row
+
+    def store(self, key, probe_hash=None, full_hash=None):
+        with self.lock:
+            entry = self.pending.setdefault(key, [None, None, 0.0])
+            if probe_hash is not None:
+                entry[0] = probe_hash
+            if full_hash is not None:
+                entry[1] = full_hash
+            entry[2] = time.time()
+            self.flush_if_needed()
+
+    def flush_if_needed(self):
+        if len(self.pending) >= self.FLUSH_INTERVAL:
+            self.write_pending()
+
+    def write_pending(self):
+        pending, self.pending = self.pending, {}
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO file_hashes "
+                "(device, inode, size, mtime_ns, algorithm, probe_hash, full_hash, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (device, inode, size, mtime_ns, algorithm) DO UPDATE SET "
+                "probe_hash = COALESCE(excluded.probe_hash, probe_hash), "
+                "full_hash = COALESCE(excluded.full_hash, full_hash), "
+                "last_used = excluded.last_used",
+                [key + tuple(entry) for key, entry in pending.items()]
+            )
+
+    def finish(self):
+        """Schreibt ausstehende Einträge und verdrängt die ältesten über max_entries hinaus"""
+        with self.lock:
+            self.write_pending()
+            count = self.connection.execute("SELECT COUNT(*) FROM file_hashes").fetchone()[0]
+            if count > self.max_entries:
+                with self.connection:
+                    self.connection.execute(
+                        "DELETE FROM file_hashes WHERE last_used <= ("
+                        "SELECT last_used FROM file_hashes ORDER BY last_used LIMIT 1 OFFSET ?)",
+                        (count - self.max_entries - 1,)
+                    )
+
+    def stats(self):
+        """Gibt Treffer und Fehlgriffe seit dem Öffnen zurück"""
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        if self.connection is not None:
+            with self.lock:
+                self.write_pending()
+                self.connection.close()
+                self.connection = None
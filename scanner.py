@@ -1,16 +1,52 @@
 import os
-from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
-import win32security
-import win32api
-import win32con
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from threading import Lock, Thread, Condition
+from collections import deque, namedtuple
+try:
+    import win32security
+    import win32api
+    import win32con
+except ImportError:  # Nicht-Windows-Systeme (z.B. Linux-Fileserver)
+    win32security = None
+    win32api = None
+    win32con = None
 from PySide6.QtCore import QThread, Signal
-from queue import Queue
+from queue import Queue, Full, Empty
 import gc
+import time
+
+from owners import OwnerCache
+from utils import QUARANTINE_DIRECTORY
+
+# Kompakte Metadaten einer Datei, direkt aus dem DirEntry befüllt
+FileRecord = namedtuple("FileRecord", ["path", "size", "mtime", "atime", "inode", "device", "attributes", "uid", "gid"])
+
+def make_file_record(path, file_stat):
+    """Erstellt einen FileRecord aus einem os.stat_result"""
+    return FileRecord(
+        path,
+        file_stat.st_size,
+        file_stat.st_mtime,
+        file_stat.st_atime,
+        file_stat.st_ino,
+        file_stat.st_dev,
+        getattr(file_stat, "st_file_attributes", 0),
+        file_stat.st_uid,
+        file_stat.st_gid
+    )
+
+class FilterCandidate:
+    """Zwischenstand einer Datei in der Filterkette"""
+    __slots__ = ("record", "ext", "owner")
+
+    def __init__(self, record):
+        self.record = record
+        self.ext = os.path.splitext(record.path)[1].lower()
+        self.owner = None
 
 class FileScanner(QThread):
-    file_found = Signal(str, str, str, str, str)  # Pfad, Größe, Datum, Typ, Ersteller
+    files_found = Signal(list)  # Gebündelte Treffer: [(Pfad, Größe in Bytes, mtime, Typ, Ersteller), ...]
+    rows_stored = Signal(int)  # Streaming: Anzahl bisher im ScanStore abgelegter Treffer
     progress_update = Signal(int)  # Fortschritt in Prozent
     scan_complete = Signal(float, int)  # Gesamtgröße in GB, Anzahl Dateien
     status_update = Signal(str)  # Statusmeldungen
@@ -22,9 +58,14 @@ class FileScanner(QThread):
         "Mittlere Dateien": (10 * 1024 * 1024, 100 * 1024 * 1024),  # 10-100MB
         "Große Dateien": (100 * 1024 * 1024, float('inf'))  # >100MB
     }
+
+    # Treffer werden gesammelt und erst ab dieser Anzahl bzw. nach dieser Zeit
+    # an die GUI geschickt, damit die Event-Loop nicht geflutet wird
+    RESULT_BATCH_SIZE = 1000
+    RESULT_FLUSH_INTERVAL = 0.25  # Sekunden
     
 
-    def __init__(self, drive_path, years, file_types=None, owner_filter=None, size_filter=None, max_workers=None):
+    def __init__(self, drive_path, years, file_types=None, owner_filter=None, size_filter=None, max_workers=None, traversal_workers=None, owner_cache=None, directory_index=None, incremental=True, result_store=None, snapshot_id=None):
         super().__init__()
         self.drive_path = drive_path
         self.years = years
@@ -37,16 +78,38 @@ class FileScanner(QThread):
         self.file_count = 0
         # Optimiere Worker-Anzahl basierend auf CPU-Kernen
         self.max_workers = max_workers or min(32, os.cpu_count() * 2)
+        # Parallele scandir-Worker für die Verzeichnissuche
+        self.traversal_workers = traversal_workers or min(16, os.cpu_count() * 2)
         self.size_lock = Lock()
+        self.collect_lock = Lock()
+        self.collected_count = 0
+        self.estimated_total = 0
         self.processed_files = 0
         self.total_files = 0
         self.skip_paths = set()
+        self.filter_stages = self.compile_filters()
+        self.filter_stats = [[0, 0.0] for _ in self.filter_stages]
         self.file_queue = Queue(maxsize=10000)  # Begrenzte Queue-Größe
         self.collection_complete = False
-        self.MAX_FILES = 50000  # Maximale Anzahl der zu scannenden Dateien
+        self.owner_cache = owner_cache or OwnerCache()
+        # Optionaler DirectoryIndex für inkrementelle Scans
+        self.directory_index = directory_index
+        self.incremental = incremental
+        self.reused_directories = 0
+        self.pending_results = []
+        self.last_flush = time.monotonic()
+        # Streaming-Modus: Treffer werden in den ScanStore geschrieben statt an die GUI
+        # geschickt, damit der Speicherbedarf unabhängig von der Dateianzahl bleibt
+        self.result_store = result_store
+        self.snapshot_id = snapshot_id
+        self.stored_count = 0
 
     def check_admin_access(self, path):
         try:
+            if win32security is None:
+                # POSIX: Verzeichnis muss lesbar und betretbar sein
+                return os.access(path, os.R_OK | os.X_OK)
+
             sd = win32security.GetFileSecurity(
                 path, 
                 win32security.OWNER_SECURITY_INFORMATION
@@ -63,234 +126,415 @@ class FileScanner(QThread):
         except Exception:
             return False
 
-    def get_file_owner(self, filepath):
-        try:
-            sd = win32security.GetFileSecurity(
-                filepath, 
-                win32security.OWNER_SECURITY_INFORMATION
-            )
-            owner_sid = sd.GetSecurityDescriptorOwner()
-            name, domain, type = win32security.LookupAccountSid(None, owner_sid)
-            return f"{domain}\\{name}"
-        except Exception:
-            return "Unbekannt"
+    def get_file_owner(self, record):
+        """Ermittelt den Besitzer über den Cache (eine Auflösung pro Besitzer)"""
+        return self.owner_cache.get_owner(record)
 
-    def check_size_filter(self, file_size):
-        """Prüft, ob die Dateigröße dem ausgewählten Filter entspricht"""
-        if not self.size_filter:
-            return True
-            
-        min_size, max_size = self.SIZE_CATEGORIES[self.size_filter]
-        return min_size <= file_size < max_size
+    def compile_filters(self):
+        """Baut die Filterkette einmal pro Scan auf, günstigste Prüfungen zuerst
+
+        Die teure Besitzer-Auflösung läuft damit nur noch für Dateien, die
+        Dateityp, Größe und Alter bereits bestanden haben.
+        """
+        stages = []
+        if self.file_types:
+            file_types = frozenset(self.file_types)
+            stages.append(("Dateityp", lambda candidate: candidate.ext in file_types))
+        if self.size_filter:
+            min_size, max_size = self.SIZE_CATEGORIES[self.size_filter]
+            stages.append(("Größe", lambda candidate: min_size <= candidate.record.size < max_size))
+        cutoff_timestamp = time.time() - self.years * 365 * 24 * 60 * 60
+        stages.append(("Alter", lambda candidate: candidate.record.mtime < cutoff_timestamp))
+        if self.owner_filter:
+            search_terms = self.owner_filter.lower().split()
+
+            def owner_matches(candidate):
+                candidate.owner = self.get_file_owner(candidate.record)
+                owner_lower = candidate.owner.lower()
+                return all(term in owner_lower for term in search_terms)
+
+            stages.append(("Ersteller", owner_matches))
+        return stages
+
+    def passes_filters(self, candidate, stats=None):
+        """Prüft einen FilterCandidate gegen alle Filterstufen
 
-    def process_file(self, file_path):
+        stats ist optional eine Liste [abgelehnt, Sekunden] je Filterstufe.
+        """
+        for stage_index, (name, predicate) in enumerate(self.filter_stages):
+            if stats is None:
+                passed = predicate(candidate)
+            else:
+                started = time.perf_counter()
+                passed = predicate(candidate)
+                stage_stats = stats[stage_index]
+                stage_stats[1] += time.perf_counter() - started
+                if not passed:
+                    stage_stats[0] += 1
+            if not passed:
+                return False
+        return True
+
+    def process_file(self, record, stats=None, reused=False):
+        """Schickt einen FileRecord durch die Filterkette, ohne die Datei erneut per stat abzufragen
+
+        stats ist optional eine Liste [abgelehnt, Sekunden] je Filterstufe.
+        Stammt der Record aus dem DirectoryIndex (reused), können Größe und
+        mtime veraltet sein, denn Änderungen am Dateiinhalt ändern die mtime
+        des Verzeichnisses nicht. Solche Dateien werden daher, sofern sie alle
+        Filter bestehen, einmal per stat aktualisiert und erneut geprüft; der
+        Aufwand wächst so nur mit der Zahl der Treffer.
+        """
+        file_path = record.path
         try:
-            if not os.path.exists(file_path):
+            candidate = FilterCandidate(record)
+            if not self.passes_filters(candidate, stats):
                 return None
+            if reused:
+                fresh_record = make_file_record(file_path, os.stat(file_path))
+                if (fresh_record.size, fresh_record.mtime) != (record.size, record.mtime):
+                    record = fresh_record
+                    candidate = FilterCandidate(record)
+                    if not self.passes_filters(candidate, stats):
+                        return None
 
-            file_stat = os.stat(file_path)
-            file_size = file_stat.st_size
-            
-            # Prüfe Größenfilter
-            if not self.check_size_filter(file_size):
-                return None
-                
-            file_date = datetime.fromtimestamp(file_stat.st_mtime)
-            cutoff_date = datetime.now() - timedelta(days=self.years * 365)
-            file_ext = os.path.splitext(file_path)[1].lower()
-            
-            # Hole den Dateieigentümer
-            owner = self.get_file_owner(file_path)
-            
-            # Prüfe Owner-Filter mit Wildcard
-            if self.owner_filter:
-                owner_matches = False
-                search_terms = self.owner_filter.lower().split()
-                owner_lower = owner.lower()
-                owner_matches = all(term in owner_lower for term in search_terms)
-                if not owner_matches:
-                    return None
-
-            if file_date < cutoff_date and (not self.file_types or file_ext in self.file_types):
-                with self.size_lock:
-                    self.total_size += file_size
-                    self.file_count += 1
-                return (
-                    file_path,
-                    self.format_size(file_size),
-                    file_date.strftime("%Y-%m-%d %H:%M:%S"),
-                    file_ext,
-                    owner
-                )
+            # Hole den Dateieigentümer, falls der Besitzerfilter das nicht schon getan hat
+            if candidate.owner is None:
+                candidate.owner = self.get_file_owner(record)
+
+            with self.size_lock:
+                self.total_size += record.size
+                self.file_count += 1
+            return (
+                file_path,
+                record.size,
+                record.mtime,
+                candidate.ext,
+                candidate.owner
+            )
         except (PermissionError, OSError):
             pass
         except Exception as e:
             self.status_update.emit(f"Fehler bei {file_path}: {str(e)}")
         return None
 
-    def scan_directory(self, directory):
-        """Scanne ein Verzeichnis und alle seine Unterverzeichnisse rekursiv"""
-        try:
-            # Sammle zuerst alle Dateipfade
-            all_files = []
-            for root, _, files in os.walk(directory):
-                for file in files:
-                    all_files.append(os.path.join(root, file))
-            
-            # Verarbeite die Dateien in Chunks
-            total_files = len(all_files)
-            self.status_update.emit(f"Verarbeite {total_files:,} Dateien...")
-            
-            for i, filepath in enumerate(all_files):
-                if self.stop_scan:
-                    break
-                    
-                self.process_file(filepath)
-                
-                # Aktualisiere den Fortschritt
-                progress = int((i + 1) / total_files * 100)
-                self.progress_update.emit(progress)
-                
-        except Exception as e:
-            self.status_update.emit(f"Fehler beim Scannen von {directory}: {str(e)}")
+    def filter_summary(self):
+        """Liefert (Stufe, abgelehnte Dateien, Sekunden) für jede Filterstufe"""
+        with self.size_lock:
+            return [
+                (name, rejected, seconds)
+                for (name, _), (rejected, seconds) in zip(self.filter_stages, self.filter_stats)
+            ]
 
     def collect_files(self):
-        """Sammelt Dateien in einem separaten Thread"""
-        estimated_total = 0
-        collected_count = 0
-        
-        def scan_directory(path):
-            nonlocal estimated_total, collected_count
+        """Sammelt Dateien parallel mit mehreren scandir-Workern (Work-Stealing)"""
+        worker_count = self.traversal_workers
+        # Jeder Worker hat eine eigene Verzeichnis-Deque. Eigene Arbeit wird vom
+        # Ende genommen (Tiefensuche, gute Lokalität), fremde Arbeit vom Anfang
+        # gestohlen, damit sich Worker selten in die Quere kommen.
+        directory_queues = [deque() for _ in range(worker_count)]
+        directory_queues[0].append(self.drive_path)
+        pending = 1  # Eingereihte oder gerade bearbeitete Verzeichnisse
+        work_available = Condition()
+
+        def next_directory(index):
             try:
-                if self.stop_scan or not self.check_admin_access(path):
-                    if not self.check_admin_access(path):
-                        self.skip_paths.add(path)
-                        self.status_update.emit(f"Überspringe geschützten Ordner: {path}")
-                    return
+                return directory_queues[index].pop()
+            except IndexError:
+                pass
+            for offset in range(1, worker_count):
+                try:
+                    return directory_queues[(index + offset) % worker_count].popleft()
+                except IndexError:
+                    continue
+            return None
 
+        def worker(index):
+            nonlocal pending
+            while not self.stop_scan:
                 while self.pause_scan and not self.stop_scan:
                     # Warte während der Pause
                     self.msleep(100)
 
-                with os.scandir(path) as entries:
-                    entry_list = list(entries)
-                    estimated_total += len(entry_list)
-                    
-                    for entry in entry_list:
-                        if self.stop_scan:
-                            return
-                            
-                        while self.pause_scan and not self.stop_scan:
-                            # Warte während der Pause
-                            self.msleep(100)
-                            
-                        if collected_count >= self.MAX_FILES:
-                            self.status_update.emit(f"Maximale Anzahl von {self.MAX_FILES:,} Dateien erreicht")
-                            self.stop_scan = True
+                path = next_directory(index)
+                if path is None:
+                    with work_available:
+                        if pending == 0:
                             return
-                            
-                        try:
-                            if entry.is_file():
-                                self.file_queue.put(entry.path)
-                                collected_count += 1
-                                if collected_count % 100 == 0:
-                                    self.collection_progress.emit(collected_count, min(estimated_total, self.MAX_FILES))
-                            elif entry.is_dir() and entry.path not in self.skip_paths:
-                                scan_directory(entry.path)
-                        except PermissionError:
-                            self.skip_paths.add(entry.path)
-                            self.status_update.emit(f"Keine Berechtigung für: {entry.path}")
-                        except Exception as e:
-                            self.status_update.emit(f"Fehler beim Scannen von {entry.path}: {str(e)}")
-                            
-            except PermissionError:
-                self.skip_paths.add(path)
-                self.status_update.emit(f"Keine Berechtigung für: {path}")
-            except Exception as e:
-                self.status_update.emit(f"Fehler beim Scannen von {path}: {str(e)}")
+                        work_available.wait(0.05)
+                    continue
+
+                try:
+                    subdirectories = self.scan_single_directory(path)
+                    if subdirectories:
+                        with work_available:
+                            pending += len(subdirectories)
+                        directory_queues[index].extend(subdirectories)
+                        with work_available:
+                            work_available.notify_all()
+                finally:
+                    with work_available:
+                        pending -= 1
+                        if pending == 0:
+                            work_available.notify_all()
 
+        workers = [
+            Thread(target=worker, args=(i,), name=f"scandir-{i}", daemon=True)
+            for i in range(worker_count)
+        ]
         try:
-            scan_directory(self.drive_path)
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
         finally:
             self.collection_complete = True
 
+    def scan_single_directory(self, path):
+        """Listet ein einzelnes Verzeichnis und gibt die gefundenen Unterverzeichnisse zurück"""
+        subdirectories = []
+        try:
+            if self.stop_scan:
+                return subdirectories
+            if not self.check_admin_access(path):
+                self.skip_paths.add(path)
+                self.status_update.emit(f"Überspringe geschützten Ordner: {path}")
+                return subdirectories
+
+            directory_mtime = None
+            if self.directory_index is not None:
+                directory_mtime = os.stat(path).st_mtime
+                if self.incremental:
+                    cached = self.directory_index.lookup(path, directory_mtime)
+                    if cached is not None:
+                        return self.reuse_directory(*cached)
+
+            with os.scandir(path) as entries:
+                entry_list = list(entries)
+
+            with self.collect_lock:
+                self.estimated_total += len(entry_list)
+
+            records = []
+            listing_complete = True
+            for entry in entry_list:
+                if self.stop_scan:
+                    listing_complete = False
+                    break
+
+                while self.pause_scan and not self.stop_scan:
+                    # Warte während der Pause
+                    self.msleep(100)
+
+                try:
+                    if entry.is_file():
+                        # DirEntry.stat() ist unter Windows bereits im Listing
+                        # enthalten und wird sonst nur einmal abgefragt
+                        record = make_file_record(entry.path, entry.stat())
+                        records.append(record)
+                        if not self.collect_record(record):
+                            listing_complete = False
+                            break
+                    elif entry.is_dir() and entry.path not in self.skip_paths and entry.name != QUARANTINE_DIRECTORY:
+                        subdirectories.append(entry.path)
+                except PermissionError:
+                    self.skip_paths.add(entry.path)
+                    self.status_update.emit(f"Keine Berechtigung für: {entry.path}")
+                except Exception as e:
+                    self.status_update.emit(f"Fehler beim Scannen von {entry.path}: {str(e)}")
+
+            if self.directory_index is not None and listing_complete:
+                self.directory_index.store(path, directory_mtime, records, subdirectories)
+
+        except PermissionError:
+            self.skip_paths.add(path)
+            self.status_update.emit(f"Keine Berechtigung für: {path}")
+        except Exception as e:
+            self.status_update.emit(f"Fehler beim Scannen von {path}: {str(e)}")
+        return subdirectories
+
+    def reuse_directory(self, records, subdirectories):
+        """Übernimmt ein unverändertes Verzeichnis aus dem Index, ohne es zu listen"""
+        with self.collect_lock:
+            self.estimated_total += len(records) + len(subdirectories)
+            self.reused_directories += 1
+        for record in records:
+            if self.stop_scan:
+                break
+            while self.pause_scan and not self.stop_scan:
+                # Warte während der Pause
+                self.msleep(100)
+            if not self.collect_record(record, reused=True):
+                break
+        return [path for path in subdirectories if path not in self.skip_paths]
+
+    def collect_record(self, record, reused=False):
+        """Zählt eine gefundene Datei und reiht sie zur Verarbeitung ein
+
+        reused kennzeichnet Records aus dem DirectoryIndex (siehe process_file).
+        """
+        with self.collect_lock:
+            self.collected_count += 1
+            collected_count = self.collected_count
+            estimated_total = self.estimated_total
+        if not self.enqueue_file((record, reused)):
+            return False
+        if collected_count % 100 == 0:
+            self.collection_progress.emit(collected_count, estimated_total)
+        return True
+
+    def enqueue_file(self, item):
+        """Legt eine Datei in die Queue, ohne bei einem Abbruch ewig zu blockieren"""
+        while not self.stop_scan:
+            try:
+                self.file_queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
     def process_file_chunk(self, files):
         """Verarbeitet einen Chunk von Dateien"""
         results = []
-        for file_path in files:
+        stats = [[0, 0.0] for _ in self.filter_stages]
+        for record, reused in files:
             if self.stop_scan:
                 break
-            result = self.process_file(file_path)
+            result = self.process_file(record, stats, reused)
             if result:
                 results.append(result)
-        return results
+        
+        # Statistik des Chunks einmalig zusammenführen statt pro Datei zu sperren
+        with self.size_lock:
+            for total, chunk_stats in zip(self.filter_stats, stats):
+                total[0] += chunk_stats[0]
+                total[1] += chunk_stats[1]
+        return results, len(files)
+
+    def take_chunk(self, chunk_size):
+        """Holt bis zu chunk_size Dateien aus der Queue, ohne auf einen vollen Chunk zu warten"""
+        chunk = []
+        try:
+            chunk.append(self.file_queue.get(timeout=0.1))
+            while len(chunk) < chunk_size:
+                chunk.append(self.file_queue.get_nowait())
+        except Empty:
+            pass
+        return chunk
+
+    def handle_finished_chunks(self, futures, processed_count):
+        """Meldet die Ergebnisse fertiger Chunks und aktualisiert den Fortschritt"""
+        for future in futures:
+            try:
+                results, chunk_length = future.result()
+            except Exception as e:
+                self.status_update.emit(f"Fehler bei der Chunk-Verarbeitung: {str(e)}")
+                continue
+                
+            self.pending_results.extend(results)
+                
+            previous_count = processed_count
+            processed_count += chunk_length
+            
+            # Führe Garbage Collection durch
+            if processed_count // 10000 != previous_count // 10000:
+                gc.collect()
+        
+        self.flush_results()
+        with self.collect_lock:
+            total_files = max(self.collected_count, processed_count)
+        if total_files > 0:
+            self.progress_update.emit(int((processed_count / total_files) * 100))
+        return processed_count
+
+    def flush_results(self, force=False):
+        """Sendet gesammelte Treffer, sobald Anzahl- oder Zeitschwelle erreicht ist"""
+        if not self.pending_results:
+            return
+        now = time.monotonic()
+        if force or len(self.pending_results) >= self.RESULT_BATCH_SIZE or \
+           now - self.last_flush >= self.RESULT_FLUSH_INTERVAL:
+            batch = self.pending_results
+            self.pending_results = []
+            self.last_flush = now
+            if self.result_store is not None:
+                self.result_store.append_rows(self.snapshot_id, batch)
+                self.stored_count += len(batch)
+                self.rows_stored.emit(self.stored_count)
+            else:
+                self.files_found.emit(batch)
 
     def run(self):
         try:
             self.status_update.emit("Sammle Dateien...")
             
             # Starte Dateisammlung in separatem Thread
-            from threading import Thread
             collection_thread = Thread(target=self.collect_files)
             collection_thread.start()
             
-            # Verarbeite Dateien in Chunks
+            # Verarbeite Dateien in Chunks. Es sind immer bis zu
+            # max_in_flight Chunks gleichzeitig in Arbeit; ist das Fenster voll,
+            # wird die Queue nicht weiter geleert und der Sammler blockiert.
             chunk_size = 100
-            current_chunk = []
+            max_in_flight = self.max_workers * 2
+            in_flight = set()
             processed_count = 0
             
             with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                while not (self.collection_complete and self.file_queue.empty()) and not self.stop_scan:
+                while not self.stop_scan:
                     while self.pause_scan and not self.stop_scan:
                         # Warte während der Pause
                         self.msleep(100)
                         
                     try:
-                        # Sammle Dateien für den aktuellen Chunk
-                        while len(current_chunk) < chunk_size and not self.pause_scan:
-                            try:
-                                file_path = self.file_queue.get(timeout=0.1)
-                                current_chunk.append(file_path)
-                            except Queue.Empty:
-                                if self.collection_complete:
-                                    break
-                        
-                        if not current_chunk:
+                        if len(in_flight) >= max_in_flight:
+                            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                            processed_count = self.handle_finished_chunks(done, processed_count)
                             continue
                         
-                        # Verarbeite den Chunk
-                        future = executor.submit(self.process_file_chunk, current_chunk)
-                        results = future.result()
-                        
-                        # Verarbeite die Ergebnisse
-                        for result in results:
-                            if result:
-                                self.file_found.emit(*result)
+                        current_chunk = self.take_chunk(chunk_size)
+                        if current_chunk:
+                            in_flight.add(executor.submit(self.process_file_chunk, current_chunk))
+                        elif self.collection_complete and self.file_queue.empty():
+                            break
                         
-                        processed_count += len(current_chunk)
-                        if self.total_files > 0:
-                            progress = int((processed_count / self.total_files) * 100)
-                            self.progress_update.emit(progress)
-                        
-                        current_chunk = []
-                        
-                        # Führe Garbage Collection durch
-                        if processed_count % 1000 == 0:
-                            gc.collect()
+                        # Sammle bereits fertige Chunks ein, ohne zu blockieren
+                        done = {future for future in in_flight if future.done()}
+                        if done:
+                            in_flight -= done
+                            processed_count = self.handle_finished_chunks(done, processed_count)
+                        else:
+                            self.flush_results()
                             
                     except Exception as e:
                         self.status_update.emit(f"Fehler bei der Chunk-Verarbeitung: {str(e)}")
+                
+                # Restliche Chunks abschließen
+                for future in as_completed(in_flight):
+                    processed_count = self.handle_finished_chunks([future], processed_count)
+                self.flush_results(force=True)
             
             collection_thread.join()
             
+            if self.directory_index is not None:
+                self.directory_index.finish(self.drive_path, complete=not self.stop_scan)
+            if self.result_store is not None and not self.stop_scan:
+                self.result_store.complete_snapshot(self.snapshot_id)
+            
             if not self.stop_scan:
-                self.status_update.emit("Scan abgeschlossen")
+                owner_stats = self.owner_cache.stats()
+                self.status_update.emit(
+                    f"Scan abgeschlossen (Besitzer: {owner_stats['misses']:,} Auflösungen, "
+                    f"{owner_stats['hits']:,} Cache-Treffer, "
+                    f"{self.reused_directories:,} unveränderte Verzeichnisse übernommen)"
+                )
                 # Konvertiere die Werte in kleinere Einheiten
                 total_size_gb = self.total_size / (1024 * 1024 * 1024)  # Konvertiere zu GB
                 self.scan_complete.emit(total_size_gb, self.file_count)
             
         except Exception as e:
             self.status_update.emit(f"Kritischer Fehler: {str(e)}")
+            self.flush_results(force=True)
             total_size_gb = self.total_size / (1024 * 1024 * 1024)  # Konvertiere zu GB
             self.scan_complete.emit(total_size_gb, self.file_count)
         finally:
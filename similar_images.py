@@ -0,0 +1,207 @@
+import os
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from PIL import Image
+from PySide6.QtCore import Signal
+
+from workers import BackgroundWorker, run_parallel_jobs
+
+# Kantenlänge des Bildhashes; 8 ergibt 64 Bit
+HASH_SIZE = 8
+# Maximaler Hamming-Abstand, bis zu dem zwei Bilder als ähnlich gelten
+SIMILARITY_DISTANCE = 8
+# Bilder pro Auftrag an den Prozesspool
+IMAGE_BATCH_SIZE = 64
+
+def bits_to_int(bits):
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+def load_grayscale(filepath, width, height):
+    with Image.open(filepath) as image:
+        # JPEGs direkt verkleinert dekodieren, das spart den Großteil der Rechenzeit
+        image.draft("L", (width * 4, height * 4))
+        image = image.convert("L").resize((width, height), Image.BILINEAR)
+        return np.asarray(image, dtype=np.float32)
+
+def compute_dhash(filepath, hash_size=HASH_SIZE):
+    """Differenz-Hash: vergleicht benachbarte Pixel eines verkleinerten Graustufenbilds"""
+    pixels = load_grayscale(filepath, hash_size + 1, hash_size)
+    return bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+dct_matrices = {}
+
+def dct_matrix(size):
+    """Orthonormale DCT-II-Matrix, damit die 2D-DCT zwei Matrixprodukte sind"""
+    matrix = dct_matrices.get(size)
+    if matrix is None:
+        k = np.arange(size)[:, None]
+        n = np.arange(size)[None, :]
+        matrix = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2 / size)
+        matrix[0] /= np.sqrt(2)
+        dct_matrices[size] = matrix = matrix.astype(np.float32)
+    return matrix
+
+def compute_phash(filepath, hash_size=HASH_SIZE):
+    """Perzeptueller Hash: niedrige DCT-Frequenzen verglichen mit ihrem Median"""
+    size = hash_size * 4
+    pixels = load_grayscale(filepath, size, size)
+    matrix = dct_matrix(size)
+    coefficients = (matrix @ pixels @ matrix.T)[:hash_size, :hash_size].ravel()
+    # Der Gleichanteil sagt nur etwas über die Helligkeit aus und bleibt beim Median außen vor
+    return bits_to_int(coefficients > np.median(coefficients[1:]))
+
+HASH_FUNCTIONS = {
+    "dhash": compute_dhash,
+    "phash": compute_phash,
+}
+
+def hash_image_batch(filepaths, algorithm="dhash"):
+    """Berechnet Bildhashes für mehrere Dateien (läuft im Prozesspool)
+
+    Liefert (Pfad, Hash) für jedes lesbare Bild; defekte Dateien werden übersprungen.
+    """
+    hash_function = HASH_FUNCTIONS[algorithm]
+    results = []
+    for filepath in filepaths:
+        try:
+            results.append((filepath, hash_function(filepath)))
+        except Exception:
+            pass
+    return results
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count("1")
+
+class BKTree:
+    """BK-Baum über Hamming-Abstände für Umkreissuchen ohne paarweisen Vergleich
+
+    Jeder Knoten ist [Hash, Einträge, {Abstand: Kindknoten}]. Bei einer Suche
+    mit Radius r müssen nach der Dreiecksungleichung nur Kinder mit Abstand
+    d - r bis d + r besucht werden.
+    """
+
+    def __init__(self):
+        self.root = None
+        self.size = 0
+
+    def add(self, value, item):
+        self.size += 1
+        if self.root is None:
+            self.root = [value, [item], {}]
+            return
+        node = self.root
+        while True:
+            distance = hamming_distance(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [item], {}]
+                return
+            node = child
+
+    def query(self, value, radius):
+        """Alle (Eintrag, Abstand) mit Hamming-Abstand höchstens radius"""
+        results = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(value, node[0])
+            if distance <= radius:
+                results.extend((item, distance) for item in node[1])
+            for child_distance, child in node[2].items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+        return results
+
+def group_similar_images(image_hashes, max_distance=SIMILARITY_DISTANCE):
+    """Fasst Bilder, deren Hashes höchstens max_distance auseinanderliegen, zu Gruppen zusammen
+
+    image_hashes ist eine Liste von (Pfad, Hash). Ähnlichkeit wird transitiv
+    über eine Union-Find-Struktur verbunden. Rückgabe ist
+    {Gruppenschlüssel: [(Pfad, Abstand zum ersten Bild)]} für Gruppen ab zwei Bildern.
+    """
+    tree = BKTree()
+    for index, (filepath, value) in enumerate(image_hashes):
+        tree.add(value, index)
+
+    parents = list(range(len(image_hashes)))
+
+    def find(index):
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    for index, (filepath, value) in enumerate(image_hashes):
+        for other, distance in tree.query(value, max_distance):
+            root, other_root = find(index), find(other)
+            if root != other_root:
+                parents[max(root, other_root)] = min(root, other_root)
+
+    members = {}
+    for index in range(len(image_hashes)):
+        members.setdefault(find(index), []).append(index)
+
+    groups = {}
+    for root, indexes in members.items():
+        if len(indexes) < 2:
+            continue
+        first_hash = image_hashes[root][1]
+        groups[f"{first_hash:016x}-{root}"] = [
+            (image_hashes[index][0], hamming_distance(first_hash, image_hashes[index][1]))
+            for index in indexes
+        ]
+    return groups
+
+class SimilarImageFinder(BackgroundWorker):
+    """Sucht im Hintergrund nach ähnlichen Bildern (z.B. neu komprimierte oder skalierte Kopien)"""
+    progress_update = Signal(str, int, int)  # Stufe, erledigt, gesamt
+    search_complete = Signal(dict, dict)  # Gruppen, Statistik
+    search_cancelled = Signal()
+
+    def __init__(self, filepaths, algorithm="dhash", max_distance=SIMILARITY_DISTANCE, max_workers=None):
+        super().__init__()
+        self.filepaths = filepaths
+        self.algorithm = algorithm
+        self.max_distance = max_distance
+        # Dekodieren und Hashen ist rechenintensiv, daher ein Prozess pro Kern
+        self.max_workers = max_workers or os.cpu_count()
+
+    def run(self):
+        image_hashes = []
+        progress = {"done": 0}
+        total = len(self.filepaths)
+
+        def on_batch(batch, results):
+            image_hashes.extend(results)
+            progress["done"] += len(batch)
+            self.report_progress("Berechne Bildhashes...", progress["done"], total)
+
+        batches = [
+            self.filepaths[start:start + IMAGE_BATCH_SIZE]
+            for start in range(0, total, IMAGE_BATCH_SIZE)
+        ]
+        if not run_parallel_jobs(
+            batches,
+            # partial statt lambda, da die Funktion an die Prozesse übergeben (gepickelt) wird
+            partial(hash_image_batch, algorithm=self.algorithm),
+            self.max_workers,
+            on_batch,
+            self.is_cancelled,
+            executor_class=ProcessPoolExecutor
+        ):
+            self.search_cancelled.emit()
+            return
+
+        self.progress_update.emit("Gruppiere ähnliche Bilder...", 0, 0)
+        groups = group_similar_images(image_hashes, self.max_distance)
+        stats = {
+            "images": total,
+            "hashed": len(image_hashes),
+            "groups": len(groups),
+            "similar": sum(len(group) for group in groups.values())
+        }
+        self.search_complete.emit(groups, stats)
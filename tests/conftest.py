@@ -0,0 +1,24 @@
+import os
+import sys
+import ctypes
+
+import pytest
+
+# Die Module liegen flach im Projektverzeichnis
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# PySide6 6.12 gibt unter Python < 3.12 bei jedem Signal.emit() eine Referenz
+# auf True zu viel frei; nach einigen hundert Signalen stürzt der Interpreter
+# ab. Die zusätzlichen Referenzen werden nie freigegeben, auch nicht beim
+# Beenden (ab Python 3.12 ist True ohnehin unsterblich).
+if sys.version_info < (3, 12):
+    ctypes.c_ssize_t.from_address(id(True)).value += 1000000
+
+@pytest.fixture
+def write_file():
+    """Legt eine Datei samt fehlender Verzeichnisse an und gibt ihren Pfad zurück"""
+    def write(path, content=b"abc"):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        return str(path)
+    return write
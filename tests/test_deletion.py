@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+pytest.importorskip("PySide6.QtCore")
+
+from deletion import FileDeleter
+
+def write_files(directory, count):
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for number in range(count):
+        path = directory / f"{number}.txt"
+        path.write_bytes(b"abc")
+        paths.append(str(path))
+    return paths
+
+def run_deleter(deleter):
+    """Führt den Worker synchron aus und sammelt seine Signale"""
+    deleted = []
+    summaries = []
+    deleter.files_deleted.connect(deleted.extend)
+    deleter.deletion_complete.connect(summaries.append)
+    deleter.run()
+    assert len(summaries) == 1
+    return deleted, summaries[0]
+
+def test_deletes_all_files(tmp_path):
+    paths = write_files(tmp_path / "a", 100) + write_files(tmp_path / "b", 3)
+    deleted, summary = run_deleter(FileDeleter(paths))
+    assert sorted(deleted) == sorted(paths)
+    assert summary == {"deleted": 103, "failed": [], "cancelled": False}
+    assert os.listdir(tmp_path / "a") == []
+    assert os.listdir(tmp_path / "b") == []
+
+def test_failures_are_collected(tmp_path):
+    paths = write_files(tmp_path, 2)
+    missing = str(tmp_path / "fehlt.txt")
+    deleted, summary = run_deleter(FileDeleter(paths + [missing]))
+    assert sorted(deleted) == sorted(paths)
+    assert summary["deleted"] == 2
+    assert [path for path, error in summary["failed"]] == [missing]
+
+def test_directories_are_not_deleted(tmp_path):
+    directory = tmp_path / "ordner"
+    directory.mkdir()
+    deleted, summary = run_deleter(FileDeleter([str(directory)]))
+    assert deleted == []
+    assert len(summary["failed"]) == 1
+    assert directory.is_dir()
+
+def test_cancelled_deletion_stops_early(tmp_path):
+    paths = write_files(tmp_path, FileDeleter.CHUNK_SIZE * 100)
+    deleter = FileDeleter(paths)
+    deleter.cancel()
+    deleted, summary = run_deleter(deleter)
+    assert summary["cancelled"]
+    assert summary["deleted"] == len(deleted) < len(paths)
+    assert len(os.listdir(tmp_path)) == len(paths) - len(deleted)
+
+def test_chunk_operation_replaces_operation(tmp_path):
+    paths = write_files(tmp_path, 5)
+    chunks = []
+
+    def chunk_operation(chunk):
+        chunks.append(chunk)
+        return chunk[1:], [(chunk[0], "Fehler")]
+
+    deleted, summary = run_deleter(FileDeleter(paths, chunk_operation=chunk_operation))
+    assert chunks == [paths]
+    assert deleted == paths[1:]
+    assert summary["failed"] == [(paths[0], "Fehler")]
+    assert len(os.listdir(tmp_path)) == 5
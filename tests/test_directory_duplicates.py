@@ -0,0 +1,57 @@
+import pytest
+
+pytest.importorskip("PySide6.QtCore")
+
+from directory_duplicates import find_duplicate_directories
+
+def make_tree(root, tree):
+    """Legt {Name: Inhalt oder Unterbaum} an und gibt die (Pfad, Größe)-Paare zurück"""
+    files = []
+    root.mkdir(parents=True, exist_ok=True)
+    for name, content in tree.items():
+        path = root / name
+        if isinstance(content, dict):
+            files.extend(make_tree(path, content))
+        else:
+            path.write_bytes(content)
+            files.append((str(path), len(content)))
+    return files
+
+def group_paths(groups):
+    return sorted(group["paths"] for group in groups.values())
+
+def test_only_topmost_identical_directories_are_reported(tmp_path):
+    tree = {"a.txt": b"abc", "unter": {"b.txt": b"defg"}}
+    files = make_tree(tmp_path / "eins", tree) + make_tree(tmp_path / "zwei", tree)
+    groups, stats = find_duplicate_directories(files)
+    assert group_paths(groups) == [[str(tmp_path / "eins"), str(tmp_path / "zwei")]]
+    (group,) = groups.values()
+    assert group["size"] == 7
+    assert group["files"] == 2
+
+def test_different_content_is_not_a_duplicate(tmp_path):
+    files = make_tree(tmp_path / "eins", {"a.txt": b"abc"}) + make_tree(tmp_path / "zwei", {"a.txt": b"abd"})
+    groups, _ = find_duplicate_directories(files)
+    assert groups == {}
+
+def test_unscanned_entries_make_a_directory_unique(tmp_path):
+    tree = {"a.txt": b"abc"}
+    files = make_tree(tmp_path / "eins", tree) + make_tree(tmp_path / "zwei", tree)
+    # Nicht im (gefilterten) Scan enthalten
+    (tmp_path / "zwei" / "b.jpg").write_bytes(b"x")
+    groups, stats = find_duplicate_directories(files)
+    assert groups == {}
+    assert stats["incomplete_directories"] == 1
+
+def test_subdirectories_of_different_parents_are_reported(tmp_path):
+    shared = {"b.txt": b"defg"}
+    files = (
+        make_tree(tmp_path / "eins", {"a.txt": b"abc", "unter": shared})
+        + make_tree(tmp_path / "zwei", {"a.txt": b"abc", "unter": shared})
+        + make_tree(tmp_path / "drei", {"a.txt": b"xyz", "unter": shared})
+    )
+    groups, _ = find_duplicate_directories(files)
+    assert group_paths(groups) == [
+        [str(tmp_path / "drei" / "unter"), str(tmp_path / "eins" / "unter"), str(tmp_path / "zwei" / "unter")],
+        [str(tmp_path / "eins"), str(tmp_path / "zwei")],
+    ]
@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+pytest.importorskip("PySide6.QtCore")
+
+from duplicates import find_duplicate_groups, reclaimable_bytes
+from utils import PROBE_SIZE
+
+def size_groups(*paths):
+    groups = {}
+    for path in paths:
+        with open(path, "rb") as f:
+            groups.setdefault(len(f.read()), []).append(path)
+    return groups
+
+def test_small_duplicates_are_found(tmp_path, write_file):
+    a = write_file(tmp_path / "a", b"abc")
+    b = write_file(tmp_path / "b", b"abc")
+    c = write_file(tmp_path / "c", b"abd")
+    duplicates, stats = find_duplicate_groups(size_groups(a, b, c), max_workers=2)
+    assert [sorted(group) for group in duplicates.values()] == [[a, b]]
+    assert stats["candidates"] == 3
+
+def test_large_files_differing_in_the_middle_are_not_duplicates(tmp_path, write_file):
+    head = b"k" * PROBE_SIZE
+    a = write_file(tmp_path / "a", head + b"1" + head)
+    b = write_file(tmp_path / "b", head + b"2" + head)
+    c = write_file(tmp_path / "c", head + b"1" + head)
+    duplicates, stats = find_duplicate_groups(size_groups(a, b, c), max_workers=2)
+    assert [sorted(group) for group in duplicates.values()] == [[a, c]]
+    assert stats["probed"] == 3
+    assert stats["fully_hashed"] == 3
+
+def test_unique_sizes_are_never_read(tmp_path, write_file):
+    a = write_file(tmp_path / "a", b"abc")
+    b = write_file(tmp_path / "b", b"abcd")
+    duplicates, stats = find_duplicate_groups(size_groups(a, b))
+    assert duplicates == {}
+    assert stats["bytes_read"] == 0
+
+def test_cancelled_search_returns_none(tmp_path, write_file):
+    a = write_file(tmp_path / "a", b"abc")
+    b = write_file(tmp_path / "b", b"abc")
+    duplicates, stats = find_duplicate_groups(size_groups(a, b), is_cancelled=lambda: True)
+    assert duplicates is None
+
+def test_hardlinks_are_reported_once(tmp_path, write_file):
+    a = write_file(tmp_path / "a", b"abc")
+    link = str(tmp_path / "link")
+    os.link(a, link)
+    duplicates, stats = find_duplicate_groups(size_groups(a, link))
+    assert duplicates == {}
+    assert stats["hardlinks"] == 1
+
+def test_file_with_most_links_comes_first(tmp_path, write_file):
+    a = write_file(tmp_path / "a", b"abc")
+    b = write_file(tmp_path / "b", b"abc")
+    os.link(b, str(tmp_path / "link"))
+    duplicates, _ = find_duplicate_groups(size_groups(a, b))
+    assert list(duplicates.values()) == [[b, a]]
+
+def test_reclaimable_bytes_skip_files_linked_elsewhere(tmp_path, write_file):
+    a = write_file(tmp_path / "a", b"abc")
+    b = write_file(tmp_path / "b", b"abc")
+    c = write_file(tmp_path / "c", b"abc")
+    os.link(c, str(tmp_path / "link"))
+    assert reclaimable_bytes([a, b, c]) == 3
@@ -0,0 +1,75 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("PySide6.QtCore")
+
+import scan_store
+from duplicates import find_duplicate_groups
+from scan_store import HashCache
+
+@pytest.fixture
+def hash_cache(tmp_path):
+    hash_cache = HashCache(str(tmp_path / "hashes.db"))
+    hash_cache.open()
+    yield hash_cache
+    hash_cache.close()
+
+def test_changed_mtime_is_a_miss(tmp_path, hash_cache, write_file):
+    path = write_file(tmp_path / "a", b"abc")
+    key = hash_cache.get_key(path, "sha256")
+    assert hash_cache.lookup(key) is None
+    hash_cache.store(key, full_hash="h")
+    assert hash_cache.lookup(hash_cache.get_key(path, "sha256")) == (None, "h")
+    assert hash_cache.lookup(hash_cache.get_key(path, "md5")) is None
+
+    os.utime(path, ns=(0, 10 ** 9))
+    assert hash_cache.lookup(hash_cache.get_key(path, "sha256")) is None
+    assert hash_cache.stats() == {"hits": 1, "misses": 3}
+
+def test_entries_survive_reopen(tmp_path, hash_cache, write_file):
+    path = write_file(tmp_path / "a", b"abc")
+    key = hash_cache.get_key(path, "sha256")
+    hash_cache.store(key, probe_hash="p")
+    hash_cache.store(key, full_hash="h")
+    hash_cache.close()
+    hash_cache.open()
+    assert hash_cache.lookup(key) == ("p", "h")
+
+def test_finish_evicts_least_recently_used(hash_cache, monkeypatch):
+    clock = iter(range(1, 100))
+    monkeypatch.setattr(scan_store, "time", SimpleNamespace(time=lambda: next(clock)))
+    hash_cache.max_entries = 3
+    keys = [(1, inode, 3, 0, "sha256") for inode in range(5)]
+    for key in keys[:4]:
+        hash_cache.store(key, full_hash=str(key[1]))
+    hash_cache.finish()
+    assert [hash_cache.lookup(key) is not None for key in keys[:4]] == [False, True, True, True]
+
+    # Ein Treffer macht einen Eintrag wieder frisch, verdrängt wird der nächstälteste
+    hash_cache.lookup(keys[1])
+    hash_cache.store(keys[4], full_hash="4")
+    hash_cache.finish()
+    assert [hash_cache.lookup(key) is not None for key in keys] == [False, True, False, True, True]
+
+def test_files_without_inode_are_not_cached(tmp_path, hash_cache, write_file, monkeypatch):
+    # FAT, exFAT und manche Netzfreigaben melden die Inode-Nummer 0
+    paths = [write_file(tmp_path / name, name.encode() * 200000) for name in "ABC"]
+    for path in paths:
+        os.utime(path, ns=(10 ** 9, 10 ** 9))
+    real_stat = os.stat
+
+    def stat_without_inode(path, *args, **kwargs):
+        result = real_stat(path, *args, **kwargs)
+        if str(path) not in paths:
+            return result
+        values = {name: getattr(result, name) for name in dir(result) if name.startswith("st_")}
+        values["st_ino"] = 0
+        return SimpleNamespace(**values)
+
+    monkeypatch.setattr(os, "stat", stat_without_inode)
+    assert hash_cache.get_key(paths[0], "sha256") is None
+    for run in range(2):
+        duplicates, _ = find_duplicate_groups({200000: paths}, hash_cache=hash_cache)
+        assert duplicates == {}
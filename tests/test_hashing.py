@@ -0,0 +1,44 @@
+import hashlib
+import os
+
+import pytest
+
+from utils import HASH_CHUNK_SIZE, PROBE_SIZE, calculate_file_hash, calculate_probe_hash
+
+CHUNK_SIZE = 4096
+THRESHOLD = 3 * CHUNK_SIZE
+
+def around(*sizes):
+    return sorted({max(0, size + delta) for size in sizes for delta in (-1, 0, 1)})
+
+@pytest.fixture(scope="module")
+def data():
+    return os.urandom(2 * HASH_CHUNK_SIZE + 2)
+
+def sha256(content):
+    return hashlib.sha256(content).hexdigest()
+
+@pytest.mark.parametrize("size", around(0, 1, CHUNK_SIZE, 2 * CHUNK_SIZE, THRESHOLD))
+@pytest.mark.parametrize("mmap_threshold", [None, THRESHOLD])
+def test_file_hash_matches_hashlib(tmp_path, write_file, data, size, mmap_threshold):
+    path = write_file(tmp_path / "datei", data[:size])
+    digest = calculate_file_hash(path, "sha256", chunk_size=CHUNK_SIZE, mmap_threshold=mmap_threshold)
+    assert digest == sha256(data[:size])
+
+@pytest.mark.parametrize("size", around(HASH_CHUNK_SIZE, 2 * HASH_CHUNK_SIZE))
+def test_file_hash_with_default_chunk_size(tmp_path, write_file, data, size):
+    path = write_file(tmp_path / "datei", data[:size])
+    assert calculate_file_hash(path, "sha256") == sha256(data[:size])
+    assert calculate_file_hash(path, "sha256", mmap_threshold=1) == sha256(data[:size])
+
+@pytest.mark.parametrize("size", around(1, PROBE_SIZE, 2 * PROBE_SIZE))
+def test_probe_hash_covers_head_and_tail(tmp_path, write_file, data, size):
+    content = data[:size]
+    path = write_file(tmp_path / "datei", content)
+    expected = sha256(content) if size <= 2 * PROBE_SIZE else sha256(content[:PROBE_SIZE] + content[-PROBE_SIZE:])
+    assert calculate_probe_hash(path, size, algorithm="sha256") == expected
+
+def test_unreadable_file_gives_none(tmp_path):
+    missing = str(tmp_path / "fehlt")
+    assert calculate_file_hash(missing) is None
+    assert calculate_probe_hash(missing, 3) is None
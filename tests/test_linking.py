@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from linking import replace_with_link, link_targets
+
+def test_hardlink_replaces_duplicate(tmp_path, write_file):
+    source = write_file(tmp_path / "source", b"abc")
+    path = write_file(tmp_path / "copy", b"abc")
+    assert replace_with_link(path, source, reflink=False) == "hardlink"
+    assert os.path.samefile(source, path)
+    assert sorted(os.listdir(tmp_path)) == ["copy", "source"]
+
+def test_reflink_or_hardlink_keeps_content(tmp_path, write_file):
+    source = write_file(tmp_path / "source", b"abc")
+    path = write_file(tmp_path / "copy", b"abc")
+    assert replace_with_link(path, source) in ("reflink", "hardlink")
+    with open(path, "rb") as f:
+        assert f.read() == b"abc"
+    assert sorted(os.listdir(tmp_path)) == ["copy", "source"]
+
+def test_already_linked_file_is_left_alone(tmp_path, write_file):
+    source = write_file(tmp_path / "source", b"abc")
+    path = str(tmp_path / "link")
+    os.link(source, path)
+    assert replace_with_link(path, source) == "verknüpft"
+
+def test_size_mismatch_keeps_file(tmp_path, write_file):
+    source = write_file(tmp_path / "source", b"abc")
+    path = write_file(tmp_path / "copy", b"abcd")
+    with pytest.raises(ValueError):
+        replace_with_link(path, source)
+    assert not os.path.samefile(source, path)
+    assert sorted(os.listdir(tmp_path)) == ["copy", "source"]
+
+def test_file_changed_since_verification_is_kept(tmp_path, write_file):
+    source = write_file(tmp_path / "source", b"abc")
+    path = write_file(tmp_path / "copy", b"abc")
+    signatures = {}
+    for filepath in (source, path):
+        file_stats = os.stat(filepath)
+        signatures[filepath] = (file_stats.st_size, file_stats.st_mtime_ns)
+    os.utime(path, ns=(0, 10 ** 9))
+    with pytest.raises(ValueError):
+        replace_with_link(path, source, signatures=signatures)
+    assert not os.path.samefile(source, path)
+
+    os.utime(path, ns=(0, signatures[path][1]))
+    os.utime(source, ns=(0, 10 ** 9))
+    with pytest.raises(ValueError):
+        replace_with_link(path, source, signatures=signatures)
+
+    os.utime(source, ns=(0, signatures[source][1]))
+    assert replace_with_link(path, source, reflink=False, signatures=signatures) == "hardlink"
+
+def test_missing_source_keeps_file(tmp_path, write_file):
+    path = write_file(tmp_path / "copy", b"abc")
+    with pytest.raises(OSError):
+        replace_with_link(path, str(tmp_path / "fehlt"))
+    assert os.listdir(tmp_path) == ["copy"]
+
+def test_link_targets_keep_first_file_per_group(tmp_path, write_file):
+    a = write_file(tmp_path / "a", b"abc")
+    b = write_file(tmp_path / "b", b"abc")
+    c = write_file(tmp_path / "c", b"abc")
+    missing = str(tmp_path / "fehlt")
+    assert link_targets({"h": [a, missing, b, c]}) == {b: a, c: a}
@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+pytest.importorskip("PySide6.QtCore")
+
+from PySide6.QtCore import Qt
+
+from models import FileTableModel
+
+def make_model(count, directories=3):
+    model = FileTableModel()
+    model.add_rows([
+        (os.path.join(f"/daten/{number % directories}", f"{number}.txt"), number, float(number), ".txt", "benutzer")
+        for number in range(count)
+    ])
+    return model
+
+def view_paths(model):
+    return [model.path(row) for row in range(model.rowCount())]
+
+def removal_signals(model):
+    removed = []
+    resets = []
+    model.rowsRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+    model.modelReset.connect(lambda: resets.append(True))
+    return removed, resets
+
+def test_remove_paths_unsorted():
+    model = make_model(10)
+    expected = view_paths(model)
+    removed_paths = [expected[2], expected[3], expected[7]]
+    removed, resets = removal_signals(model)
+    model.remove_paths(removed_paths + ["/anderswo/x.txt"])
+    assert view_paths(model) == [path for path in expected if path not in removed_paths]
+    assert removed == [(7, 7), (2, 3)]
+    assert resets == []
+    assert model.order is None
+
+def test_remove_paths_keeps_sort_order():
+    model = make_model(10)
+    model.sort(FileTableModel.SIZE, Qt.SortOrder.DescendingOrder)
+    expected = view_paths(model)
+    removed_paths = expected[::3]
+    model.remove_paths(removed_paths)
+    assert view_paths(model) == [path for path in expected if path not in removed_paths]
+    sizes = [model.size(row) for row in range(model.rowCount())]
+    assert sizes == sorted(sizes, reverse=True)
+
+def test_many_ranges_reset_the_model():
+    count = (FileTableModel.MAX_REMOVE_RANGES + 1) * 2
+    model = make_model(count)
+    model.sort(FileTableModel.DATE, Qt.SortOrder.AscendingOrder)
+    expected = view_paths(model)
+    removed, resets = removal_signals(model)
+    model.remove_paths(expected[::2])
+    assert view_paths(model) == expected[1::2]
+    assert removed == []
+    assert resets == [True]
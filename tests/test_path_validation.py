@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+pytest.importorskip("PySide6.QtCore")
+
+from deletion import PathValidator
+from utils import PATH_OK, PATH_IS_DIRECTORY, PATH_MISSING
+
+def validate(paths):
+    results = []
+    cancelled = []
+    validator = PathValidator(paths)
+    validator.paths_validated.connect(results.extend)
+    validator.validation_complete.connect(cancelled.append)
+    validator.run()
+    assert cancelled == [False]
+    return dict(results)
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / "ordner").mkdir()
+    for number in range(PathValidator.SCANDIR_MIN_PATHS):
+        (tmp_path / f"{number}.txt").write_bytes(b"abc")
+    return tmp_path
+
+def expected_statuses(tree):
+    return {
+        str(tree / "0.txt"): PATH_OK,
+        str(tree / "ordner"): PATH_IS_DIRECTORY,
+        str(tree / "ordner") + os.sep: PATH_IS_DIRECTORY,
+        str(tree / "fehlt.txt"): PATH_MISSING,
+        str(tree / "fehlt" / "a.txt"): PATH_MISSING,
+    }
+
+def test_single_paths_are_checked_with_stat(tree):
+    expected = expected_statuses(tree)
+    assert validate(list(expected)) == expected
+
+def test_large_directory_groups_are_listed(tree):
+    expected = expected_statuses(tree)
+    expected.update({str(tree / f"{number}.txt"): PATH_OK for number in range(PathValidator.SCANDIR_MIN_PATHS)})
+    assert validate(list(expected)) == expected
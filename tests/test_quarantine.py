@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+pytest.importorskip("PySide6.QtCore")
+
+from quarantine import Quarantine
+
+@pytest.fixture
+def quarantine(tmp_path):
+    quarantine = Quarantine(str(tmp_path / "journal.db"))
+    # Nicht bis zur echten Laufwerkswurzel hochlaufen
+    quarantine.get_volume_root = lambda directory: str(tmp_path)
+    quarantine.open()
+    yield quarantine
+    quarantine.close()
+
+def test_move_and_restore(tmp_path, quarantine, write_file):
+    path = write_file(tmp_path / "daten" / "a.txt")
+    session = quarantine.begin_session()
+    moved, failed = quarantine.move_paths([path], session)
+    assert moved == [path]
+    assert failed == []
+    assert not os.path.exists(path)
+
+    (quarantine_path,) = quarantine.session_paths(session)
+    assert os.path.exists(quarantine_path)
+    assert quarantine.sessions()[0][2:] == (1, 3)
+
+    quarantine.restore(quarantine_path)
+    assert os.path.exists(path)
+    assert quarantine.sessions() == []
+
+def test_missing_file_is_reported_and_not_journaled(tmp_path, quarantine, write_file):
+    path = write_file(tmp_path / "daten" / "a.txt")
+    missing = str(tmp_path / "daten" / "fehlt.txt")
+    session = quarantine.begin_session()
+    moved, failed = quarantine.move_paths([missing, path], session)
+    assert moved == [path]
+    assert [failed_path for failed_path, error in failed] == [missing]
+    assert len(quarantine.session_paths(session)) == 1
+
+def test_restore_refuses_to_overwrite(tmp_path, quarantine, write_file):
+    path = write_file(tmp_path / "daten" / "a.txt")
+    session = quarantine.begin_session()
+    quarantine.move_paths([path], session)
+    write_file(tmp_path / "daten" / "a.txt", b"neu")
+    (quarantine_path,) = quarantine.session_paths(session)
+    with pytest.raises(FileExistsError):
+        quarantine.restore(quarantine_path)
+    assert os.path.exists(quarantine_path)
+
+def test_restore_of_interrupted_move_only_forgets_entry(tmp_path, quarantine, write_file):
+    path = write_file(tmp_path / "daten" / "a.txt")
+    session = quarantine.begin_session()
+    quarantine.move_paths([path], session)
+    (quarantine_path,) = quarantine.session_paths(session)
+    # Absturz zwischen Journal und rename nachstellen
+    os.rename(quarantine_path, path)
+    quarantine.restore(quarantine_path)
+    assert os.path.exists(path)
+    assert quarantine.sessions() == []
+
+def test_purge_deletes_file_and_entry(tmp_path, quarantine, write_file):
+    path = write_file(tmp_path / "daten" / "a.txt")
+    session = quarantine.begin_session()
+    quarantine.move_paths([path], session)
+    assert quarantine.expired_paths(max_age=-1) == quarantine.session_paths(session)
+
+    for quarantine_path in quarantine.expired_paths(max_age=-1):
+        quarantine.purge(quarantine_path)
+    quarantine.finish()
+    assert quarantine.sessions() == []
+    assert not os.path.exists(path)
+    assert not os.path.exists(os.path.dirname(quarantine_path))
+
+def test_journal_survives_reopen(tmp_path, quarantine, write_file):
+    path = write_file(tmp_path / "daten" / "a.txt")
+    session = quarantine.begin_session()
+    quarantine.move_paths([path], session)
+    quarantine.close()
+
+    reopened = Quarantine(quarantine.db_path)
+    reopened.open()
+    try:
+        (quarantine_path,) = reopened.session_paths(session)
+        reopened.restore(quarantine_path)
+    finally:
+        reopened.close()
+    assert os.path.exists(path)
@@ -0,0 +1,55 @@
+import pytest
+
+pytest.importorskip("PySide6.QtCore")
+
+from scan_store import ScanStore
+
+@pytest.fixture
+def store(tmp_path):
+    store = ScanStore(str(tmp_path / "store.db"))
+    store.open()
+    yield store
+    store.close()
+
+@pytest.fixture
+def snapshot(store):
+    """Snapshot mit vielen gleichen Sortierwerten, damit Seitengrenzen in Gleichstände fallen"""
+    snapshot_id = store.create_snapshot("/daten", 1, None, None, None)
+    rows = [
+        (f"/daten/{number % 7}/{number:03d}.txt", number % 3, float(number % 4), [".a", ".b"][number % 2], "xy"[number % 5 == 0])
+        for number in range(101)
+    ]
+    for start in range(0, len(rows), 25):
+        store.append_rows(snapshot_id, rows[start:start + 25])
+    store.complete_snapshot(snapshot_id)
+    return snapshot_id, rows
+
+@pytest.mark.parametrize("sort_column", range(5))
+@pytest.mark.parametrize("descending", [False, True])
+def test_keyset_paging_returns_sorted_rows(store, snapshot, sort_column, descending):
+    snapshot_id, rows = snapshot
+    expected = sorted(
+        rows,
+        key=lambda row: (row[0],) if sort_column == 0 else (row[sort_column], row[0]),
+        reverse=descending
+    )
+    paged = []
+    after = None
+    while True:
+        page = store.fetch_page(snapshot_id, sort_column, descending, 0, 7, after=after)
+        if not page:
+            break
+        paged.extend(page)
+        after = store.sort_key(page[-1], sort_column)
+    assert paged == expected
+
+    # Sprung: OFFSET ab einer bekannten Seite statt vom Anfang
+    after = store.sort_key(expected[13], sort_column)
+    assert store.fetch_page(snapshot_id, sort_column, descending, 20, 7, after=after) == expected[34:41]
+    assert store.fetch_page(snapshot_id, sort_column, descending, 34, 7) == expected[34:41]
+
+def test_streamed_snapshot_is_complete(store, snapshot):
+    snapshot_id, rows = snapshot
+    assert store.count_rows(snapshot_id) == len(rows)
+    assert list(store.iter_rows(snapshot_id, batch_size=10)) == sorted(rows)
+    assert [row[0] for row in store.list_snapshots()] == [snapshot_id]
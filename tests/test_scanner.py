@@ -0,0 +1,229 @@
+import os
+import shutil
+import threading
+import time
+from queue import Queue
+
+import pytest
+
+pytest.importorskip("PySide6.QtCore")
+
+from scan_store import DirectoryIndex, ScanStore
+from scanner import FileScanner
+from utils import QUARANTINE_DIRECTORY
+
+OLD = 946684800  # 01.01.2000
+
+def make_tree(root, depth=3, width=3, files=4):
+    """Legt einen Baum mit alten .txt- und neuen .log-Dateien an und gibt die alten Pfade zurück"""
+    old_paths = []
+    directories = [root]
+    for level in range(depth):
+        next_directories = []
+        for directory in directories:
+            directory.mkdir(parents=True, exist_ok=True)
+            for number in range(files):
+                path = directory / f"{number}.txt"
+                path.write_bytes(b"x" * (number + 1))
+                os.utime(path, (OLD, OLD))
+                old_paths.append(str(path))
+            (directory / "neu.log").write_bytes(b"neu")
+            next_directories.extend(directory / f"ordner{index}" for index in range(width))
+        directories = next_directories
+    return old_paths
+
+def run_scan(scanner, timeout=30):
+    """Führt den Scan synchron aus und sammelt die gemeldeten Batches
+
+    Hängt der Scan, bricht ein Zeitgeber ihn nach timeout Sekunden ab.
+    """
+    batches = []
+    completed = []
+    scanner.files_found.connect(batches.append)
+    scanner.scan_complete.connect(lambda size, count: completed.append(count))
+    watchdog = threading.Timer(timeout, setattr, (scanner, "stop_scan", True))
+    watchdog.start()
+    try:
+        scanner.run()
+    finally:
+        watchdog.cancel()
+    assert not scanner.stop_scan, "Scan ist nicht von selbst beendet"
+    assert completed == [scanner.file_count]
+    return [row for batch in batches for row in batch], batches
+
+@pytest.mark.parametrize("traversal_workers", [1, 2, 8])
+def test_traversal_finds_every_file(tmp_path, traversal_workers):
+    old_paths = make_tree(tmp_path / "laufwerk")
+    scanner = FileScanner(str(tmp_path / "laufwerk"), 1, traversal_workers=traversal_workers)
+    rows, _ = run_scan(scanner)
+    assert sorted(row[0] for row in rows) == sorted(old_paths)
+    assert scanner.file_count == len(old_paths)
+    assert scanner.collected_count == len(old_paths) + (1 + 3 + 9)
+
+def test_empty_and_missing_roots_terminate(tmp_path):
+    (tmp_path / "leer").mkdir()
+    for root in (tmp_path / "leer", tmp_path / "fehlt"):
+        rows, _ = run_scan(FileScanner(str(root), 1, traversal_workers=4))
+        assert rows == []
+
+def test_quarantine_directory_is_skipped(tmp_path):
+    old_paths = make_tree(tmp_path / "laufwerk", depth=1)
+    make_tree(tmp_path / "laufwerk" / QUARANTINE_DIRECTORY, depth=1)
+    rows, _ = run_scan(FileScanner(str(tmp_path / "laufwerk"), 1))
+    assert sorted(row[0] for row in rows) == sorted(old_paths)
+
+def test_rows_come_from_the_listing_without_restat(tmp_path, monkeypatch):
+    old_paths = make_tree(tmp_path / "laufwerk", depth=2)
+    expected = {path: (os.stat(path).st_size, os.stat(path).st_mtime) for path in old_paths}
+    real_stat = os.stat
+
+    def stat_directories_only(path, *args, **kwargs):
+        if os.path.basename(str(path)).endswith(".txt"):
+            raise AssertionError(f"Datei erneut per stat abgefragt: {path}")
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", stat_directories_only)
+    rows, _ = run_scan(FileScanner(str(tmp_path / "laufwerk"), 1))
+    assert {path: (size, mtime) for path, size, mtime, extension, owner in rows} == expected
+    assert {extension for path, size, mtime, extension, owner in rows} == {".txt"}
+
+class SlowScanner(FileScanner):
+    """Verarbeitet Chunks langsam und merkt sich den größten Vorsprung des Sammlers"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.progress_lock = threading.Lock()
+        self.done = 0
+        self.max_lead = 0
+
+    def process_file_chunk(self, files):
+        with self.progress_lock:
+            self.max_lead = max(self.max_lead, self.collected_count - self.done)
+        time.sleep(0.001)
+        result = super().process_file_chunk(files)
+        with self.progress_lock:
+            self.done += len(files)
+        return result
+
+def test_pipeline_keeps_a_bounded_number_of_files_in_flight(tmp_path):
+    old_paths = make_tree(tmp_path / "laufwerk", depth=1, files=2000)
+    scanner = SlowScanner(str(tmp_path / "laufwerk"), 1, max_workers=1, traversal_workers=2)
+    scanner.file_queue = Queue(maxsize=200)
+    rows, _ = run_scan(scanner)
+    assert len(rows) == len(old_paths)
+    # Queue + Chunks im Fenster (max_workers * 2) + ein Chunk in Arbeit + je Sammler eine Datei
+    chunk_size = 100
+    assert scanner.max_lead <= 200 + 3 * chunk_size + 2
+
+def test_results_are_sent_in_batches(tmp_path):
+    old_paths = make_tree(tmp_path / "laufwerk", depth=1, files=5000)
+    scanner = FileScanner(str(tmp_path / "laufwerk"), 1)
+    rows, batches = run_scan(scanner)
+    assert len(rows) == len(old_paths)
+    assert all(batches)
+    # Die Schwelle kann höchstens um die gleichzeitig fertig gewordenen Chunks (je 100 Dateien) überschritten werden
+    assert max(len(batch) for batch in batches) < FileScanner.RESULT_BATCH_SIZE + scanner.max_workers * 2 * 100
+    assert len(batches) <= len(old_paths) // FileScanner.RESULT_BATCH_SIZE + 20
+
+def test_filter_summary_counts_rejections_per_stage(tmp_path):
+    old_paths = make_tree(tmp_path / "laufwerk", depth=2)
+    new_count = 1 + 3
+    scanner = FileScanner(
+        str(tmp_path / "laufwerk"), 1, file_types=[".txt", ".log"], size_filter="Kleine Dateien"
+    )
+    rows, _ = run_scan(scanner)
+    assert len(rows) == len(old_paths)
+    summary = scanner.filter_summary()
+    assert [(name, rejected) for name, rejected, seconds in summary] == [
+        ("Dateityp", 0), ("Größe", 0), ("Alter", new_count)
+    ]
+    assert all(seconds >= 0 for name, rejected, seconds in summary)
+
+    scanner = FileScanner(str(tmp_path / "laufwerk"), 1, file_types=[".log"], owner_filter="niemand-xyz")
+    rows, _ = run_scan(scanner)
+    assert rows == []
+    assert [(name, rejected) for name, rejected, seconds in scanner.filter_summary()] == [
+        ("Dateityp", len(old_paths)), ("Alter", new_count), ("Ersteller", 0)
+    ]
+
+    scanner = FileScanner(str(tmp_path / "laufwerk"), 1, owner_filter="niemand-xyz")
+    rows, _ = run_scan(scanner)
+    assert rows == []
+    assert [(name, rejected) for name, rejected, seconds in scanner.filter_summary()] == [
+        ("Alter", new_count), ("Ersteller", len(old_paths))
+    ]
+
+def test_streaming_scan_writes_every_row_to_the_snapshot(tmp_path):
+    old_paths = make_tree(tmp_path / "laufwerk", depth=2, files=300)
+    store = ScanStore(str(tmp_path / "store.db"))
+    store.open()
+    try:
+        snapshot_id = store.create_snapshot(str(tmp_path / "laufwerk"), 1, None, None, None)
+        stored = []
+        scanner = FileScanner(str(tmp_path / "laufwerk"), 1, result_store=store, snapshot_id=snapshot_id)
+        scanner.rows_stored.connect(stored.append)
+        rows, _ = run_scan(scanner)
+        assert rows == []
+        assert stored[-1] == len(old_paths)
+        assert store.count_rows(snapshot_id) == len(old_paths)
+        assert sorted(row[0] for row in store.iter_rows(snapshot_id)) == sorted(old_paths)
+        assert [row[0] for row in store.list_snapshots()] == [snapshot_id]
+    finally:
+        store.close()
+
+@pytest.fixture
+def directory_index(tmp_path):
+    index = DirectoryIndex(str(tmp_path / "index.db"))
+    index.open()
+    yield index
+    index.close()
+
+def scan_with_index(root, directory_index):
+    scanner = FileScanner(str(root), 1, directory_index=directory_index)
+    rows, _ = run_scan(scanner)
+    return {path: (size, mtime) for path, size, mtime, extension, owner in rows}, scanner
+
+def test_unchanged_directories_are_reused(tmp_path, directory_index):
+    old_paths = make_tree(tmp_path / "laufwerk", depth=2)
+    first, scanner = scan_with_index(tmp_path / "laufwerk", directory_index)
+    assert sorted(first) == sorted(old_paths)
+    assert scanner.reused_directories == 0
+
+    second, scanner = scan_with_index(tmp_path / "laufwerk", directory_index)
+    assert second == first
+    assert scanner.reused_directories == 1 + 3
+
+def test_changed_file_contents_are_restatted(tmp_path, directory_index):
+    make_tree(tmp_path / "laufwerk", depth=1)
+    first, _ = scan_with_index(tmp_path / "laufwerk", directory_index)
+
+    # Inhaltliche Änderungen lassen die mtime des Verzeichnisses unverändert
+    grown = tmp_path / "laufwerk" / "0.txt"
+    grown.write_bytes(b"y" * 50)
+    os.utime(grown, (OLD + 60, OLD + 60))
+    edited = tmp_path / "laufwerk" / "1.txt"
+    edited.write_bytes(b"heute bearbeitet")
+
+    second, scanner = scan_with_index(tmp_path / "laufwerk", directory_index)
+    assert scanner.reused_directories == 1
+    assert second[str(grown)] == (50, OLD + 60)
+    assert str(edited) not in second
+    assert len(second) == len(first) - 1
+
+def test_finish_prunes_vanished_directories(tmp_path, directory_index):
+    make_tree(tmp_path / "laufwerk", depth=2)
+    def stored_directories():
+        return {path for (path,) in directory_index.connection.execute("SELECT path FROM directories")}
+
+    scan_with_index(tmp_path / "laufwerk", directory_index)
+    vanished = str(tmp_path / "laufwerk" / "ordner1")
+    assert vanished in stored_directories()
+
+    shutil.rmtree(vanished)
+    scan_with_index(tmp_path / "laufwerk", directory_index)
+    assert stored_directories() == {str(tmp_path / "laufwerk")} | {
+        str(tmp_path / "laufwerk" / f"ordner{index}") for index in (0, 2)
+    }
+    assert directory_index.connection.execute(
+        "SELECT COUNT(*) FROM directory_files WHERE directory = ?", (vanished,)
+    ).fetchone()[0] == 0
@@ -0,0 +1,41 @@
+import pytest
+
+pytest.importorskip("PySide6.QtCore")
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+from similar_images import BKTree, group_similar_images, hamming_distance, hash_image_batch
+
+def test_bk_tree_query_matches_linear_scan():
+    values = [0, 1, 3, 7, 0xFF, 0xF0F0, 0xFFFF, 2 ** 63]
+    tree = BKTree()
+    for index, value in enumerate(values):
+        tree.add(value, index)
+    for value in (0, 5, 0xF0F1, 2 ** 63 + 1):
+        for radius in (0, 1, 4, 16):
+            expected = {index for index, other in enumerate(values) if hamming_distance(value, other) <= radius}
+            assert {index for index, distance in tree.query(value, radius)} == expected
+
+def test_similarity_is_transitive():
+    # a~b und b~c, a und c liegen aber weiter auseinander als max_distance
+    image_hashes = [("a", 0b0000), ("b", 0b0011), ("c", 0b1111), ("d", 2 ** 40 - 1)]
+    groups = group_similar_images(image_hashes, max_distance=2)
+    assert list(groups.values()) == [[("a", 0), ("b", 2), ("c", 4)]]
+
+def test_single_images_form_no_group():
+    assert group_similar_images([("a", 0), ("b", 2 ** 64 - 1)]) == {}
+
+@pytest.mark.parametrize("algorithm", ["dhash", "phash"])
+def test_scaled_copy_is_similar(tmp_path, algorithm):
+    gradient = np.add.outer(np.arange(256), np.arange(256)).astype(np.uint8)
+    original = Image.fromarray(gradient)
+    original.save(tmp_path / "original.png")
+    original.resize((128, 128)).save(tmp_path / "klein.jpg", quality=80)
+    Image.fromarray(255 - gradient).save(tmp_path / "invertiert.png")
+    (tmp_path / "defekt.png").write_bytes(b"kein Bild")
+
+    paths = [str(tmp_path / name) for name in ("original.png", "klein.jpg", "invertiert.png", "defekt.png")]
+    image_hashes = hash_image_batch(paths, algorithm)
+    assert [path for path, value in image_hashes] == paths[:3]
+    groups = group_similar_images(image_hashes)
+    assert [[path for path, distance in group] for group in groups.values()] == [paths[:2]]
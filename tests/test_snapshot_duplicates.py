@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+pytest.importorskip("PySide6.QtCore")
+
+from duplicates import find_snapshot_duplicates
+from scan_store import ScanStore
+
+@pytest.fixture
+def store(tmp_path):
+    store = ScanStore(str(tmp_path / "store.db"))
+    store.open()
+    yield store
+    store.close()
+
+def add_snapshot(store, drive_path, paths):
+    snapshot_id = store.create_snapshot(drive_path, 0, None, None, None)
+    rows = []
+    for path in paths:
+        file_stat = os.stat(path)
+        rows.append((path, file_stat.st_size, file_stat.st_mtime, os.path.splitext(path)[1], ""))
+    store.append_rows(snapshot_id, rows)
+    store.complete_snapshot(snapshot_id)
+    return snapshot_id
+
+def test_copies_across_snapshots_are_found(tmp_path, store, write_file):
+    original = write_file(tmp_path / "c" / "a.txt")
+    copy = write_file(tmp_path / "d" / "a.txt")
+    other = write_file(tmp_path / "d" / "b.txt", b"abd")
+    first = add_snapshot(store, str(tmp_path / "c"), [original])
+    second = add_snapshot(store, str(tmp_path / "d"), [copy, other])
+
+    duplicates, stats = find_snapshot_duplicates(store, [first, second])
+    assert list(duplicates.values()) == [[original, copy]]
+    assert stats["fully_hashed"] == 3
+
+    # Die Digests sind gespeichert und werden nicht erneut berechnet
+    duplicates, stats = find_snapshot_duplicates(store, [second, first])
+    assert list(duplicates.values()) == [[copy, original]]
+    assert stats["fully_hashed"] == 0
+
+def test_same_file_in_both_snapshots_is_no_copy(tmp_path, store, write_file):
+    path = write_file(tmp_path / "c" / "a.txt")
+    link = str(tmp_path / "d" / "a.txt")
+    os.makedirs(os.path.dirname(link))
+    os.link(path, link)
+    first = add_snapshot(store, str(tmp_path / "c"), [path])
+    second = add_snapshot(store, str(tmp_path / "d"), [path, link])
+    duplicates, _ = find_snapshot_duplicates(store, [first, second])
+    assert duplicates == {}
+
+def test_changed_files_are_skipped(tmp_path, store, write_file):
+    original = write_file(tmp_path / "c" / "a.txt")
+    copy = write_file(tmp_path / "d" / "a.txt")
+    first = add_snapshot(store, str(tmp_path / "c"), [original])
+    second = add_snapshot(store, str(tmp_path / "d"), [copy])
+    os.utime(copy, (0, 0))
+    duplicates, stats = find_snapshot_duplicates(store, [first, second])
+    assert duplicates == {}
+    assert stats["unavailable"] == 1
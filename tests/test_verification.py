@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+pytest.importorskip("PySide6.QtCore")
+
+from duplicates import verify_group, verify_duplicate_groups
+
+def test_identical_files_are_confirmed(tmp_path, write_file):
+    a = write_file(tmp_path / "a", b"x" * 5000)
+    b = write_file(tmp_path / "b", b"x" * 5000)
+    groups, bytes_read = verify_group([a, b])
+    assert groups == [[a, b]]
+    assert bytes_read == 10000
+
+def test_group_is_split_by_content(tmp_path, write_file):
+    a = write_file(tmp_path / "a", b"same")
+    b = write_file(tmp_path / "b", b"diff")
+    c = write_file(tmp_path / "c", b"same")
+    d = write_file(tmp_path / "d", b"diff")
+    groups, _ = verify_group([a, b, c, d])
+    assert sorted(groups) == [[a, c], [b, d]]
+
+def test_different_length_is_rejected(tmp_path, write_file):
+    a = write_file(tmp_path / "a", b"abc")
+    b = write_file(tmp_path / "b", b"abcd")
+    assert verify_group([a, b])[0] == []
+
+def test_missing_file_is_skipped(tmp_path, write_file):
+    a = write_file(tmp_path / "a", b"abc")
+    b = write_file(tmp_path / "b", b"abc")
+    groups, _ = verify_group([a, str(tmp_path / "fehlt"), b])
+    assert groups == [[a, b]]
+
+def test_hardlink_is_not_a_copy_of_itself(tmp_path, write_file):
+    a = write_file(tmp_path / "a", b"abc")
+    link = str(tmp_path / "link")
+    os.link(a, link)
+    assert verify_group([a, link])[0] == []
+
+def test_symlink_is_not_a_copy_of_itself(tmp_path, write_file):
+    a = write_file(tmp_path / "a", b"abc")
+    b = write_file(tmp_path / "b", b"abc")
+    link = str(tmp_path / "link")
+    os.symlink(a, link)
+    groups, _ = verify_group([a, link, b])
+    assert groups == [[a, b]]
+
+def test_signatures_record_size_and_mtime(tmp_path, write_file):
+    a = write_file(tmp_path / "a", b"abc")
+    b = write_file(tmp_path / "b", b"abc")
+    signatures = {}
+    verify_duplicate_groups({"h": [a, b]}, signatures=signatures)
+    assert signatures == {path: (3, os.stat(path).st_mtime_ns) for path in (a, b)}
+
+def test_cancelled_verification_confirms_nothing(tmp_path, write_file):
+    a = write_file(tmp_path / "a", b"abc")
+    b = write_file(tmp_path / "b", b"abc")
+    assert verify_group([a, b], is_cancelled=lambda: True)[0] == []
+
+def test_verify_duplicate_groups_keeps_only_confirmed_files(tmp_path, write_file):
+    a = write_file(tmp_path / "a", b"abc")
+    b = write_file(tmp_path / "b", b"abc")
+    c = write_file(tmp_path / "c", b"abd")
+    verified, stats = verify_duplicate_groups({"h": [a, b, c]}, max_workers=2)
+    assert list(verified.values()) == [[a, b]]
+    assert stats["verified"] == 2
+    assert stats["rejected"] == 1
+
+def test_verify_duplicate_groups_returns_none_when_cancelled(tmp_path, write_file):
+    a = write_file(tmp_path / "a", b"abc")
+    b = write_file(tmp_path / "b", b"abc")
+    verified, _ = verify_duplicate_groups({"h": [a, b]}, is_cancelled=lambda: True)
+    assert verified is None
@@ -1,61 +1,30 @@
 import os
 import json
+from functools import partial
 from datetime import datetime, timedelta
 from collections import defaultdict
 from pathlib import Path
 from PySide6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                            QPushButton, QLabel, QLineEdit, QFileDialog, QTreeWidget, 
-                           QTreeWidgetItem, QMessageBox, QProgressBar, QComboBox, 
-                           QFrame, QToolBar, QDialog, QTabWidget, QStyle, QSplashScreen, QGridLayout, QProgressDialog, QTextEdit)
+                           QTreeWidgetItem, QTreeView, QAbstractItemView, QMessageBox, QProgressBar, QComboBox, 
+                           QFrame, QToolBar, QDialog, QTabWidget, QStyle, QSplashScreen, QGridLayout, QProgressDialog, QCheckBox,
+                           QPlainTextEdit)
 from PySide6.QtCore import Qt, QSize, QTimer
 from PySide6.QtGui import QIcon, QAction, QColor, QPixmap, QFont
 from PySide6.QtWidgets import QApplication
 
 from scanner import FileScanner
+from models import FileTableModel, StoredFileTableModel, PathStatusModel
+from scan_store import DirectoryIndex, HashCache, ScanStore
 from visualization import Visualization
-from utils import format_size, parse_size, calculate_file_hash, get_file_categories, get_file_type_extensions
-
-class ScanCache:
-    def __init__(self, cache_file="scan_cache.json"):
-        self.cache_file = cache_file
-        self.cache = self.load_cache()
-        
-    def load_cache(self):
-        try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return {}
-        except Exception:
-            return {}
-            
-    def save_cache(self):
-        try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            print(f"Fehler beim Speichern des Caches: {str(e)}")
-            
-    def get_cache_key(self, drive_path, years, file_types, owner_filter, size_filter):
-        return f"{drive_path}_{years}_{str(file_types)}_{owner_filter}_{size_filter}"
-        
-    def get_cached_results(self, drive_path, years, file_types, owner_filter, size_filter):
-        cache_key = self.get_cache_key(drive_path, years, file_types, owner_filter, size_filter)
-        if cache_key in self.cache:
-            cache_data = self.cache[cache_key]
-            # Prüfe, ob der Cache noch gültig ist (maximal 24 Stunden alt)
-            cache_time = datetime.fromisoformat(cache_data['timestamp'])
-            if datetime.now() - cache_time < timedelta(hours=24):
-                return cache_data['results']
-        return None
-        
-    def cache_results(self, drive_path, years, file_types, owner_filter, size_filter, results):
-        cache_key = self.get_cache_key(drive_path, years, file_types, owner_filter, size_filter)
-        self.cache[cache_key] = {
-            'timestamp': datetime.now().isoformat(),
-            'results': results
-        }
-        self.save_cache()
+from duplicates import DuplicateFinder, DuplicateVerifier, SnapshotDuplicateFinder, reclaimable_bytes
+from similar_images import SimilarImageFinder
+from directory_duplicates import DuplicateDirectoryFinder
+from deletion import FileDeleter, PathValidator
+from quarantine import Quarantine
+from linking import link_targets, replace_with_link
+from utils import (format_size, parse_size, get_file_categories, get_file_type_extensions,
+                   PATH_OK, PATH_IS_DIRECTORY, PATH_MISSING)
 
 class SplashScreen(QSplashScreen):
     def __init__(self):
@@ -133,6 +102,8 @@ class SplashScreen(QSplashScreen):
             self.status.setText("Starte Anwendung...")
 
 class DriveCleanerApp(QMainWindow):
+    MAX_REPORTED_FAILURES = 1000  # Fehler, die im Löschbericht einzeln aufgeführt werden
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Laufwerk Bereiniger")
@@ -145,8 +116,12 @@ class DriveCleanerApp(QMainWindow):
         app = QApplication.instance()
         app.setWindowIcon(app_icon)
         
-        # Cache initialisieren
-        self.cache = ScanCache()
+        # Scan-Speicher (SQLite) initialisieren
+        self.cache = ScanStore()
+        self.directory_index = DirectoryIndex()
+        self.hash_cache = HashCache()
+        self.quarantine = Quarantine()
+        self.scan_parameters = None
         
         self.setup_ui()
         self.setup_toolbar()
@@ -189,23 +164,23 @@ class DriveCleanerApp(QMainWindow):
             QPushButton:pressed {
                 background-color: #2265d4;
             }
-            QTreeWidget {
+            QTreeView {
                 background-color: white;
                 border: 1px solid #e0e0e0;
                 border-radius: 2px;
             }
-            QTreeWidget::item {
+            QTreeView::item {
                 padding: 5px;
                 color: black;
             }
-            QTreeWidget::item:selected {
+            QTreeView::item:selected {
                 background-color: #e8f0fe;
                 color: black;
             }
-            QTreeWidget::item:hover {
+            QTreeView::item:hover {
                 background-color: #f8f9fa;
             }
-            QTreeWidget QHeaderView::section {
+            QTreeView QHeaderView::section {
                 background-color: #f8f9fa;
                 padding: 5px;
                 border: none;
@@ -331,6 +306,26 @@ class DriveCleanerApp(QMainWindow):
         duplicates_action.triggered.connect(self.find_duplicates)
         toolbar.addAction(duplicates_action)
 
+        # Scans vergleichen Button
+        compare_scans_action = QAction("Scans vergleichen", self)
+        compare_scans_action.triggered.connect(self.show_snapshot_duplicates_dialog)
+        toolbar.addAction(compare_scans_action)
+
+        # Quarantäne Button
+        quarantine_action = QAction("Quarantäne", self)
+        quarantine_action.triggered.connect(self.show_quarantine_dialog)
+        toolbar.addAction(quarantine_action)
+
+        # Doppelte Ordner Button
+        duplicate_directories_action = QAction("Doppelte Ordner", self)
+        duplicate_directories_action.triggered.connect(self.find_duplicate_directories)
+        toolbar.addAction(duplicate_directories_action)
+
+        # Ähnliche Bilder Button
+        similar_images_action = QAction("Ähnliche Bilder", self)
+        similar_images_action.triggered.connect(self.find_similar_images)
+        toolbar.addAction(similar_images_action)
+
         # Ungenutzte Dateien Button
         unused_action = QAction("Ungenutzte Dateien", self)
         unused_action.triggered.connect(self.find_unused_files)
@@ -417,6 +412,31 @@ class DriveCleanerApp(QMainWindow):
         self.owner_input.setFixedWidth(200)
         self.owner_input.setToolTip("Groß-/Kleinschreibung wird ignoriert.\nMehrere Suchbegriffe möglich (z.B. 'leon admin').\nAlle Begriffe müssen im Namen vorkommen.")
         
+        # Inkrementeller Scan über den Verzeichnis-Index
+        self.incremental_checkbox = QCheckBox("Inkrementell")
+        self.incremental_checkbox.setChecked(True)
+        self.incremental_checkbox.setToolTip(
+            "Unveränderte Verzeichnisse (gleiche Änderungszeit) werden aus dem letzten Scan übernommen.\n"
+            "Geänderte Dateiinhalte werden nur bei einem vollständigen Scan erkannt."
+        )
+        
+        # Streaming-Modus für sehr große Laufwerke
+        self.streaming_checkbox = QCheckBox("Streaming")
+        self.streaming_checkbox.setToolTip(
+            "Für Laufwerke mit Millionen Dateien: Ergebnisse werden direkt in den Scan-Speicher geschrieben,\n"
+            "die Liste lädt nur den sichtbaren Ausschnitt. Der Speicherbedarf bleibt konstant."
+        )
+
+        # Quarantäne statt endgültigem Löschen (nur auf ausdrücklichen Wunsch)
+        self.quarantine_checkbox = QCheckBox("In Quarantäne statt löschen")
+        self.quarantine_checkbox.setChecked(False)
+        self.quarantine_checkbox.setToolTip(
+            "Gelöschte Dateien werden auf demselben Laufwerk in einen Quarantäne-Ordner verschoben\n"
+            f"und erst nach {Quarantine.RETENTION // (24 * 60 * 60)} Tagen endgültig entfernt. "
+            "Erst dann wird der Speicherplatz frei.\n"
+            "Wiederherstellen über 'Quarantäne' in der Werkzeugleiste."
+        )
+        
         # Füge die Filter zum Layout hinzu
         filter_layout.addWidget(QLabel("Älter als (Jahre):"))
         filter_layout.addWidget(self.years_input)
@@ -427,6 +447,9 @@ class DriveCleanerApp(QMainWindow):
         filter_layout.addWidget(self.size_filter_combo)
         filter_layout.addWidget(QLabel("Ersteller:"))
         filter_layout.addWidget(self.owner_input)
+        filter_layout.addWidget(self.incremental_checkbox)
+        filter_layout.addWidget(self.streaming_checkbox)
+        filter_layout.addWidget(self.quarantine_checkbox)
         
         # Füge einen Stretch am Ende hinzu, um die Filter nach links zu drücken
         filter_layout.addStretch()
@@ -489,8 +512,12 @@ class DriveCleanerApp(QMainWindow):
         progress_layout.addWidget(self.progress_bar)
 
         # Dateiliste
-        self.file_tree = QTreeWidget()
-        self.file_tree.setHeaderLabels(["Dateipfad", "Größe", "Datum", "Typ", "Ersteller"])
+        # Spaltenbasiertes Modell; die Ansicht fragt nur sichtbare Zeilen ab
+        self.file_model = FileTableModel(self)
+        self.file_tree = QTreeView()
+        self.file_tree.setModel(self.file_model)
+        self.file_tree.setRootIsDecorated(False)
+        self.file_tree.setUniformRowHeights(True)
         self.file_tree.setColumnWidth(0, 500)
         self.file_tree.setColumnWidth(1, 100)
         self.file_tree.setColumnWidth(2, 150)
@@ -498,24 +525,24 @@ class DriveCleanerApp(QMainWindow):
         self.file_tree.setColumnWidth(4, 200)
         self.file_tree.setAlternatingRowColors(True)
         self.file_tree.setSortingEnabled(True)
-        self.file_tree.setSelectionMode(QTreeWidget.SelectionMode.ExtendedSelection)
-        self.file_tree.setSelectionBehavior(QTreeWidget.SelectionBehavior.SelectRows)
+        self.file_tree.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.file_tree.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.file_tree.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
         self.file_tree.setStyleSheet("""
-            QTreeWidget {
+            QTreeView {
                 selection-background-color: #e8f0fe;
                 selection-color: black;
             }
-            QTreeWidget::item:selected {
+            QTreeView::item:selected {
                 background-color: #e8f0fe;
                 color: black;
             }
-            QTreeWidget::item:hover {
+            QTreeView::item:hover {
                 background-color: #f8f9fa;
             }
         """)
         # Verbinde Doppelklick mit Kopier-Funktion
-        self.file_tree.itemDoubleClicked.connect(self.copy_path_to_clipboard)
+        self.file_tree.doubleClicked.connect(self.copy_path_to_clipboard)
 
         # Aktionsbuttons
         button_frame = QFrame()
@@ -564,6 +591,21 @@ class DriveCleanerApp(QMainWindow):
         layout.addWidget(footer_frame)
 
         self.scanner = None
+        self.duplicate_finder = None
+        self.duplicate_verifier = None
+        self.image_finder = None
+        self.directory_finder = None
+        self.duplicate_progress = None
+        self.file_deleter = None
+        self.deletion_progress = None
+        self.path_validator = None
+
+        # Abgelaufene Quarantäne kurz nach dem Start und danach täglich leeren
+        QTimer.singleShot(60 * 1000, self.purge_quarantine)
+        self.quarantine_timer = QTimer(self)
+        self.quarantine_timer.timeout.connect(self.purge_quarantine)
+        self.quarantine_timer.start(24 * 60 * 60 * 1000)
+
         self.file_types = get_file_type_extensions()
         self.is_paused = False
 
@@ -663,7 +705,7 @@ class DriveCleanerApp(QMainWindow):
             return
             
         # Setze UI zurück
-        self.file_tree.clear()
+        self.file_model.clear()
         self.collection_progress.setVisible(True)
         self.collection_progress.setValue(0)
         self.progress_bar.setVisible(True)
@@ -687,24 +729,82 @@ class DriveCleanerApp(QMainWindow):
             size_filter = size_text.split(" (")[0]  # Extrahiere nur den Namen ohne Größenangabe
             
         # Prüfe Cache
-        cached_results = self.cache.get_cached_results(drive, years, file_types, owner_filter, size_filter)
+        self.scan_parameters = (drive, years, file_types, owner_filter, size_filter)
+        streaming = self.streaming_checkbox.isChecked()
+        cached_snapshot = None
+        cached_results = None
+        try:
+            self.cache.open()
+            self.cache.discard_incomplete_snapshots()
+            if streaming:
+                cached_snapshot = self.cache.find_valid_snapshot(*self.scan_parameters)
+            else:
+                cached_results = self.cache.get_cached_results(*self.scan_parameters)
+        except Exception as e:
+            self.status_label.setText(f"Scan-Speicher nicht verfügbar: {str(e)}")
+            streaming = False
+            
+        if cached_snapshot is not None:
+            self.set_file_model(StoredFileTableModel(self.cache, cached_snapshot, self))
+            self.reset_scan_ui()
+            self.status_label.setText("Cache geladen")
+            return
+        
+        if not streaming:
+            self.use_memory_model()
         if cached_results:
             self.status_label.setText("Lade Ergebnisse aus Cache...")
-            for result in cached_results:
-                self.add_file_to_tree(*result)
+            self.add_files_to_tree(cached_results)
             self.status_label.setText("Cache geladen")
             self.reset_scan_ui()
             return
         
         # Erstelle neuen Scanner
-        self.scanner = FileScanner(drive, years, file_types, owner_filter, size_filter)
-        self.scanner.file_found.connect(self.add_file_to_tree)
+        try:
+            self.directory_index.open()
+            directory_index = self.directory_index
+        except Exception as e:
+            self.status_label.setText(f"Verzeichnis-Index nicht verfügbar: {str(e)}")
+            directory_index = None
+        result_store = None
+        snapshot_id = None
+        if streaming:
+            # Ergebnisse landen direkt in einem neuen Snapshot, die Liste liest seitenweise
+            result_store = self.cache
+            snapshot_id = self.cache.create_snapshot(*self.scan_parameters)
+            self.set_file_model(StoredFileTableModel(self.cache, snapshot_id, self))
+        self.scanner = FileScanner(
+            drive, years, file_types, owner_filter, size_filter,
+            directory_index=directory_index,
+            incremental=self.incremental_checkbox.isChecked(),
+            result_store=result_store,
+            snapshot_id=snapshot_id
+        )
+        self.scanner.files_found.connect(self.add_files_to_tree)
+        self.scanner.rows_stored.connect(self.update_stored_rows)
         self.scanner.progress_update.connect(self.update_progress)
         self.scanner.scan_complete.connect(self.scan_completed)
         self.scanner.status_update.connect(self.update_status)
         self.scanner.collection_progress.connect(self.update_collection_progress)
         self.scanner.start()
 
+    def set_file_model(self, model):
+        """Tauscht das Modell hinter der Ergebnisliste aus"""
+        old_model = self.file_model
+        self.file_model = model
+        self.file_tree.setModel(model)
+        if old_model is not model:
+            old_model.deleteLater()
+
+    def use_memory_model(self):
+        """Stellt sicher, dass die Ergebnisliste das spaltenbasierte Speichermodell nutzt"""
+        if not isinstance(self.file_model, FileTableModel):
+            self.set_file_model(FileTableModel(self))
+
+    def update_stored_rows(self, row_count):
+        if isinstance(self.file_model, StoredFileTableModel):
+            self.file_model.refresh(row_count)
+
     def update_progress(self, value):
         self.progress_bar.setValue(value)
 
@@ -724,61 +824,52 @@ class DriveCleanerApp(QMainWindow):
         # Konvertiere GB zurück zu Bytes für die Anzeige
         total_size_bytes = total_size_gb * 1024 * 1024 * 1024
         
-        # Sammle Ergebnisse für den Cache
-        results = []
-        for i in range(self.file_tree.topLevelItemCount()):
-            item = self.file_tree.topLevelItem(i)
-            results.append([
-                item.text(0),  # Pfad
-                item.text(1),  # Größe
-                item.text(2),  # Datum
-                item.text(3),  # Typ
-                item.text(4)   # Ersteller
-            ])
-            
-        # Cache die Ergebnisse
-        drive = self.drive_input.text()
-        years = self.years_input.text().strip() or None
-        file_types = self.get_selected_file_types()
-        owner_filter = self.owner_input.text().strip() or None
-        size_filter = self.size_filter_combo.currentText().split(" (")[0] if self.size_filter_combo.currentText() != "Alle Größen" else None
-        
-        self.cache.cache_results(drive, years, file_types, owner_filter, size_filter, results)
+        # Cache die Ergebnisse mit denselben Parametern, mit denen der Scan gestartet wurde.
+        # Im Streaming-Modus ist der Snapshot bereits der Cache.
+        if self.scan_parameters is not None and isinstance(self.file_model, FileTableModel):
+            try:
+                self.cache.cache_results(*self.scan_parameters, self.file_model.rows())
+            except Exception as e:
+                self.status_label.setText(f"Fehler beim Speichern des Caches: {str(e)}")
+        
+        # Filterstatistik: welche Stufe wie viele Dateien aussortiert hat
+        filter_lines = ""
+        if self.scanner is not None:
+            filter_lines = "\n\nAussortiert nach Filterstufe:\n" + "\n".join(
+                f"{name}: {rejected:,} Dateien ({seconds:.2f} s)"
+                for name, rejected, seconds in self.scanner.filter_summary()
+            )
         
         QMessageBox.information(self, "Scan abgeschlossen", 
-                              f"Es wurden {file_count:,} Dateien mit einer Gesamtgröße von {format_size(total_size_bytes)} gefunden.")
+                              f"Es wurden {file_count:,} Dateien mit einer Gesamtgröße von {format_size(total_size_bytes)} gefunden."
+                              + filter_lines)
 
-    def add_file_to_tree(self, path, size, date, file_type, owner):
-        item = QTreeWidgetItem(self.file_tree)
-        item.setText(0, path)
-        item.setText(1, size)
-        item.setText(2, date)
-        item.setText(3, file_type)
-        item.setText(4, owner)
+    def add_files_to_tree(self, results):
+        """Fügt einen Batch von Treffern in einer Modelloperation ein"""
+        self.file_model.add_rows(results)
 
     def delete_selected(self):
-        selected_items = self.file_tree.selectedItems()
-        if not selected_items:
+        selected_rows = self.file_tree.selectionModel().selectedRows()
+        if not selected_rows:
             QMessageBox.warning(self, "Fehler", "Bitte wählen Sie Dateien zum Löschen aus.")
             return
             
         reply = QMessageBox.question(
             self,
             "Bestätigung",
-            f"Möchten Sie {len(selected_items)} ausgewählte Dateien löschen?",
+            f"Möchten Sie {len(selected_rows)} ausgewählte Dateien löschen?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            for item in selected_items:
-                try:
-                    os.remove(item.text(0))
-                    self.file_tree.takeTopLevelItem(self.file_tree.indexOfTopLevelItem(item))
-                except Exception as e:
-                    QMessageBox.warning(self, "Fehler", f"Fehler beim Löschen von {item.text(0)}: {str(e)}")
+            # Die Zeilen entfernt start_deletion gesammelt anhand der gelöschten Pfade
+            self.start_deletion(
+                [self.file_model.path(index.row()) for index in selected_rows],
+                "Lösche ausgewählte Dateien"
+            )
 
     def delete_all(self):
-        if self.file_tree.topLevelItemCount() == 0:
+        if self.file_model.rowCount() == 0:
             QMessageBox.warning(self, "Fehler", "Keine Dateien zum Löschen vorhanden.")
             return
             
@@ -790,14 +881,194 @@ class DriveCleanerApp(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            for i in range(self.file_tree.topLevelItemCount()):
-                item = self.file_tree.topLevelItem(i)
-                try:
-                    os.remove(item.text(0))
-                except Exception as e:
-                    QMessageBox.warning(self, "Fehler", f"Fehler beim Löschen von {item.text(0)}: {str(e)}")
-            
-            self.file_tree.clear()
+            # Gelöschte Zeilen entfernt start_deletion; fehlgeschlagene bleiben sichtbar
+            self.start_deletion(list(self.file_model.paths()), "Lösche alle Dateien")
+
+    def start_deletion(self, paths, title, parent=None, on_complete=None, note="", operation=None,
+                       result_label=None):
+        """Löscht Dateien im Hintergrund (siehe FileDeleter) und meldet das Ergebnis gesammelt
+
+        Ohne eigene operation wird je nach Einstellung in die Quarantäne
+        verschoben oder endgültig gelöscht; die gelöschten Pfade werden am
+        Ende in einem Durchgang aus der Dateiliste entfernt.
+        """
+        if self.file_deleter and self.file_deleter.isRunning():
+            QMessageBox.warning(
+                self, "Fehler",
+                "Es läuft bereits ein Löschvorgang (ggf. das Leeren der Quarantäne). Bitte kurz warten."
+            )
+            return
+
+        deleted_paths = []
+        remove_rows = operation is None
+        chunk_operation = None
+        if operation is None:
+            if self.quarantine_checkbox.isChecked():
+                self.quarantine.open()
+                chunk_operation = partial(self.quarantine.move_paths, session=self.quarantine.begin_session())
+                result_label = result_label or "In Quarantäne verschoben"
+                note = (note + "\n\n" if note else "") + "Die Dateien können über 'Quarantäne' wiederhergestellt werden."
+            else:
+                operation = os.remove
+        result_label = result_label or "Erfolgreich gelöscht"
+
+        self.deletion_progress = QProgressDialog(
+            "Lösche Dateien...", 
+            "Abbrechen", 
+            0, 
+            len(paths), 
+            parent or self
+        )
+        self.deletion_progress.setWindowTitle(title)
+        self.deletion_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.deletion_progress.setAutoClose(False)
+        self.deletion_progress.setAutoReset(False)
+
+        self.file_deleter = FileDeleter(paths, operation, chunk_operation)
+        self.file_deleter.progress_update.connect(self.update_deletion_progress)
+        if remove_rows:
+            self.file_deleter.files_deleted.connect(deleted_paths.extend)
+        self.file_deleter.deletion_complete.connect(
+            lambda summary: self.deletion_completed(summary, result_label, note, on_complete, deleted_paths)
+        )
+        self.deletion_progress.canceled.connect(self.file_deleter.cancel)
+        self.file_deleter.start()
+        self.deletion_progress.show()
+
+    def update_deletion_progress(self, done, total):
+        if self.deletion_progress is not None:
+            self.deletion_progress.setMaximum(total)
+            self.deletion_progress.setValue(done)
+
+    def deletion_completed(self, summary, result_label, note, on_complete, deleted_paths=()):
+        if self.deletion_progress is not None:
+            self.deletion_progress.close()
+            self.deletion_progress = None
+        self.wait_for_worker(self.file_deleter)
+        self.file_deleter = None
+        if self.quarantine.connection is not None:
+            self.quarantine.finish()
+        if deleted_paths:
+            self.file_model.remove_paths(deleted_paths)
+        self.show_deletion_report(summary, result_label, note)
+        if on_complete is not None:
+            on_complete(summary)
+
+    def show_deletion_report(self, summary, result_label="Erfolgreich gelöscht", note=""):
+        """Ein gemeinsamer Bericht statt einer Meldung pro fehlgeschlagener Datei"""
+        failed = summary["failed"]
+        message = (
+            f"{result_label}: {summary['deleted']} Dateien\n"
+            f"Fehlgeschlagen: {len(failed)} Dateien"
+        )
+        if summary["cancelled"]:
+            message += "\n\nDer Vorgang wurde abgebrochen."
+        if note:
+            message += f"\n\n{note}"
+
+        report = QMessageBox(self)
+        report.setWindowTitle("Vorgang abgeschlossen")
+        report.setIcon(QMessageBox.Icon.Warning if failed else QMessageBox.Icon.Information)
+        report.setText(message)
+        if failed:
+            details = [f"{path}: {error}" for path, error in failed[:self.MAX_REPORTED_FAILURES]]
+            if len(failed) > self.MAX_REPORTED_FAILURES:
+                details.append(f"... und {len(failed) - self.MAX_REPORTED_FAILURES} weitere")
+            report.setDetailedText("\n".join(details))
+        report.exec()
+        self.status_label.setText(f"{result_label}: {summary['deleted']} Dateien, {len(failed)} fehlgeschlagen")
+
+    def show_quarantine_dialog(self):
+        """Zeigt die Quarantäne-Sitzungen zum Wiederherstellen oder endgültigen Löschen"""
+        self.quarantine.open()
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Quarantäne")
+        dialog.setMinimumSize(700, 400)
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel(
+            f"Dateien werden nach {Quarantine.RETENTION // (24 * 60 * 60)} Tagen automatisch endgültig gelöscht."
+        ))
+
+        session_tree = QTreeWidget()
+        session_tree.setHeaderLabels(["Gelöscht am", "Dateien", "Größe"])
+        session_tree.setColumnWidth(0, 250)
+        session_tree.setRootIsDecorated(False)
+        for session, moved, file_count, total_size in self.quarantine.sessions():
+            item = QTreeWidgetItem(session_tree)
+            item.setText(0, datetime.fromtimestamp(moved).strftime("%Y-%m-%d %H:%M:%S"))
+            item.setText(1, f"{file_count:,}")
+            item.setText(2, format_size(total_size or 0))
+            item.setData(0, Qt.ItemDataRole.UserRole, session)
+        layout.addWidget(session_tree)
+
+        def selected_paths():
+            item = session_tree.currentItem()
+            if item is None:
+                QMessageBox.warning(dialog, "Fehler", "Bitte eine Sitzung auswählen.")
+                return None
+            return self.quarantine.session_paths(item.data(0, Qt.ItemDataRole.UserRole))
+
+        def restore_session():
+            paths = selected_paths()
+            if paths:
+                self.start_deletion(
+                    paths, "Wiederherstellen", parent=dialog,
+                    on_complete=lambda summary: dialog.accept(),
+                    operation=self.quarantine.restore, result_label="Wiederhergestellt"
+                )
+
+        def purge_session():
+            paths = selected_paths()
+            if paths and QMessageBox.question(
+                dialog,
+                "Endgültig löschen",
+                f"Möchten Sie {len(paths)} Dateien endgültig löschen?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            ) == QMessageBox.StandardButton.Yes:
+                self.start_deletion(
+                    paths, "Quarantäne leeren", parent=dialog,
+                    on_complete=lambda summary: dialog.accept(),
+                    operation=self.quarantine.purge, result_label="Endgültig gelöscht"
+                )
+
+        button_layout = QHBoxLayout()
+        restore_button = QPushButton("Wiederherstellen")
+        restore_button.clicked.connect(restore_session)
+        purge_button = QPushButton("🗑️ Endgültig löschen")
+        purge_button.clicked.connect(purge_session)
+        close_button = QPushButton("Schließen")
+        close_button.clicked.connect(dialog.reject)
+        button_layout.addWidget(restore_button)
+        button_layout.addWidget(purge_button)
+        button_layout.addStretch()
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+        dialog.exec()
+
+    def purge_quarantine(self):
+        """Löscht abgelaufene Quarantäne-Dateien still im Hintergrund
+
+        Läuft als self.file_deleter, damit Leeren und Verschieben in die
+        Quarantäne nie gleichzeitig auf dasselbe Quarantine-Objekt zugreifen.
+        Läuft gerade ein Löschvorgang, wird es eine Minute später erneut versucht.
+        """
+        if self.file_deleter and self.file_deleter.isRunning():
+            QTimer.singleShot(60 * 1000, self.purge_quarantine)
+            return
+        self.quarantine.open()
+        expired = self.quarantine.expired_paths()
+        if not expired:
+            return
+        self.status_label.setText(f"Quarantäne: lösche {len(expired)} abgelaufene Dateien...")
+        self.file_deleter = FileDeleter(expired, self.quarantine.purge)
+        self.file_deleter.deletion_complete.connect(self.quarantine_purge_completed)
+        self.file_deleter.start()
+
+    def quarantine_purge_completed(self, summary):
+        self.quarantine.finish()
+        self.wait_for_worker(self.file_deleter)
+        self.file_deleter = None
+        self.status_label.setText(f"Quarantäne: {summary['deleted']} abgelaufene Dateien endgültig gelöscht")
 
     def update_status(self, message):
         # Kürze lange Pfade in der Statusmeldung
@@ -820,7 +1091,7 @@ class DriveCleanerApp(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.file_tree.clear()
+            self.file_model.clear()
             self.drive_input.clear()
             self.years_input.clear()
             self.file_type_combo.setCurrentIndex(0)
@@ -833,7 +1104,7 @@ class DriveCleanerApp(QMainWindow):
             self.scanner = None
 
     def save_results(self):
-        if self.file_tree.topLevelItemCount() == 0:
+        if self.file_model.rowCount() == 0:
             QMessageBox.warning(self, "Fehler", "Keine Scan-Ergebnisse zum Speichern vorhanden.")
             return
 
@@ -854,14 +1125,15 @@ class DriveCleanerApp(QMainWindow):
                     "files": []
                 }
 
-                for i in range(self.file_tree.topLevelItemCount()):
-                    item = self.file_tree.topLevelItem(i)
+                for path, size, mtime, file_type, owner in self.file_model.rows():
                     data["files"].append({
-                        "path": item.text(0),
-                        "size": item.text(1),
-                        "date": item.text(2),
-                        "type": item.text(3),
-                        "owner": item.text(4)
+                        "path": path,
+                        "size": format_size(size),
+                        "date": datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S"),
+                        "type": file_type,
+                        "owner": owner,
+                        "size_bytes": size,
+                        "mtime": mtime
                     })
 
                 with open(file_path, 'w', encoding='utf-8') as f:
@@ -884,7 +1156,8 @@ class DriveCleanerApp(QMainWindow):
                 with open(file_path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
 
-                self.file_tree.clear()
+                self.use_memory_model()
+                self.file_model.clear()
                 self.drive_input.setText(data.get("drive_path", ""))
                 self.years_input.setText(data.get("years", ""))
                 
@@ -893,100 +1166,388 @@ class DriveCleanerApp(QMainWindow):
                 if index >= 0:
                     self.file_type_combo.setCurrentIndex(index)
 
+                rows = []
                 for file_info in data["files"]:
-                    item = QTreeWidgetItem(self.file_tree)
-                    item.setText(0, file_info["path"])
-                    item.setText(1, file_info["size"])
-                    item.setText(2, file_info["date"])
-                    item.setText(3, file_info["type"])
-                    item.setText(4, file_info["owner"])
+                    # Ältere Dateien enthalten nur die Anzeige-Strings
+                    size = file_info.get("size_bytes")
+                    if size is None:
+                        size = int(parse_size(file_info["size"]))
+                    mtime = file_info.get("mtime")
+                    if mtime is None:
+                        mtime = datetime.strptime(file_info["date"], "%Y-%m-%d %H:%M:%S").timestamp()
+                    rows.append((file_info["path"], size, mtime, file_info["type"], file_info["owner"]))
+                self.file_model.add_rows(rows)
 
                 self.status_label.setText(f"Ergebnisse vom {data.get('scan_date', 'unbekannt')} geladen")
             except Exception as e:
                 QMessageBox.critical(self, "Fehler", f"Fehler beim Laden: {str(e)}")
 
     def visualize_data(self):
-        if self.file_tree.topLevelItemCount() == 0:
+        if self.file_model.rowCount() == 0:
             QMessageBox.warning(self, "Fehler", "Keine Daten zur Visualisierung vorhanden.")
             return
 
-        visualization = Visualization(self.file_tree, format_size, parse_size)
+        visualization = Visualization(self.file_model, format_size)
         if not visualization.visualize_data():
             QMessageBox.warning(self, "Fehler", "Keine Daten zur Visualisierung vorhanden.")
 
     def find_duplicates(self):
-        if self.file_tree.topLevelItemCount() == 0:
+        if self.file_model.rowCount() == 0:
             QMessageBox.warning(self, "Fehler", "Keine Dateien zum Analysieren vorhanden.")
             return
+        if self.duplicate_finder and self.duplicate_finder.isRunning():
+            QMessageBox.warning(self, "Fehler", "Es läuft bereits eine Duplikatsuche.")
+            return
 
         self.status_label.setText("Suche nach Duplikaten...")
         
-        # Erstelle Fortschrittsdialog
-        progress_dialog = QProgressDialog(
+        # Erstelle Fortschrittsdialog (nicht blockierend, das Hashing läuft im Hintergrund)
+        self.duplicate_progress = QProgressDialog(
             "Suche nach Duplikaten...", 
             "Abbrechen", 
             0, 
-            self.file_tree.topLevelItemCount(), 
+            self.file_model.rowCount(), 
             self
         )
-        progress_dialog.setWindowTitle("Duplikatsuche")
-        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
-        
-        size_dict = defaultdict(list)
-        hash_dict = defaultdict(list)
-        
-        # Erst nach Größe gruppieren
-        for i in range(self.file_tree.topLevelItemCount()):
-            if progress_dialog.wasCanceled():
-                self.status_label.setText("Duplikatsuche abgebrochen")
-                return
-                
-            item = self.file_tree.topLevelItem(i)
-            filepath = item.text(0)
-            try:
-                size = os.path.getsize(filepath)
-                size_dict[size].append(filepath)
-            except Exception:
-                continue
-                
-            progress_dialog.setValue(i + 1)
-            QApplication.processEvents()  # Verhindert, dass die GUI einfriert
-
-        # Dann nach Hash für Dateien gleicher Größe
-        current_progress = 0
-        total_files = sum(len(files) for files in size_dict.values() if len(files) > 1)
-        progress_dialog.setMaximum(total_files)
-        progress_dialog.setValue(0)
-        
-        for size, filepaths in size_dict.items():
-            if len(filepaths) > 1:  # Nur Dateien mit gleicher Größe prüfen
-                for filepath in filepaths:
-                    if progress_dialog.wasCanceled():
-                        self.status_label.setText("Duplikatsuche abgebrochen")
-                        return
-                        
-                    try:
-                        # Schnelle Hash-Berechnung für große Dateien
-                        file_hash = calculate_file_hash(filepath, quick_mode=True)
-                        if file_hash:
-                            hash_dict[file_hash].append(filepath)
-                    except Exception:
-                        continue
-                        
-                    current_progress += 1
-                    progress_dialog.setValue(current_progress)
-                    QApplication.processEvents()
-
-        progress_dialog.close()
+        self.duplicate_progress.setWindowTitle("Duplikatsuche")
+        self.duplicate_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.duplicate_progress.setAutoClose(False)
+        self.duplicate_progress.setAutoReset(False)
+        
+        # Größe -> Anfang/Ende -> vollständiger Hash (siehe duplicates.py)
+        size_dict = self.file_model.duplicate_size_candidates()
+        self.duplicate_finder = DuplicateFinder(size_dict, hash_cache=self.open_hash_cache())
+        self.duplicate_finder.progress_update.connect(self.update_duplicate_progress)
+        self.duplicate_finder.search_complete.connect(self.duplicate_search_completed)
+        self.duplicate_finder.search_cancelled.connect(self.duplicate_search_cancelled)
+        self.duplicate_progress.canceled.connect(self.duplicate_finder.cancel)
+        self.duplicate_finder.start()
+        self.duplicate_progress.show()
+
+    def open_hash_cache(self):
+        """Öffnet den Hash-Cache; ist er gesperrt oder beschädigt, wird ohne Cache gesucht"""
+        try:
+            self.hash_cache.open()
+            return self.hash_cache
+        except Exception as e:
+            self.status_label.setText(f"Hash-Cache nicht verfügbar: {str(e)}")
+            return None
+
+    def update_duplicate_progress(self, stage, done, total):
+        if self.duplicate_progress is None:
+            return
+        self.duplicate_progress.setLabelText(stage)
+        self.duplicate_progress.setMaximum(total)
+        self.duplicate_progress.setValue(done)
+
+    def wait_for_worker(self, worker):
+        """Wartet, bis run() eines Hintergrund-Threads wirklich zurückgekehrt ist
+
+        Das letzte Signal eines Workers wird noch aus run() gesendet. Fällt
+        danach sofort die letzte Referenz, kann Qt den Thread zerstören,
+        solange er noch läuft ("QThread: Destroyed while thread is still
+        running"). Vor dem Freigeben daher immer hierüber warten.
+        """
+        if worker is not None:
+            worker.wait()
+
+    def close_duplicate_progress(self):
+        if self.duplicate_progress is not None:
+            self.duplicate_progress.close()
+            self.duplicate_progress = None
+        self.wait_for_worker(self.duplicate_finder)
+        self.duplicate_finder = None
+
+    def duplicate_search_cancelled(self):
+        self.close_duplicate_progress()
+        self.status_label.setText("Duplikatsuche abgebrochen")
+
+    def duplicate_search_completed(self, duplicates, stats):
+        self.close_duplicate_progress()
 
         # Zeige Duplikate an
-        duplicates = {k: v for k, v in hash_dict.items() if len(v) > 1}
         if duplicates:
             self.show_duplicates_dialog(duplicates)
         else:
             QMessageBox.information(self, "Ergebnis", "Keine Duplikate gefunden.")
         
-        self.status_label.setText("Duplikatsuche abgeschlossen")
+        self.status_label.setText(
+            f"Duplikatsuche abgeschlossen ({stats['candidates']:,} Kandidaten, "
+            f"{stats['hardlinks']:,} Hardlinks übersprungen, "
+            f"{stats['fully_hashed']:,} vollständig gehasht, {stats['cache_hits']:,} aus dem Cache, "
+            f"{format_size(stats['bytes_read'])} gelesen)"
+        )
+
+    def show_snapshot_duplicates_dialog(self):
+        """Lässt gespeicherte Scans auswählen und sucht Duplikate über alle hinweg"""
+        if self.duplicate_finder and self.duplicate_finder.isRunning():
+            QMessageBox.warning(self, "Fehler", "Es läuft bereits eine Duplikatsuche.")
+            return
+        try:
+            self.cache.open()
+            snapshots = self.cache.list_snapshots()
+        except Exception as e:
+            QMessageBox.warning(self, "Fehler", f"Scan-Speicher nicht verfügbar: {str(e)}")
+            return
+        if len(snapshots) < 2:
+            QMessageBox.information(self, "Scans vergleichen", "Es sind weniger als zwei gespeicherte Scans vorhanden.")
+            return
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Scans vergleichen")
+        dialog.setMinimumSize(700, 400)
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel(
+            "Scans auswählen, die verglichen werden sollen.\n"
+            "Bei Duplikaten gilt die Datei aus dem obersten ausgewählten Scan als Original."
+        ))
+
+        snapshot_tree = QTreeWidget()
+        snapshot_tree.setHeaderLabels(["Laufwerk", "Datum", "Dateien"])
+        snapshot_tree.setColumnWidth(0, 350)
+        snapshot_tree.setRootIsDecorated(False)
+        for snapshot_id, drive_path, created, file_count in snapshots:
+            item = QTreeWidgetItem(snapshot_tree)
+            item.setText(0, drive_path)
+            item.setText(1, datetime.fromtimestamp(created).strftime("%Y-%m-%d %H:%M:%S"))
+            item.setText(2, f"{file_count:,}")
+            item.setData(0, Qt.ItemDataRole.UserRole, snapshot_id)
+            item.setCheckState(0, Qt.CheckState.Unchecked)
+        layout.addWidget(snapshot_tree)
+
+        button_layout = QHBoxLayout()
+        compare_button = QPushButton("Vergleichen")
+        cancel_button = QPushButton("Abbrechen")
+        compare_button.clicked.connect(dialog.accept)
+        cancel_button.clicked.connect(dialog.reject)
+        button_layout.addStretch()
+        button_layout.addWidget(compare_button)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        snapshot_ids = [
+            snapshot_tree.topLevelItem(i).data(0, Qt.ItemDataRole.UserRole)
+            for i in range(snapshot_tree.topLevelItemCount())
+            if snapshot_tree.topLevelItem(i).checkState(0) == Qt.CheckState.Checked
+        ]
+        if len(snapshot_ids) < 2:
+            QMessageBox.warning(self, "Fehler", "Bitte mindestens zwei Scans auswählen.")
+            return
+        self.find_snapshot_duplicates(snapshot_ids)
+
+    def find_snapshot_duplicates(self, snapshot_ids):
+        self.status_label.setText("Suche nach Duplikaten über mehrere Scans...")
+
+        self.duplicate_progress = QProgressDialog(
+            "Vergleiche gespeicherte Scans...",
+            "Abbrechen",
+            0,
+            0,
+            self
+        )
+        self.duplicate_progress.setWindowTitle("Scans vergleichen")
+        self.duplicate_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.duplicate_progress.setAutoClose(False)
+        self.duplicate_progress.setAutoReset(False)
+
+        self.duplicate_finder = SnapshotDuplicateFinder(self.cache, snapshot_ids, hash_cache=self.open_hash_cache())
+        self.duplicate_finder.progress_update.connect(self.update_duplicate_progress)
+        self.duplicate_finder.search_complete.connect(self.snapshot_duplicate_search_completed)
+        self.duplicate_finder.search_cancelled.connect(self.duplicate_search_cancelled)
+        self.duplicate_progress.canceled.connect(self.duplicate_finder.cancel)
+        self.duplicate_finder.start()
+        self.duplicate_progress.show()
+
+    def snapshot_duplicate_search_completed(self, duplicates, stats):
+        self.close_duplicate_progress()
+
+        if duplicates:
+            self.show_duplicates_dialog(duplicates)
+        else:
+            QMessageBox.information(self, "Ergebnis", "Keine Duplikate zwischen den Scans gefunden.")
+
+        self.status_label.setText(
+            f"Vergleich abgeschlossen ({stats['candidates']:,} Kandidaten, "
+            f"{stats['stored_digests']:,} Hashes aus gespeicherten Scans, "
+            f"{stats['fully_hashed']:,} neu berechnet, {stats['unavailable']:,} nicht erreichbar, "
+            f"{format_size(stats['bytes_read'])} gelesen)"
+        )
+
+    def find_duplicate_directories(self):
+        if self.file_model.rowCount() == 0:
+            QMessageBox.warning(self, "Fehler", "Keine Dateien zum Analysieren vorhanden.")
+            return
+        if self.directory_finder and self.directory_finder.isRunning():
+            QMessageBox.warning(self, "Fehler", "Es läuft bereits eine Suche nach doppelten Ordnern.")
+            return
+
+        self.status_label.setText("Suche nach doppelten Ordnern...")
+
+        self.duplicate_progress = QProgressDialog(
+            "Vergleiche Ordnerstrukturen...",
+            "Abbrechen",
+            0,
+            0,
+            self
+        )
+        self.duplicate_progress.setWindowTitle("Doppelte Ordner")
+        self.duplicate_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.duplicate_progress.setAutoClose(False)
+        self.duplicate_progress.setAutoReset(False)
+
+        files = [(filepath, size) for filepath, size, mtime, file_type, owner in self.file_model.rows()]
+        self.directory_finder = DuplicateDirectoryFinder(files, hash_cache=self.open_hash_cache())
+        self.directory_finder.progress_update.connect(self.update_duplicate_progress)
+        self.directory_finder.search_complete.connect(self.duplicate_directory_search_completed)
+        self.directory_finder.search_cancelled.connect(self.duplicate_directory_search_cancelled)
+        self.duplicate_progress.canceled.connect(self.directory_finder.cancel)
+        self.directory_finder.start()
+        self.duplicate_progress.show()
+
+    def duplicate_directory_search_cancelled(self):
+        self.close_duplicate_progress()
+        self.wait_for_worker(self.directory_finder)
+        self.directory_finder = None
+        self.status_label.setText("Suche nach doppelten Ordnern abgebrochen")
+
+    def duplicate_directory_search_completed(self, groups, stats):
+        self.close_duplicate_progress()
+        self.wait_for_worker(self.directory_finder)
+        self.directory_finder = None
+
+        if groups:
+            self.show_duplicate_directories_dialog(groups)
+        else:
+            QMessageBox.information(self, "Ergebnis", "Keine doppelten Ordner gefunden.")
+
+        self.status_label.setText(
+            f"Suche nach doppelten Ordnern abgeschlossen ({stats['directories']:,} Ordner, "
+            f"{stats['candidate_directories']:,} mit passender Struktur, "
+            f"{format_size(stats.get('bytes_read', 0))} gelesen)"
+        )
+
+    def show_duplicate_directories_dialog(self, groups):
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Doppelte Ordner")
+        dialog.setMinimumSize(1000, 700)
+
+        layout = QVBoxLayout(dialog)
+        tree = QTreeWidget()
+        tree.setHeaderLabels(["Ordner", "Größe", "Dateien"])
+        tree.setColumnWidth(0, 700)
+
+        # Größte einsparbare Menge zuerst
+        sorted_groups = sorted(groups.values(), key=lambda group: group["size"] * (len(group["paths"]) - 1), reverse=True)
+        for number, group in enumerate(sorted_groups, 1):
+            group_item = QTreeWidgetItem(tree)
+            group_item.setText(
+                0,
+                f"Gruppe {number} ({len(group['paths'])} Ordner, "
+                f"{format_size(group['size'] * (len(group['paths']) - 1))} freigebbar)"
+            )
+            for directory in group["paths"]:
+                item = QTreeWidgetItem(group_item)
+                item.setText(0, directory)
+                item.setText(1, format_size(group["size"]))
+                item.setText(2, str(group["files"]))
+
+        def open_directory(item, column):
+            if item.parent() is not None:
+                # open_file_location öffnet das Verzeichnis des Pfads, daher mit Trenner am Ende
+                self.open_file_location(os.path.join(item.text(0), ""))
+
+        tree.itemDoubleClicked.connect(open_directory)
+        layout.addWidget(tree)
+        dialog.exec()
+
+    def find_similar_images(self):
+        if self.file_model.rowCount() == 0:
+            QMessageBox.warning(self, "Fehler", "Keine Dateien zum Analysieren vorhanden.")
+            return
+        if self.image_finder and self.image_finder.isRunning():
+            QMessageBox.warning(self, "Fehler", "Es läuft bereits eine Bildersuche.")
+            return
+
+        image_extensions = set(get_file_categories()["Bilder"])
+        image_paths = [
+            filepath for filepath in self.file_model.paths()
+            if Path(filepath).suffix.lower() in image_extensions
+        ]
+        if len(image_paths) < 2:
+            QMessageBox.information(self, "Ergebnis", "Nicht genügend Bilder zum Vergleichen vorhanden.")
+            return
+
+        self.status_label.setText("Suche nach ähnlichen Bildern...")
+
+        self.duplicate_progress = QProgressDialog(
+            "Berechne Bildhashes...",
+            "Abbrechen",
+            0,
+            len(image_paths),
+            self
+        )
+        self.duplicate_progress.setWindowTitle("Ähnliche Bilder")
+        self.duplicate_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.duplicate_progress.setAutoClose(False)
+        self.duplicate_progress.setAutoReset(False)
+
+        self.image_finder = SimilarImageFinder(image_paths)
+        self.image_finder.progress_update.connect(self.update_duplicate_progress)
+        self.image_finder.search_complete.connect(self.similar_image_search_completed)
+        self.image_finder.search_cancelled.connect(self.similar_image_search_cancelled)
+        self.duplicate_progress.canceled.connect(self.image_finder.cancel)
+        self.image_finder.start()
+        self.duplicate_progress.show()
+
+    def similar_image_search_cancelled(self):
+        self.close_duplicate_progress()
+        self.wait_for_worker(self.image_finder)
+        self.image_finder = None
+        self.status_label.setText("Bildersuche abgebrochen")
+
+    def similar_image_search_completed(self, groups, stats):
+        self.close_duplicate_progress()
+        self.wait_for_worker(self.image_finder)
+        self.image_finder = None
+
+        if groups:
+            self.show_similar_images_dialog(groups)
+        else:
+            QMessageBox.information(self, "Ergebnis", "Keine ähnlichen Bilder gefunden.")
+
+        self.status_label.setText(
+            f"Bildersuche abgeschlossen ({stats['hashed']:,} von {stats['images']:,} Bildern gelesen, "
+            f"{stats['similar']:,} ähnliche Bilder in {stats['groups']:,} Gruppen)"
+        )
+
+    def show_similar_images_dialog(self, groups):
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Ähnliche Bilder")
+        dialog.setMinimumSize(1000, 700)
+
+        layout = QVBoxLayout(dialog)
+        tree = QTreeWidget()
+        tree.setHeaderLabels(["Dateipfad", "Abstand"])
+        tree.setColumnWidth(0, 800)
+
+        for number, images in enumerate(groups.values(), 1):
+            group_item = QTreeWidgetItem(tree)
+            group_item.setText(0, f"Gruppe {number} ({len(images)} Bilder)")
+            for filepath, distance in images:
+                item = QTreeWidgetItem(group_item)
+                item.setText(0, filepath)
+                item.setText(1, str(distance))
+
+        def open_image_location(item, column):
+            # Nur Bildzeilen, nicht die Gruppenüberschriften
+            if item.parent() is not None:
+                self.open_file_location(item.text(0))
+
+        tree.itemDoubleClicked.connect(open_image_location)
+        layout.addWidget(tree)
+        dialog.exec()
 
     def show_duplicates_dialog(self, duplicates):
         dialog = QDialog(self)
@@ -1007,16 +1568,35 @@ class DriveCleanerApp(QMainWindow):
         quick_delete_layout = QHBoxLayout(quick_delete_frame)
         
         total_duplicates = sum(len(files) - 1 for files in duplicates.values())
-        quick_delete_button = QPushButton(f"🗑️ Alle Duplikate löschen ({total_duplicates} Dateien)")
-        quick_delete_button.clicked.connect(lambda: self.quick_delete_duplicates(duplicates, dialog))
+        # Tatsächlich frei werdender Platz (Hardlinks geben beim Löschen nichts frei)
+        reclaimable = {hash_value: reclaimable_bytes(filepaths) for hash_value, filepaths in duplicates.items()}
+        total_reclaimable = sum(reclaimable.values())
+        quick_delete_button = QPushButton(
+            f"🗑️ Alle Duplikate löschen ({total_duplicates} Dateien, {format_size(total_reclaimable)} frei)"
+        )
+        verify_checkbox = QCheckBox("Vorher byteweise prüfen")
+        verify_checkbox.setChecked(True)
+        verify_checkbox.setToolTip("Löscht nur Dateien, deren Inhalt Byte für Byte übereinstimmt")
+        quick_delete_button.clicked.connect(
+            lambda: self.quick_delete_duplicates(duplicates, dialog, verify_checkbox.isChecked())
+        )
+        link_button = QPushButton("🔗 Durch Links ersetzen")
+        link_button.setToolTip(
+            "Ersetzt jedes Duplikat durch einen Reflink bzw. Hardlink auf die behaltene Kopie.\n"
+            "Der Platz wird frei, alle Pfade bleiben erhalten. Es wird immer byteweise geprüft.\n"
+            "Reflinks gibt es nur unter Linux (z.B. Btrfs, XFS) und macOS (APFS), unter Windows immer Hardlinks."
+        )
+        link_button.clicked.connect(lambda: self.link_duplicates(duplicates, dialog))
         quick_delete_layout.addWidget(quick_delete_button)
+        quick_delete_layout.addWidget(verify_checkbox)
+        quick_delete_layout.addWidget(link_button)
         quick_delete_layout.addStretch()
         
         overview_layout.addWidget(quick_delete_frame)
         
         # Übersichtstabelle
         overview_tree = QTreeWidget()
-        overview_tree.setHeaderLabels(["Duplikatgruppe", "Anzahl", "Gesamtgröße"])
+        overview_tree.setHeaderLabels(["Duplikatgruppe", "Anzahl", "Gesamtgröße", "Freigebbar"])
         overview_tree.setColumnWidth(0, 400)
         
         total_size = 0
@@ -1035,6 +1615,7 @@ class DriveCleanerApp(QMainWindow):
                     pass
             
             group_item.setText(2, format_size(group_size))
+            group_item.setText(3, format_size(reclaimable[hash_value]))
             total_size += group_size
         
         # Füge Gesamtsumme hinzu
@@ -1042,9 +1623,11 @@ class DriveCleanerApp(QMainWindow):
         total_item.setText(0, "Gesamt")
         total_item.setText(1, str(sum(len(files) for files in duplicates.values())))
         total_item.setText(2, format_size(total_size))
+        total_item.setText(3, format_size(total_reclaimable))
         total_item.setBackground(0, QColor("#f0f0f0"))
         total_item.setBackground(1, QColor("#f0f0f0"))
         total_item.setBackground(2, QColor("#f0f0f0"))
+        total_item.setBackground(3, QColor("#f0f0f0"))
         
         overview_layout.addWidget(overview_tree)
         tab_widget.addTab(overview_tab, "Übersicht")
@@ -1079,7 +1662,9 @@ class DriveCleanerApp(QMainWindow):
                     delete_button.setIcon(QIcon.fromTheme("edit-delete", QIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_TrashIcon))))
                     delete_button.setToolTip("Datei löschen")
                     delete_button.setFixedSize(30, 30)
-                    delete_button.clicked.connect(lambda checked, path=filepath: self.delete_duplicate(path, item))
+                    delete_button.clicked.connect(
+                        lambda checked, path=filepath, item=item: self.delete_duplicate(path, item)
+                    )
                     
                     open_button = QPushButton()
                     open_button.setIcon(QIcon.fromTheme("folder", QIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_DirOpenIcon))))
@@ -1111,12 +1696,11 @@ class DriveCleanerApp(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            try:
-                os.remove(filepath)
-                item.parent().removeChild(item)
-                self.status_label.setText(f"Datei gelöscht: {filepath}")
-            except Exception as e:
-                QMessageBox.warning(self, "Fehler", f"Fehler beim Löschen: {str(e)}")
+            def remove_item(summary):
+                if summary["deleted"] and item.parent() is not None:
+                    item.parent().removeChild(item)
+
+            self.start_deletion([filepath], "Lösche Datei", parent=item.treeWidget().window(), on_complete=remove_item)
 
     def open_file_location(self, filepath):
         try:
@@ -1124,62 +1708,128 @@ class DriveCleanerApp(QMainWindow):
         except Exception as e:
             QMessageBox.warning(self, "Fehler", f"Fehler beim Öffnen des Ordners: {str(e)}")
 
-    def quick_delete_duplicates(self, duplicates, dialog):
-        """Löscht schnell alle Duplikate und behält jeweils eine Kopie"""
+    def quick_delete_duplicates(self, duplicates, dialog, verify=True):
+        """Löscht schnell alle Duplikate und behält jeweils eine Kopie
+
+        Mit verify werden die Gruppen vorher byteweise verglichen, und gelöscht
+        wird nur, was dabei bestätigt wurde.
+        """
         total_duplicates = sum(len(files) - 1 for files in duplicates.values())
         
         reply = QMessageBox.question(
             self,
             "Duplikate löschen",
             f"Möchten Sie alle {total_duplicates} Duplikate löschen?\n"
-            "Es wird jeweils eine Kopie pro Duplikatgruppe behalten.",
+            "Es wird jeweils eine Kopie pro Duplikatgruppe behalten."
+            + ("\nVorher werden alle Dateien byteweise verglichen." if verify else ""),
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        if not verify:
+            self.delete_duplicate_groups(duplicates, dialog)
+            return
+        self.verify_duplicates(duplicates, dialog, self.delete_duplicate_groups)
+
+    def link_duplicates(self, duplicates, dialog):
+        """Ersetzt alle Duplikate durch Links auf die jeweils behaltene Kopie
+
+        Da der Inhalt der Pfade danach von der behaltenen Kopie kommt, wird
+        immer vorher byteweise verglichen.
+        """
+        total_duplicates = sum(len(files) - 1 for files in duplicates.values())
+        reply = QMessageBox.question(
+            self,
+            "Duplikate verknüpfen",
+            f"Möchten Sie alle {total_duplicates} Duplikate durch Links ersetzen?\n"
+            "Unter Linux (z.B. Btrfs, XFS) und macOS (APFS) werden Reflinks verwendet, wo das "
+            "Dateisystem es unterstützt. Sonst, und unter Windows immer, entstehen Hardlinks: "
+            "Die Pfade teilen sich dann Inhalt, Rechte und Zeitstempel, eine Änderung an einer "
+            "Datei betrifft alle.\n"
+            "Vorher werden alle Dateien byteweise verglichen.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
         if reply == QMessageBox.StandardButton.Yes:
-            progress_dialog = QProgressDialog(
-                "Lösche Duplikate...", 
-                "Abbrechen", 
-                0, 
-                total_duplicates, 
-                self
+            # Stand der Dateien bei der Prüfung, seitdem geänderte werden nicht verknüpft
+            signatures = {}
+            self.verify_duplicates(
+                duplicates, dialog, partial(self.link_duplicate_groups, signatures=signatures), signatures
             )
-            progress_dialog.setWindowTitle("Lösche Duplikate")
-            progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
-            
-            deleted_count = 0
-            failed_count = 0
-            current_progress = 0
-            
-            for filepaths in duplicates.values():
-                if progress_dialog.wasCanceled():
-                    break
-                    
-                # Behalte die erste Datei und lösche den Rest
-                for filepath in filepaths[1:]:
-                    try:
-                        os.remove(filepath)
-                        deleted_count += 1
-                    except Exception:
-                        failed_count += 1
-                    
-                    current_progress += 1
-                    progress_dialog.setValue(current_progress)
-            
-            progress_dialog.close()
-            
+
+    def verify_duplicates(self, duplicates, dialog, on_verified, signatures=None):
+        """Vergleicht die Gruppen im Hintergrund und übergibt die bestätigten an on_verified"""
+        self.duplicate_progress = QProgressDialog(
+            "Vergleiche Duplikate byteweise...",
+            "Abbrechen",
+            0,
+            len(duplicates),
+            dialog
+        )
+        self.duplicate_progress.setWindowTitle("Duplikate prüfen")
+        self.duplicate_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self.duplicate_progress.setAutoClose(False)
+        self.duplicate_progress.setAutoReset(False)
+
+        self.duplicate_verifier = DuplicateVerifier(duplicates, signatures=signatures)
+        self.duplicate_verifier.progress_update.connect(self.update_duplicate_progress)
+        self.duplicate_verifier.verification_complete.connect(
+            lambda verified, stats: self.duplicate_verification_completed(verified, stats, dialog, on_verified)
+        )
+        self.duplicate_verifier.verification_cancelled.connect(self.duplicate_verification_cancelled)
+        self.duplicate_progress.canceled.connect(self.duplicate_verifier.cancel)
+        self.duplicate_verifier.start()
+        self.duplicate_progress.show()
+
+    def duplicate_verification_cancelled(self):
+        self.close_duplicate_progress()
+        self.wait_for_worker(self.duplicate_verifier)
+        self.duplicate_verifier = None
+        self.status_label.setText("Prüfung abgebrochen, es wurde nichts verändert")
+
+    def duplicate_verification_completed(self, verified, stats, dialog, on_verified):
+        self.close_duplicate_progress()
+        self.wait_for_worker(self.duplicate_verifier)
+        self.duplicate_verifier = None
+        if stats["rejected"]:
             QMessageBox.information(
                 self,
-                "Löschvorgang abgeschlossen",
-                f"Erfolgreich gelöscht: {deleted_count} Duplikate\n"
-                f"Fehlgeschlagen: {failed_count} Duplikate\n\n"
-                "Die ursprünglichen Dateien wurden behalten."
+                "Prüfung abgeschlossen",
+                f"{stats['rejected']} Dateien weichen im Inhalt ab und werden übersprungen."
             )
-            
-            dialog.accept()
+        if verified:
+            on_verified(verified, dialog)
+        else:
+            QMessageBox.information(self, "Ergebnis", "Keine bestätigten Duplikate gefunden.")
+
+    def delete_duplicate_groups(self, duplicates, dialog):
+        """Löscht in jeder Gruppe alle Dateien außer der ersten"""
+        # Behalte die erste Datei und lösche den Rest
+        paths = [filepath for filepaths in duplicates.values() for filepath in filepaths[1:]]
+        self.start_deletion(
+            paths,
+            "Lösche Duplikate",
+            parent=dialog,
+            on_complete=lambda summary: dialog.accept(),
+            note="Die ursprünglichen Dateien wurden behalten."
+        )
+
+    def link_duplicate_groups(self, duplicates, dialog, signatures=None):
+        """Ersetzt je Gruppe und Laufwerk alle Dateien außer der ersten durch Links"""
+        targets = link_targets(duplicates)
+        self.start_deletion(
+            list(targets),
+            "Ersetze Duplikate durch Links",
+            parent=dialog,
+            on_complete=lambda summary: dialog.accept(),
+            operation=lambda path: replace_with_link(path, targets[path], signatures=signatures),
+            result_label="Durch Links ersetzt",
+            note="Alle Pfade bleiben erhalten, der Inhalt liegt nur noch einmal auf dem Laufwerk."
+        )
 
     def find_unused_files(self):
-        if self.file_tree.topLevelItemCount() == 0:
+        if self.file_model.rowCount() == 0:
             QMessageBox.warning(self, "Fehler", "Keine Dateien zum Analysieren vorhanden.")
             return
 
@@ -1187,9 +1837,7 @@ class DriveCleanerApp(QMainWindow):
         unused_files = []
         cutoff_date = datetime.now() - timedelta(days=180)  # 6 Monate
 
-        for i in range(self.file_tree.topLevelItemCount()):
-            item = self.file_tree.topLevelItem(i)
-            filepath = item.text(0)
+        for filepath in self.file_model.paths():
             try:
                 stats = os.stat(filepath)
                 last_access = datetime.fromtimestamp(stats.st_atime)
@@ -1228,7 +1876,7 @@ class DriveCleanerApp(QMainWindow):
         dialog.exec()
 
     def show_categories(self):
-        if self.file_tree.topLevelItemCount() == 0:
+        if self.file_model.rowCount() == 0:
             QMessageBox.warning(self, "Fehler", "Keine Dateien zum Kategorisieren vorhanden.")
             return
 
@@ -1237,10 +1885,7 @@ class DriveCleanerApp(QMainWindow):
         categories = get_file_categories()
         category_stats = defaultdict(lambda: {"count": 0, "size": 0, "files": []})
         
-        for i in range(self.file_tree.topLevelItemCount()):
-            item = self.file_tree.topLevelItem(i)
-            filepath = item.text(0)
-            size = parse_size(item.text(1))
+        for filepath, size, mtime, file_type, owner in self.file_model.rows():
             ext = Path(filepath).suffix.lower()
             
             found_category = "Sonstige"
@@ -1254,7 +1899,7 @@ class DriveCleanerApp(QMainWindow):
             category_stats[found_category]["files"].append({
                 "path": filepath,
                 "size": size,
-                "date": item.text(2)
+                "date": datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
             })
 
         self.show_categories_dialog(category_stats)
@@ -1332,44 +1977,11 @@ class DriveCleanerApp(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            deleted_count = 0
-            failed_count = 0
-            total_count = len(files)
-            
-            progress_dialog = QProgressDialog(
-                "Lösche Dateien...", 
-                "Abbrechen", 
-                0, 
-                total_count, 
-                self
-            )
-            progress_dialog.setWindowTitle("Lösche Kategorie")
-            progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
-            
-            for i, file_info in enumerate(files):
-                if progress_dialog.wasCanceled():
-                    break
-                    
-                try:
-                    os.remove(file_info["path"])
-                    deleted_count += 1
-                except Exception:
-                    failed_count += 1
-                    
-                progress_dialog.setValue(i + 1)
-            
-            progress_dialog.close()
-            
-            QMessageBox.information(
-                self,
-                "Löschvorgang abgeschlossen",
-                f"Erfolgreich gelöscht: {deleted_count} Dateien\n"
-                f"Fehlgeschlagen: {failed_count} Dateien"
-            )
+            self.start_deletion([file_info["path"] for file_info in files], "Lösche Kategorie")
 
-    def copy_path_to_clipboard(self, item, column):
+    def copy_path_to_clipboard(self, index):
         """Kopiert den Dateipfad in die Zwischenablage"""
-        path = item.text(0)  # Erste Spalte enthält den Pfad
+        path = self.file_model.path(index.row())
         QApplication.clipboard().setText(path)
         self.status_label.setText(f"Pfad in Zwischenablage kopiert: {path[:50]}...")
 
@@ -1383,7 +1995,7 @@ class DriveCleanerApp(QMainWindow):
 
     def export_to_excel(self):
         """Exportiert die Ergebnisse in eine Excel-Datei"""
-        if self.file_tree.topLevelItemCount() == 0:
+        if self.file_model.rowCount() == 0:
             QMessageBox.warning(self, "Fehler", "Keine Daten zum Exportieren vorhanden.")
             return
 
@@ -1417,22 +2029,15 @@ class DriveCleanerApp(QMainWindow):
             # Sammle die Daten
             data = []
             total_size_bytes = 0
-            for i in range(self.file_tree.topLevelItemCount()):
-                item = self.file_tree.topLevelItem(i)
-                # Konvertiere die Größenangabe in Bytes
-                size_str = item.text(1)
-                try:
-                    size_bytes = self.parse_size_to_bytes(size_str)
-                except:
-                    size_bytes = 0
+            for path, size_bytes, mtime, file_type, owner in self.file_model.rows():
                 total_size_bytes += size_bytes
                 
                 data.append({
-                    'Dateipfad': item.text(0),
-                    'Größe': size_str,
-                    'Datum': item.text(2),
-                    'Typ': item.text(3),
-                    'Ersteller': item.text(4)
+                    'Dateipfad': path,
+                    'Größe': format_size(size_bytes),
+                    'Datum': datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S"),
+                    'Typ': file_type,
+                    'Ersteller': owner
                 })
 
             # Erstelle DataFrame und exportiere
@@ -1519,8 +2124,8 @@ class DriveCleanerApp(QMainWindow):
         )
         layout.addWidget(info_label)
         
-        # Textfeld für Pfade
-        self.path_text = QTextEdit()
+        # Textfeld für Pfade (reiner Text, damit auch sehr lange Listen flüssig eingefügt werden)
+        self.path_text = QPlainTextEdit()
         self.path_text.setPlaceholderText("C:\\Pfad\\zur\\Datei1.txt\nC:\\Pfad\\zur\\Datei2.doc\n...")
         layout.addWidget(self.path_text)
         
@@ -1540,41 +2145,68 @@ class DriveCleanerApp(QMainWindow):
         layout.addWidget(button_frame)
         
         # Ergebnisliste
-        self.result_tree = QTreeWidget()
-        self.result_tree.setHeaderLabels(["Dateipfad", "Status"])
+        self.path_status_model = PathStatusModel(dialog)
+        self.result_tree = QTreeView()
+        self.result_tree.setModel(self.path_status_model)
+        self.result_tree.setRootIsDecorated(False)
+        self.result_tree.setUniformRowHeights(True)
         self.result_tree.setColumnWidth(0, 500)
         layout.addWidget(self.result_tree)
-        
+
+        self.validation_label = QLabel()
+        layout.addWidget(self.validation_label)
+
+        dialog.finished.connect(lambda result: self.cancel_path_validation())
         dialog.exec()
 
     def validate_paths(self, dialog):
-        """Überprüft die eingegebenen Pfade"""
-        self.result_tree.clear()
-        paths = self.path_text.toPlainText().strip().split('\n')
-        paths = [p.strip() for p in paths if p.strip()]
-        
-        for path in paths:
-            item = QTreeWidgetItem(self.result_tree)
-            item.setText(0, path)
-            
-            if os.path.exists(path):
-                if os.path.isfile(path):
-                    item.setText(1, "✅ Datei existiert")
-                    item.setBackground(1, QColor("#e8f5e9"))  # Hellgrün
-                else:
-                    item.setText(1, "❌ Ist ein Ordner")
-                    item.setBackground(1, QColor("#ffebee"))  # Hellrot
-            else:
-                item.setText(1, "❌ Datei nicht gefunden")
-                item.setBackground(1, QColor("#ffebee"))  # Hellrot
+        """Überprüft die eingegebenen Pfade im Hintergrund (siehe PathValidator)"""
+        self.cancel_path_validation()
+        self.path_status_model.clear()
+        paths = [p.strip() for p in self.path_text.toPlainText().split('\n') if p.strip()]
+        if not paths:
+            self.validation_label.setText("")
+            return
+
+        self.validation_label.setText(f"Prüfe {len(paths):,} Pfade...")
+        validator = PathValidator(paths)
+        # Verspätete Signale einer abgebrochenen Prüfung ignorieren
+        validator.paths_validated.connect(
+            lambda results: validator is self.path_validator and self.path_status_model.add_results(results)
+        )
+        validator.progress_update.connect(
+            lambda done, total: validator is self.path_validator
+            and self.validation_label.setText(f"Prüfe Pfade... {done:,} von {total:,}")
+        )
+        validator.validation_complete.connect(
+            lambda cancelled: validator is self.path_validator and self.path_validation_completed(cancelled)
+        )
+        self.path_validator = validator
+        validator.start()
+
+    def cancel_path_validation(self):
+        if self.path_validator and self.path_validator.isRunning():
+            self.path_validator.cancel()
+            self.path_validator.wait()
+        self.path_validator = None
+
+    def path_validation_completed(self, cancelled):
+        self.wait_for_worker(self.path_validator)
+        self.path_validator = None
+        model = self.path_status_model
+        self.validation_label.setText(
+            ("Prüfung abgebrochen: " if cancelled else "")
+            + f"{model.count(PATH_OK):,} Dateien gefunden, "
+            f"{model.count(PATH_IS_DIRECTORY):,} Ordner, "
+            f"{model.count(PATH_MISSING):,} nicht gefunden"
+        )
 
     def execute_mass_delete(self, dialog):
         """Führt die Massenlöschung durch"""
-        valid_items = []
-        for i in range(self.result_tree.topLevelItemCount()):
-            item = self.result_tree.topLevelItem(i)
-            if item.text(1).startswith("✅"):
-                valid_items.append(item.text(0))
+        if self.path_validator is not None:
+            QMessageBox.warning(self, "Fehler", "Die Pfadprüfung läuft noch.")
+            return
+        valid_items = self.path_status_model.valid_paths()
         
         if not valid_items:
             QMessageBox.warning(self, "Fehler", "Keine gültigen Dateien zum Löschen gefunden.")
@@ -1588,39 +2220,10 @@ class DriveCleanerApp(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            progress_dialog = QProgressDialog(
-                "Lösche Dateien...", 
-                "Abbrechen", 
-                0, 
-                len(valid_items), 
-                dialog
+            # Danach die Statusanzeige aktualisieren
+            self.start_deletion(
+                valid_items,
+                "Massenlöschung",
+                parent=dialog,
+                on_complete=lambda summary: self.validate_paths(dialog)
             )
-            progress_dialog.setWindowTitle("Massenlöschung")
-            progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
-            
-            deleted_count = 0
-            failed_count = 0
-            
-            for i, path in enumerate(valid_items):
-                if progress_dialog.wasCanceled():
-                    break
-                    
-                try:
-                    os.remove(path)
-                    deleted_count += 1
-                except Exception:
-                    failed_count += 1
-                
-                progress_dialog.setValue(i + 1)
-            
-            progress_dialog.close()
-            
-            QMessageBox.information(
-                self,
-                "Löschvorgang abgeschlossen",
-                f"Erfolgreich gelöscht: {deleted_count} Dateien\n"
-                f"Fehlgeschlagen: {failed_count} Dateien"
-            )
-            
-            # Aktualisiere die Statusanzeige
-            self.validate_paths(dialog) 
@@ -1,8 +1,16 @@
 import os
+import mmap
+import time
 import hashlib
+import threading
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import xxhash
+except ImportError:  # Optionaler schneller, nicht-kryptographischer Hash
+    xxhash = None
+
 def format_size(size):
     """Formatiert eine Dateigröße in Bytes in lesbare Form"""
     for unit in ['B', 'KB', 'MB', 'GB']:
@@ -26,32 +34,157 @@ def parse_size(size_str):
     
     return value * multipliers[unit]
 
-def calculate_file_hash(filepath, quick_mode=False):
-    """Berechnet den Hash einer Datei"""
+# Ordner für in Quarantäne verschobene Dateien (siehe quarantine.py); wird beim Scan übersprungen
+QUARANTINE_DIRECTORY = ".laufwerk_quarantaene"
+
+# Ergebnis der Pfadprüfung bei der Massenlöschung (siehe PathValidator)
+PATH_OK, PATH_IS_DIRECTORY, PATH_MISSING = range(3)
+
+# Blockgröße beim Streamen von Dateien in den Hash
+HASH_CHUNK_SIZE = 1024 * 1024  # 1MB
+# Anfang und Ende, die für den Vorab-Vergleich gehasht werden
+PROBE_SIZE = 64 * 1024  # 64KB
+# Empfohlene Schwelle, ab der per mmap statt über einen Lesepuffer gehasht wird;
+# nur als ausdrückliche Option für lokale Festplatten (siehe calculate_file_hash)
+MMAP_THRESHOLD = 256 * 1024 * 1024  # 256MB
+
+# Lesepuffer je Thread (siehe get_read_buffer)
+read_buffers = threading.local()
+
+# Verfügbare Hash-Algorithmen; alle liefern Objekte mit update() und hexdigest()
+HASH_ALGORITHMS = {
+    "md5": hashlib.md5,
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "blake2b": hashlib.blake2b,
+}
+if xxhash is not None:
+    HASH_ALGORITHMS["xxh3_128"] = xxhash.xxh3_128
+
+# Der vollständige Hash entscheidet über das Löschen und muss daher kryptographisch
+# sein (sha256 ist dank SHA-Erweiterungen der CPU meist der schnellste, siehe
+# benchmark_hash_algorithms). Für den Vorab-Vergleich genügt ein schneller Hash, da jeder Treffer
+# anschließend noch vollständig gehasht wird.
+FULL_HASH_ALGORITHM = "sha256"
+PROBE_HASH_ALGORITHM = "xxh3_128" if xxhash is not None else FULL_HASH_ALGORITHM
+
+def new_hasher(algorithm=FULL_HASH_ALGORITHM):
+    """Erzeugt ein Hash-Objekt für den angegebenen Algorithmus"""
+    try:
+        return HASH_ALGORITHMS[algorithm]()
+    except KeyError:
+        raise ValueError(f"Unbekannter Hash-Algorithmus: {algorithm}")
+
+def get_read_buffer(size):
+    """Liefert einen wiederverwendbaren Lesepuffer für den aktuellen Thread
+
+    Jeder Hash-Worker bekommt so genau einen Puffer, statt pro Lesevorgang
+    neue Byte-Strings anzulegen.
+    """
+    buffer = getattr(read_buffers, "buffer", None)
+    if buffer is None or len(buffer) < size:
+        buffer = bytearray(size)
+        read_buffers.buffer = buffer
+    return buffer
+
+def update_from_file(hasher, f, length=None, chunk_size=HASH_CHUNK_SIZE):
+    """Hasht bis zu length Bytes ab der aktuellen Position (None = bis zum Dateiende)
+
+    Gelesen wird per readinto in den Puffer des Threads; an den Hash gehen
+    memoryview-Ausschnitte, es entstehen also keine Kopien.
+    """
+    view = memoryview(get_read_buffer(chunk_size))[:chunk_size]
+    try:
+        remaining = length
+        while remaining is None or remaining > 0:
+            target = view if remaining is None or remaining >= chunk_size else view[:remaining]
+            read = f.readinto(target)
+            if not read:
+                break
+            hasher.update(view[:read])
+            if remaining is not None:
+                remaining -= read
+    finally:
+        view.release()
+
+def update_from_mmap(hasher, f, chunk_size=HASH_CHUNK_SIZE):
+    """Hasht die ganze Datei über eine Speicherabbildung, ohne sie in Python-Puffer zu kopieren"""
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            for offset in range(0, len(view), chunk_size):
+                hasher.update(view[offset:offset + chunk_size])
+        finally:
+            # Die memoryview muss vor dem Schließen der Abbildung freigegeben sein
+            view.release()
+
+def calculate_file_hash(filepath, algorithm=FULL_HASH_ALGORITHM,
+                        chunk_size=HASH_CHUNK_SIZE, mmap_threshold=None):
+    """Berechnet den Hash einer Datei
+
+    chunk_size ist die Lesegröße pro Aufruf. Standardmäßig wird per readinto
+    gelesen; Dateien ab mmap_threshold Bytes werden per mmap gehasht. Das ist
+    nur für lokale Festplatten gedacht: Ein Lesefehler in einer abgebildeten
+    Datei (Netzwerk, USB, entfernter Datenträger) beendet den Prozess mit
+    SIGBUS bzw. EXCEPTION_IN_PAGE_ERROR statt mit einer Ausnahme.
+    """
     try:
         file_size = os.path.getsize(filepath)
-        
-        # Für große Dateien (>100MB) verwenden wir einen schnelleren Algorithmus
-        if quick_mode and file_size > 100 * 1024 * 1024:  # 100MB
-            # Nur die ersten und letzten 4MB der Datei hashen
-            sample_size = 4 * 1024 * 1024  # 4MB
-            with open(filepath, 'rb') as f:
-                # Erste 4MB
-                first_part = f.read(sample_size)
-                # Letzte 4MB
-                f.seek(-sample_size, 2)
-                last_part = f.read(sample_size)
-                # Kombiniere die Teile
-                content = first_part + last_part
+        hasher = new_hasher(algorithm)
+
+        if mmap_threshold is not None and file_size >= max(mmap_threshold, 1):
+            with open(filepath, 'rb', buffering=0) as f:
+                update_from_mmap(hasher, f, chunk_size)
         else:
-            # Für kleine Dateien den gesamten Inhalt hashen
-            with open(filepath, 'rb') as f:
-                content = f.read()
+            # Sonst den gesamten Inhalt blockweise hashen, damit der Speicherbedarf konstant bleibt
+            with open(filepath, 'rb', buffering=0) as f:
+                update_from_file(hasher, f, chunk_size=chunk_size)
                 
-        return hashlib.md5(content).hexdigest()
+        return hasher.hexdigest()
     except Exception:
         return None
 
+def calculate_probe_hash(filepath, file_size, probe_size=PROBE_SIZE, algorithm=PROBE_HASH_ALGORITHM):
+    """Hash über Anfang und Ende einer Datei als günstiger Vorfilter
+
+    Dateien bis 2 * probe_size werden dabei vollständig gelesen, der Hash ist
+    für sie also bereits endgültig.
+    """
+    try:
+        hasher = new_hasher(algorithm)
+        with open(filepath, 'rb', buffering=0) as f:
+            if file_size <= 2 * probe_size:
+                update_from_file(hasher, f, chunk_size=2 * probe_size)
+            else:
+                update_from_file(hasher, f, probe_size, probe_size)
+                f.seek(-probe_size, 2)
+                update_from_file(hasher, f, probe_size, probe_size)
+        return hasher.hexdigest()
+    except Exception:
+        return None
+
+def benchmark_hash_algorithms(data_size=256 * 1024 * 1024, chunk_size=HASH_CHUNK_SIZE, repeat=3):
+    """Misst den Durchsatz jedes Hash-Algorithmus in GB/s auf diesem Rechner
+
+    Gehasht wird ein Puffer im Speicher, gemessen wird also nur die
+    Rechenleistung ohne Plattenzugriffe. Das beste von repeat Läufen zählt.
+    """
+    chunk = os.urandom(chunk_size)
+    chunk_count = max(1, data_size // chunk_size)
+    results = {}
+    for algorithm in HASH_ALGORITHMS:
+        best = None
+        for _ in range(repeat):
+            hasher = new_hasher(algorithm)
+            start = time.perf_counter()
+            for _ in range(chunk_count):
+                hasher.update(chunk)
+            hasher.hexdigest()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[algorithm] = chunk_count * chunk_size / best / 1e9
+    return results
+
 def get_file_categories():
     """Gibt die vordefinierten Dateikategorien zurück"""
     return {
@@ -76,4 +209,8 @@ def get_file_type_extensions():
         "Videos (.mp4, .avi, .mov)": [".mp4", ".avi", ".mov"],
         "Audio (.mp3, .wav, .ogg)": [".mp3", ".wav", ".ogg"],
         "Archive (.zip, .rar, .7z)": [".zip", ".rar", ".7z"]
-    } 
+    }
+
+if __name__ == "__main__":
+    for algorithm, throughput in sorted(benchmark_hash_algorithms().items(), key=lambda item: -item[1]):
+        print(f"{algorithm:>10}: {throughput:.2f} GB/s")
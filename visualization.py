@@ -1,31 +1,16 @@
 import matplotlib.pyplot as plt
-from collections import defaultdict
 
 class Visualization:
-    def __init__(self, file_tree, format_size, parse_size):
-        self.file_tree = file_tree
+    def __init__(self, file_model, format_size):
+        self.file_model = file_model
         self.format_size = format_size
-        self.parse_size = parse_size
 
     def visualize_data(self):
-        if self.file_tree.topLevelItemCount() == 0:
+        if self.file_model.rowCount() == 0:
             return False
-        # Sammle Daten nach Dateitypen
-        file_types = {}
-        total_size = 0
-        
-        for i in range(self.file_tree.topLevelItemCount()):
-            item = self.file_tree.topLevelItem(i)
-            file_type = item.text(3)
-            size_str = item.text(1)
-            
-            size = self.parse_size(size_str)
-            
-            if file_type in file_types:
-                file_types[file_type] += size
-            else:
-                file_types[file_type] = size
-            total_size += size
+        # Sammle Daten nach Dateitypen direkt aus den Spalten des Modells
+        file_types = self.file_model.size_by_type()
+        total_size = sum(file_types.values())
 
         # Sortiere Dateitypen nach Größe
         sorted_types = sorted(file_types.items(), key=lambda x: x[1], reverse=True)
@@ -0,0 +1,70 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from PySide6.QtCore import QThread
+
+# I/O-lastige Aufträge: mehr Threads als Kerne halten Platte und Netzwerk ausgelastet
+DEFAULT_MAX_WORKERS = min(16, (os.cpu_count() or 1) * 2)
+
+def run_parallel_jobs(jobs, job_function, max_workers, on_result, is_cancelled=None,
+                      executor_class=ThreadPoolExecutor):
+    """Führt Aufträge parallel aus und meldet jedes Ergebnis über on_result(Auftrag, Ergebnis)
+
+    Es sind höchstens max_workers * 4 Aufträge gleichzeitig eingeplant, damit
+    auch bei Hunderttausenden Dateien nicht alle Futures auf einmal entstehen.
+    on_result läuft im aufrufenden Thread. Für rechenintensive Aufträge kann
+    ein ProcessPoolExecutor übergeben werden. Gibt False zurück, wenn
+    abgebrochen wurde; Aufträge, die beim Abbruch schon liefen, werden noch zu
+    Ende geführt und gemeldet, damit z.B. bereits gelöschte Dateien nicht
+    unterschlagen werden.
+    """
+    job_iterator = iter(jobs)
+    in_flight = {}
+    with executor_class(max_workers=max_workers) as executor:
+        while True:
+            while len(in_flight) < max_workers * 4:
+                job = next(job_iterator, None)
+                if job is None:
+                    break
+                in_flight[executor.submit(job_function, job)] = job
+            if not in_flight:
+                return True
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                job = in_flight.pop(future)
+                on_result(job, future.result())
+
+            if is_cancelled and is_cancelled():
+                running = [future for future in in_flight if not future.cancel()]
+                for future in running:
+                    on_result(in_flight[future], future.result())
+                return False
+
+class BackgroundWorker(QThread):
+    """Gemeinsame Basis der abbrechbaren Hintergrund-Threads
+
+    Unterklassen deklarieren ihre Signale selbst. report_progress setzt ein
+    Signal progress_update(Stufe, erledigt, gesamt) voraus und meldet
+    höchstens alle PROGRESS_INTERVAL Sekunden, statt pro Datei ein Signal zu
+    senden; die letzte Meldung (erledigt == gesamt) kommt immer an.
+    """
+
+    PROGRESS_INTERVAL = 0.1  # Sekunden zwischen zwei Fortschrittsmeldungen
+
+    def __init__(self):
+        super().__init__()
+        self.cancel_requested = False
+        self.last_progress = 0.0
+
+    def cancel(self):
+        self.cancel_requested = True
+
+    def is_cancelled(self):
+        return self.cancel_requested
+
+    def report_progress(self, stage, done, total):
+        now = time.monotonic()
+        if done == total or now - self.last_progress >= self.PROGRESS_INTERVAL:
+            self.last_progress = now
+            self.progress_update.emit(stage, done, total)